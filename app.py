@@ -2,6 +2,8 @@ from flask import Flask, jsonify
 from flask_jwt_extended import JWTManager
 
 from db import db
+from db_engine import configure_engine
+from utils.fts import ensure_fts, include_in_migrations
 from config import Config
 import os
 from flask_cors import CORS
@@ -24,7 +26,9 @@ def create_app():
     migrate = Migrate()
 
     db.init_app(app)
-    migrate.init_app(app, db)
+    with app.app_context():
+        configure_engine(db.engine)
+    migrate.init_app(app, db, include_name=include_in_migrations)
 
     jwt = JWTManager(app)
     # CORS(app, resources={r"/api/*": {"origins": "http://localhost:4200"}})
@@ -57,6 +61,9 @@ def create_app():
     app.register_blueprint(commander_bp, url_prefix='/api/commander')
     app.register_blueprint(hr_bp, url_prefix='/api/hr')
 
+    from commands import register_commands
+    register_commands(app)
+
     # Create upload directories
     os.makedirs(os.path.join('uploads', 'resumes'), exist_ok=True)
 
@@ -71,6 +78,8 @@ if __name__ == '__main__':
         try:
             print("Creating all tables...")
             db.create_all()
+            with db.engine.begin() as connection:
+                ensure_fts(connection)
             print("Tables created successfully!")
         except Exception as e:
             print(f"Error creating tables: {e}")
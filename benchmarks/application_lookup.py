@@ -0,0 +1,115 @@
+"""Measure JobApplication (job_id, volunteer_id) lookup latency with and without indexes.
+
+Builds a throwaway SQLite database from the models' metadata, fills
+job_applications with synthetic rows and times the lookup every hot path
+uses (``filter_by(job_id=..., volunteer_id=...).first()``) before and after
+the lookup indexes exist. Prints a JSON report.
+
+    python -m benchmarks.application_lookup --applications 1000000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import db  # noqa: E402
+import models  # noqa: E402,F401  (registers every table on db.metadata)
+
+LOOKUP_INDEXES = ('uq_job_applications_job_volunteer', 'ix_job_applications_volunteer_id')
+LOOKUP_SQL = text("SELECT id FROM job_applications WHERE job_id = :job_id AND volunteer_id = :volunteer_id LIMIT 1")
+
+
+def seed(engine, applications, jobs):
+    volunteers = applications // jobs + 1
+    with engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO users (id, email, password_hash, role) VALUES (1, 'c@example.com', 'x', 'commander')")
+        connection.exec_driver_sql("INSERT INTO commanders (id, user_id, name) VALUES (1, 1, 'Commander')")
+        connection.exec_driver_sql(
+            "INSERT INTO jobs (id, commander_id, title) VALUES (?, 1, ?)",
+            [(job_id, f'Job {job_id}') for job_id in range(1, jobs + 1)]
+        )
+
+        batch = []
+        for application_id in range(1, applications + 1):
+            job_id = (application_id - 1) % jobs + 1
+            volunteer_id = (application_id - 1) // jobs + 1
+            batch.append((application_id, job_id, volunteer_id, 'PENDING'))
+            if len(batch) == 50000:
+                connection.exec_driver_sql(
+                    "INSERT INTO job_applications (id, job_id, volunteer_id, status) VALUES (?, ?, ?, ?)", batch)
+                batch = []
+        if batch:
+            connection.exec_driver_sql(
+                "INSERT INTO job_applications (id, job_id, volunteer_id, status) VALUES (?, ?, ?, ?)", batch)
+    return volunteers
+
+
+def time_lookups(engine, keys):
+    timings = []
+    with engine.connect() as connection:
+        for job_id, volunteer_id in keys:
+            started = time.perf_counter()
+            connection.execute(LOOKUP_SQL, {'job_id': job_id, 'volunteer_id': volunteer_id}).first()
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'lookups': len(timings),
+        'mean_ms': round(statistics.fmean(timings), 4),
+        'p50_ms': round(timings[len(timings) // 2], 4),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1], 4),
+        'p99_ms': round(timings[int(len(timings) * 0.99) - 1], 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=1000000)
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--lookups', type=int, default=200)
+    parser.add_argument('--indexed-lookups', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        db.metadata.create_all(engine)
+        with engine.begin() as connection:
+            for index_name in LOOKUP_INDEXES:
+                connection.exec_driver_sql(f"DROP INDEX {index_name}")
+
+        started = time.perf_counter()
+        volunteers = seed(engine, args.applications, args.jobs)
+        seed_seconds = time.perf_counter() - started
+
+        rng = random.Random(42)
+        keys = [(rng.randint(1, args.jobs), rng.randint(1, volunteers)) for _ in range(args.indexed_lookups)]
+
+        before = time_lookups(engine, keys[:args.lookups])
+
+        started = time.perf_counter()
+        for index in db.metadata.tables['job_applications'].indexes:
+            index.create(engine)
+        index_seconds = time.perf_counter() - started
+
+        after = time_lookups(engine, keys)
+        engine.dispose()
+
+    print(json.dumps({
+        'applications': args.applications,
+        'jobs': args.jobs,
+        'seed_seconds': round(seed_seconds, 2),
+        'index_build_seconds': round(index_seconds, 2),
+        'without_indexes': before,
+        'with_indexes': after,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""Stress HR assignments under parallel requests and check that no job is overbooked.
+
+Seeds a throwaway SQLite database with one open job of ``--positions``
+vacancies and ``--volunteers`` applicants already accepted by the commander
+(PREFERRED_FINAL), then starts ``--workers`` processes that all post their
+share of assignments at the same moment, through the real Flask app. Each
+process is a separate connection, as separate Gunicorn workers would be.
+With ``--batch N`` every request assigns N volunteers through
+/api/hr/assignments/batch instead of one through /api/hr/assignments.
+
+Afterwards it checks the invariants and exits non-zero if any is broken:
+exactly ``positions`` applications hired, no vacancies left, the job closed,
+and the materialized per-status counters equal to the applications table.
+Prints a JSON report.
+
+    python -m benchmarks.assignment_stress --workers 16 --volunteers 400 --positions 25
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+JOB_ID = 1
+
+
+def prepare(volunteers, positions):
+    from sqlalchemy import create_engine, text
+    from benchmarks.seed import seed
+    from models.application import ApplicationStatus
+
+    engine = create_engine(os.environ['DATABASE_URL'])
+    seed(engine, {'volunteers': volunteers, 'commanders': 1, 'hr': 1, 'jobs': 1,
+                  'questions_per_job': 0, 'applications_per_volunteer': 0})
+    status = ApplicationStatus.PREFERRED_FINAL.name
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE jobs SET vacant_positions = :positions, status = 'OPEN' WHERE id = :job"),
+                           {'positions': positions, 'job': JOB_ID})
+        connection.execute(
+            text('INSERT INTO job_applications (job_id, volunteer_id, status, application_date) '
+                 'VALUES (:job, :volunteer, :status, CURRENT_TIMESTAMP)'),
+            [{'job': JOB_ID, 'volunteer': volunteer_id, 'status': status}
+             for volunteer_id in range(1, volunteers + 1)])
+        connection.execute(text('INSERT INTO job_application_counts (job_id, status, total) '
+                                'VALUES (:job, :status, :total)'),
+                           {'job': JOB_ID, 'status': status, 'total': volunteers})
+    engine.dispose()
+
+
+def worker(volunteer_ids, batch, start):
+    """Post this worker's assignments once every worker is ready; returns (outcomes, latencies in ms)."""
+    from flask_jwt_extended import create_access_token
+    from app import app
+
+    with app.app_context():
+        token = create_access_token(identity='1', additional_claims={'role': 'hr'})
+    headers = {'Authorization': f'Bearer {token}'}
+    client = app.test_client()
+    outcomes, latencies = {}, []
+
+    start.wait()
+    if batch:
+        for offset in range(0, len(volunteer_ids), batch):
+            chunk = volunteer_ids[offset:offset + batch]
+            started = time.perf_counter()
+            response = client.post('/api/hr/assignments/batch', headers=headers, json={
+                'assignments': [{'volunteer_id': volunteer_id, 'job_id': JOB_ID} for volunteer_id in chunk]})
+            latencies.append((time.perf_counter() - started) * 1000)
+            for result in response.get_json()['results']:
+                key = 'assigned' if result['assigned'] else result['error']
+                outcomes[key] = outcomes.get(key, 0) + 1
+    else:
+        for volunteer_id in volunteer_ids:
+            started = time.perf_counter()
+            response = client.post('/api/hr/assignments', headers=headers,
+                                   json={'volunteer_id': volunteer_id, 'job_id': JOB_ID})
+            latencies.append((time.perf_counter() - started) * 1000)
+            key = 'assigned' if response.status_code == 200 else response.get_json()['error']
+            outcomes[key] = outcomes.get(key, 0) + 1
+    return outcomes, latencies
+
+
+def check(positions):
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(os.environ['DATABASE_URL'])
+    with engine.connect() as connection:
+        vacant, status = connection.execute(text('SELECT vacant_positions, status FROM jobs WHERE id = :job'),
+                                            {'job': JOB_ID}).one()
+        actual = dict(connection.execute(text('SELECT status, COUNT(*) FROM job_applications '
+                                              'WHERE job_id = :job GROUP BY status'), {'job': JOB_ID}).all())
+        counters = dict(connection.execute(text('SELECT status, total FROM job_application_counts '
+                                                'WHERE job_id = :job AND total != 0'), {'job': JOB_ID}).all())
+    engine.dispose()
+    invariants = {
+        'hired_equals_positions': actual.get('HIRED', 0) == positions,
+        'no_vacancies_left': vacant == 0,
+        'job_closed': status == 'CLOSED',
+        'counters_match_applications': counters == actual,
+    }
+    return {'vacant_positions': vacant, 'job_status': status, 'applications': actual, 'counters': counters,
+            'invariants': invariants}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--volunteers', type=int, default=400, help='accepted applicants competing for the job')
+    parser.add_argument('--positions', type=int, default=25)
+    parser.add_argument('--batch', type=int, default=0, help='assignments per batch request (0: one per request)')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='giuson-assign-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.chdir(workdir)
+    try:
+        prepare(args.volunteers, args.positions)
+        # Interleave the applicants so every worker competes for the same positions from the start
+        shares = [list(range(index + 1, args.volunteers + 1, args.workers)) for index in range(args.workers)]
+        context = multiprocessing.get_context('spawn')
+        with context.Manager() as manager:
+            start = manager.Barrier(args.workers)
+            with context.Pool(args.workers) as pool:
+                started = time.perf_counter()
+                results = pool.starmap(worker, [(share, args.batch, start) for share in shares])
+                seconds = time.perf_counter() - started
+        report = check(args.positions)
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    outcomes, latencies = {}, sorted(latency for _, timings in results for latency in timings)
+    for worker_outcomes, _ in results:
+        for key, total in worker_outcomes.items():
+            outcomes[key] = outcomes.get(key, 0) + total
+    print(json.dumps(dict({
+        'workers': args.workers,
+        'volunteers': args.volunteers,
+        'positions': args.positions,
+        'batch': args.batch,
+        'seconds': round(seconds, 2),
+        'requests': len(latencies),
+        'p50_ms': round(latencies[len(latencies) // 2], 3),
+        'p99_ms': round(latencies[max(int(len(latencies) * 0.99) - 1, 0)], 3),
+        'outcomes': outcomes,
+    }, **report), indent=2))
+    if not all(report['invariants'].values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
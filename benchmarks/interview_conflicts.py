@@ -0,0 +1,116 @@
+"""Measure interview conflict checks and free-slot searches on large calendars.
+
+Seeds a throwaway SQLite database where every one of ``--commanders``
+commanders owns one job and about ``--interviews / --commanders``
+back-to-back 45-minute interviews, one per working hour, then times
+InterviewService.find_conflict for random one-hour windows across the
+calendar and free_slots over random 7-day ranges. Prints a JSON report.
+
+    python -m benchmarks.interview_conflicts --interviews 20000 --commanders 5
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+FIRST_DAY = datetime(2027, 1, 3)  # A Sunday
+HOURS = range(6, 15)  # 08:00-17:00 in Israel (UTC+2) as UTC hours
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return {
+        'calls': len(timings),
+        'p50_ms': round(timings[len(timings) // 2], 3),
+        'p99_ms': round(timings[max(int(len(timings) * 0.99) - 1, 0)], 3),
+    }
+
+
+def calendar(count):
+    """``count`` hourly interview starts on consecutive Sunday-Thursday working days."""
+    starts, day = [], FIRST_DAY
+    while len(starts) < count:
+        if day.weekday() in (6, 0, 1, 2, 3):
+            starts.extend(day.replace(hour=hour) for hour in HOURS)
+        day += timedelta(days=1)
+    return starts[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--interviews', type=int, default=20000)
+    parser.add_argument('--commanders', type=int, default=5)
+    parser.add_argument('--checks', type=int, default=2000)
+    parser.add_argument('--searches', type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='giuson-interviews-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.chdir(workdir)
+    try:
+        from sqlalchemy import create_engine, insert, select
+        from benchmarks.seed import seed
+        from models import Interview, Job, JobApplication
+
+        engine = create_engine(os.environ['DATABASE_URL'])
+        seed(engine, {'volunteers': args.interviews, 'commanders': args.commanders, 'jobs': args.commanders,
+                      'questions_per_job': 0, 'applications_per_volunteer': 1, 'interview_ratio': 0})
+        with engine.begin() as connection:
+            applications = connection.execute(
+                select(JobApplication.id, Job.commander_id).join(Job, Job.id == JobApplication.job_id)
+                .order_by(Job.commander_id, JobApplication.id)).all()
+            per_commander = {}
+            for application_id, commander_id in applications:
+                per_commander.setdefault(commander_id, []).append(application_id)
+            rows = []
+            for commander_id, application_ids in per_commander.items():
+                for application_id, start in zip(application_ids, calendar(len(application_ids))):
+                    rows.append({'application_id': application_id, 'commander_id': commander_id,
+                                 'scheduled_date': start, 'scheduled_end': start + timedelta(minutes=45),
+                                 'status': 'scheduled'})
+            connection.execute(insert(Interview), rows)
+        engine.dispose()
+
+        from app import app
+        from services.interview_service import InterviewService
+
+        commander_id = max(per_commander, key=lambda key: len(per_commander[key]))
+        starts = calendar(len(per_commander[commander_id]))
+        rng = random.Random(3)
+        report = {'interviews': len(rows), 'busiest_commander_interviews': len(starts)}
+        with app.app_context():
+            timings, conflicts = [], 0
+            for _ in range(args.checks):
+                start = rng.choice(starts) + timedelta(minutes=rng.randrange(0, 120, 15))
+                started = time.perf_counter()
+                conflict = InterviewService.find_conflict(commander_id, start, start + timedelta(hours=1))
+                timings.append((time.perf_counter() - started) * 1000)
+                conflicts += conflict is not None
+            report['find_conflict'] = dict(percentiles(timings), conflicts=conflicts)
+
+            timings, found = [], []
+            for _ in range(args.searches):
+                start = rng.choice(starts).replace(hour=0)
+                started = time.perf_counter()
+                slots = InterviewService.free_slots(commander_id, start, start + timedelta(days=7),
+                                                    timedelta(minutes=15))
+                timings.append((time.perf_counter() - started) * 1000)
+                found.append(len(slots))
+            report['free_slots_7_days'] = dict(percentiles(timings), mean_slots=round(sum(found) / len(found), 1))
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
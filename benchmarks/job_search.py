@@ -0,0 +1,113 @@
+"""Measure VolunteerService.search_jobs latency over a large jobs table.
+
+Seeds a throwaway SQLite database with ``--jobs`` synthetic jobs (see
+benchmarks.seed) whose descriptions draw words from a Zipf-distributed
+vocabulary, builds the jobs_fts index and times searches through the real
+service code. Queries are grouped by how many jobs they match: BM25 scores
+every match, so broad terms cost more than selective ones. Prints a JSON
+report.
+
+    python -m benchmarks.job_search --jobs 100000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+VOCABULARY_SIZE = 20000
+DESCRIPTION_WORDS = 40
+
+
+def make_vocabulary(rng):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = set()
+    while len(words) < VOCABULARY_SIZE:
+        words.add(''.join(rng.choice(letters) for _ in range(rng.randint(4, 9))))
+    words = sorted(words)
+    rng.shuffle(words)
+    weights = [1 / rank for rank in range(1, len(words) + 1)]
+    return words, weights
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return {
+        'searches': len(timings),
+        'p50_ms': round(timings[len(timings) // 2], 3),
+        'p95_ms': round(timings[max(int(len(timings) * 0.95) - 1, 0)], 3),
+        'p99_ms': round(timings[max(int(len(timings) * 0.99) - 1, 0)], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    parser.add_argument('--searches', type=int, default=200, help='searches per query group')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='giuson-search-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.chdir(workdir)
+    try:
+        from sqlalchemy import create_engine, text
+        from benchmarks.seed import seed
+        from utils.fts import ensure_fts
+
+        engine = create_engine(os.environ['DATABASE_URL'])
+        rng = random.Random(7)
+        words, weights = make_vocabulary(rng)
+        started = time.perf_counter()
+        seed(engine, {'volunteers': 0, 'commanders': 20, 'jobs': args.jobs, 'questions_per_job': 0})
+        with engine.begin() as connection:
+            connection.execute(
+                text('UPDATE jobs SET description = :description WHERE id = :id'),
+                [{'id': job_id, 'description': ' '.join(rng.choices(words, weights, k=DESCRIPTION_WORDS))}
+                 for job_id in range(1, args.jobs + 1)])
+        seed_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            ensure_fts(connection)
+        index_seconds = time.perf_counter() - started
+        engine.dispose()
+
+        from app import app
+        from services.volunteer_service import VolunteerService
+
+        buckets = {'common (top 20 words)': lambda: rng.choice(words[:20]),
+                   'mid (ranks 200-2000)': lambda: rng.choice(words[200:2000]),
+                   'rare (tail)': lambda: rng.choice(words[2000:]),
+                   'two words': lambda: ' '.join(rng.sample(words[:2000], 2)),
+                   'prefix (3 letters)': lambda: rng.choice(words[:2000])[:3]}
+        report = {}
+        with app.app_context():
+            for name, make_query in buckets.items():
+                timings, matches = [], []
+                for _ in range(args.searches):
+                    query = make_query()
+                    started = time.perf_counter()
+                    results = VolunteerService.search_jobs(query, limit=args.limit)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    matches.append(len(results))
+                report[name] = dict(percentiles(timings), mean_results=round(sum(matches) / len(matches), 1))
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps({
+        'jobs': args.jobs,
+        'seed_seconds': round(seed_seconds, 2),
+        'index_build_seconds': round(index_seconds, 2),
+        'queries': report,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Measure the volunteer/job matching engine at scale.
+
+Seeds a throwaway SQLite database (see benchmarks.seed), then times, through
+the real service code: building the matching index, job -> volunteer and
+volunteer -> job recommendations, and re-vectorizing one changed profile.
+The seed draws skills from a small vocabulary, so nearly every volunteer
+shares a term with every job: a worst case for the number of scored rows.
+Prints a JSON report.
+
+    python -m benchmarks.matching --volunteers 100000 --jobs 5000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return {
+        'calls': len(timings),
+        'p50_ms': round(timings[len(timings) // 2], 3),
+        'p95_ms': round(timings[max(int(len(timings) * 0.95) - 1, 0)], 3),
+        'p99_ms': round(timings[max(int(len(timings) * 0.99) - 1, 0)], 3),
+    }
+
+
+def timed(function, arguments):
+    timings = []
+    for argument in arguments:
+        started = time.perf_counter()
+        function(argument)
+        timings.append((time.perf_counter() - started) * 1000)
+    return percentiles(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--volunteers', type=int, default=100000)
+    parser.add_argument('--jobs', type=int, default=5000)
+    parser.add_argument('--calls', type=int, default=200, help='calls per measured operation')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='giuson-matching-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.chdir(workdir)
+    try:
+        from sqlalchemy import create_engine
+        from benchmarks.seed import seed
+
+        engine = create_engine(os.environ['DATABASE_URL'])
+        started = time.perf_counter()
+        seed(engine, {'volunteers': args.volunteers, 'jobs': args.jobs, 'questions_per_job': 0,
+                      'applications_per_volunteer': 0, 'interview_ratio': 0})
+        seed_seconds = time.perf_counter() - started
+        engine.dispose()
+
+        from app import app
+        from db import db
+        from models import Volunteer
+        from services.matching_service import MatchingService
+
+        rng = random.Random(3)
+        with app.app_context():
+            app.config['MATCHING_INDEX_TTL'] = 0
+            started = time.perf_counter()
+            index = MatchingService._index()
+            build_seconds = time.perf_counter() - started
+
+            job_ids = [rng.randint(1, args.jobs) for _ in range(args.calls)]
+            volunteer_ids = [rng.randint(1, args.volunteers) for _ in range(args.calls)]
+            report = {
+                'recommended_volunteers': timed(
+                    lambda job_id: MatchingService.recommended_volunteers(job_id, args.limit), job_ids),
+                'recommended_jobs': timed(
+                    lambda volunteer_id: MatchingService.recommended_jobs(volunteer_id, args.limit), volunteer_ids),
+            }
+
+            def change_profile(volunteer_id):
+                volunteer = db.session.get(Volunteer, volunteer_id)
+                volunteer.courses = f'{volunteer.courses}, triage'
+                MatchingService.volunteer_changed(volunteer)
+
+            report['volunteer_changed'] = timed(change_profile, volunteer_ids)
+            db.session.rollback()
+            indexed = {'volunteers': len(index.volunteers), 'jobs': len(index.jobs)}
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps({
+        'indexed': indexed,
+        'seed_seconds': round(seed_seconds, 2),
+        'index_build_seconds': round(build_seconds, 2),
+        'operations': report,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
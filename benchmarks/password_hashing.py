@@ -0,0 +1,66 @@
+"""Measure password hashing cost and login verifications per second per core.
+
+For each method, hashes a password once and then verifies it repeatedly on
+1..N threads (the same path utils.passwords.verify_password takes with
+PASSWORD_VERIFY_WORKERS). Reports hash time, verifications/s and
+verifications/s per busy core as JSON, to pick a PASSWORD_HASH_METHOD cost
+that fits the login throughput a worker needs.
+
+    python -m benchmarks.password_hashing --methods scrypt:32768:8:1 scrypt:16384:8:1 pbkdf2:sha256:600000 --threads 1 2 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.passwords import PasswordHasher, hash_password, _verify  # noqa: E402
+
+DEFAULT_METHODS = ['scrypt:32768:8:1', 'scrypt:16384:8:1', 'pbkdf2:sha256:1000000', 'pbkdf2:sha256:600000']
+if PasswordHasher is not None:
+    DEFAULT_METHODS += ['argon2', 'argon2:2:19456:1']
+
+PASSWORD = 'correct horse battery staple'
+
+
+def measure(method, threads, verifications):
+    started = time.perf_counter()
+    password_hash = hash_password(PASSWORD, method)
+    hash_ms = (time.perf_counter() - started) * 1000
+
+    results = []
+    for thread_count in threads:
+        with ThreadPoolExecutor(max_workers=thread_count) as pool:
+            started = time.perf_counter()
+            ok = all(pool.map(lambda _: _verify(password_hash, PASSWORD), range(verifications)))
+            elapsed = time.perf_counter() - started
+        assert ok, f'{method}: verification failed'
+        per_second = verifications / elapsed
+        results.append({
+            'threads': thread_count,
+            'verifications_per_second': round(per_second, 1),
+            'per_core': round(per_second / min(thread_count, os.cpu_count() or 1), 1),
+            'mean_ms': round(elapsed * 1000 * thread_count / verifications, 2),
+        })
+    return {'method': method, 'hash_ms': round(hash_ms, 2), 'verify': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS)
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, os.cpu_count() or 1])
+    parser.add_argument('--verifications', type=int, default=50)
+    args = parser.parse_args()
+
+    report = {
+        'cpu_count': os.cpu_count(),
+        'results': [measure(method, args.threads, args.verifications) for method in args.methods],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
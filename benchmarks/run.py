@@ -0,0 +1,251 @@
+"""Latency/throughput benchmark for the auth, HR, volunteer and commander blueprints.
+
+Seeds a synthetic SQLite database (see benchmarks.seed), then drives the real
+Flask app:
+
+- ``client``: in-process through ``app.test_client()``, one request at a
+  time, also counting the SQL statements every request issues;
+- ``gunicorn``: a local Gunicorn started with gunicorn.conf.py, hit by
+  ``--concurrency`` client threads over HTTP.
+
+Reports p50/p95/p99 latency, throughput and queries per request for every
+endpoint as JSON, for regression tracking between commits.
+
+    python -m benchmarks.run --volunteers 5000 --jobs 300 --requests 50 --mode client gunicorn --output bench.json
+"""
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.seed import DEFAULT_SCALE, scale_arguments  # noqa: E402
+
+# (name, method, path template, role whose token is sent)
+ENDPOINTS = [
+    ('auth.login', 'POST', '/api/auth/login', None),
+    ('hr.volunteers', 'GET', '/api/hr/volunteers', 'hr'),
+    ('hr.volunteers.page', 'GET', '/api/hr/volunteers?limit=50', 'hr'),
+    ('hr.jobs', 'GET', '/api/hr/jobs', 'hr'),
+    ('volunteer.jobs', 'GET', '/api/volunteer/jobs', 'volunteer'),
+    ('commander.job_applications', 'GET', '/api/commander/jobs/{job_id}/applications', 'commander'),
+    ('commander.export_csv', 'GET', '/api/commander/jobs/{job_id}/applications/export', 'commander'),
+]
+
+
+def summarize(latencies, wall_seconds, errors, queries=None):
+    latencies = sorted(latencies)
+
+    def pick(fraction):
+        if not latencies:
+            return None
+        return round(latencies[max(int(len(latencies) * fraction + 0.5) - 1, 0)], 3)
+
+    summary = {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'p99_ms': pick(0.99),
+        'throughput_rps': round(len(latencies) / wall_seconds, 2) if wall_seconds else None,
+    }
+    if queries is not None:
+        summary['queries_per_request'] = round(sum(queries) / len(queries), 2) if queries else None
+        summary['max_queries'] = max(queries) if queries else None
+    return summary
+
+
+def credentials(info):
+    job = info['busiest_job']
+    return {
+        'hr': info['hr_email'],
+        'volunteer': info['volunteer_email'],
+        'commander': info['commanders'][job['commander_id']],
+    }
+
+
+def request_plan(info, selected):
+    job = info['busiest_job']
+    for name, method, path, role in ENDPOINTS:
+        if selected and name not in selected:
+            continue
+        body = {'email': info['hr_email'], 'password': info['password']} if name == 'auth.login' else None
+        yield name, method, path.format(job_id=job['id']), role, body
+
+
+def run_client(info, requests, selected):
+    from sqlalchemy import event
+    from app import app
+    from db import db
+
+    statements = {'count': 0}
+
+    def count_statement(*args):
+        statements['count'] += 1
+
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+
+    client = app.test_client()
+    tokens = {}
+    for role, email in credentials(info).items():
+        response = client.post('/api/auth/login', json={'email': email, 'password': info['password']})
+        tokens[role] = response.get_json()['access_token']
+
+    results = {}
+    for name, method, path, role, body in request_plan(info, selected):
+        headers = {'Authorization': f'Bearer {tokens[role]}'} if role else {}
+        latencies, queries, errors = [], [], 0
+        started_all = time.perf_counter()
+        for _ in range(requests):
+            statements['count'] = 0
+            started = time.perf_counter()
+            response = client.open(path, method=method, json=body, headers=headers)
+            response.get_data()
+            elapsed = (time.perf_counter() - started) * 1000
+            if response.status_code >= 400:
+                errors += 1
+                continue
+            latencies.append(elapsed)
+            queries.append(statements['count'])
+        results[name] = summarize(latencies, time.perf_counter() - started_all, errors, queries)
+
+    with app.app_context():
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+    return results
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _http(base_url, method, path, body=None, token=None, timeout=60):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    request = urllib.request.Request(base_url + path, data=data, method=method)
+    if data is not None:
+        request.add_header('Content-Type', 'application/json')
+    if token:
+        request.add_header('Authorization', f'Bearer {token}')
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status, response.read()
+
+
+def run_gunicorn(info, requests, concurrency, workers, selected, env):
+    port = _free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    server_env = dict(env, GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS=str(workers))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', os.path.join(REPO_ROOT, 'gunicorn.conf.py'),
+         '--pythonpath', REPO_ROOT, 'app:app'],
+        env=server_env, cwd=env['BENCH_WORKDIR'], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    try:
+        deadline = time.time() + 30
+        while True:
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=1):
+                    break
+            except OSError:
+                if server.poll() is not None or time.time() > deadline:
+                    raise RuntimeError('Gunicorn did not start: ' + server.stderr.read().decode('utf-8', 'replace'))
+                time.sleep(0.2)
+
+        tokens = {}
+        for role, email in credentials(info).items():
+            _, payload = _http(base_url, 'POST', '/api/auth/login', {'email': email, 'password': info['password']})
+            tokens[role] = json.loads(payload)['access_token']
+
+        results = {}
+        for name, method, path, role, body in request_plan(info, selected):
+            latencies, errors = [], 0
+            lock = threading.Lock()
+
+            def one_request(_):
+                nonlocal errors
+                started = time.perf_counter()
+                try:
+                    _http(base_url, method, path, body, tokens.get(role))
+                except (urllib.error.URLError, OSError):
+                    with lock:
+                        errors += 1
+                    return
+                with lock:
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+            started_all = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                list(pool.map(one_request, range(requests)))
+            results[name] = summarize(latencies, time.perf_counter() - started_all, errors)
+        return results
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    scale_arguments(parser)
+    parser.add_argument('--requests', type=int, default=50, help='requests per endpoint')
+    parser.add_argument('--mode', nargs='+', choices=['client', 'gunicorn'], default=['client'])
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads in gunicorn mode')
+    parser.add_argument('--workers', type=int, default=4, help='Gunicorn workers')
+    parser.add_argument('--endpoints', nargs='*', help='only run these endpoint names')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='giuson-bench-')
+    database_path = os.path.join(workdir, 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{database_path}'
+    os.environ['BENCH_WORKDIR'] = workdir
+    os.chdir(workdir)
+
+    from sqlalchemy import create_engine
+    from benchmarks.seed import seed
+
+    try:
+        engine = create_engine(os.environ['DATABASE_URL'])
+        started = time.perf_counter()
+        info = seed(engine, {key: getattr(args, key) for key in DEFAULT_SCALE})
+        engine.dispose()
+        seed_seconds = time.perf_counter() - started
+
+        report = {
+            'scale': info['scale'],
+            'rows': info['counts'],
+            'seed_seconds': round(seed_seconds, 2),
+            'requests_per_endpoint': args.requests,
+            'results': {},
+        }
+        if 'client' in args.mode:
+            report['results']['client'] = run_client(info, args.requests, args.endpoints)
+        if 'gunicorn' in args.mode:
+            report['gunicorn'] = {'workers': args.workers, 'concurrency': args.concurrency}
+            report['results']['gunicorn'] = run_gunicorn(
+                info, args.requests, args.concurrency, args.workers, args.endpoints, dict(os.environ))
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(output)
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
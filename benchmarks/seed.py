@@ -0,0 +1,195 @@
+"""Seed a synthetic database at a configurable scale.
+
+Every account shares one password (``BENCH_PASSWORD``), hashed once, so
+seeding a large database does not spend minutes in the password hasher.
+
+    python -m benchmarks.seed --url sqlite:////tmp/bench.db --volunteers 10000 --jobs 500
+"""
+import argparse
+import os
+import random
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from werkzeug.security import generate_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import db  # noqa: E402
+from models import User, Volunteer, Commander, HR, Job, JobQuestion, JobApplication, JobApplicationCount, \
+    Interview  # noqa: E402
+from models.application import ApplicationStatus  # noqa: E402
+from models.job import JobStatus  # noqa: E402
+from models.volunteer import Gender  # noqa: E402
+
+BENCH_PASSWORD = 'bench-password'
+BATCH_SIZE = 5000
+
+DEFAULT_SCALE = {
+    'volunteers': 2000,
+    'commanders': 20,
+    'hr': 2,
+    'jobs': 200,
+    'questions_per_job': 3,
+    'applications_per_volunteer': 3,
+    'interview_ratio': 0.2,
+}
+
+SKILLS = ['python', 'java', 'sql', 'networking', 'linux', 'excel', 'logistics', 'first aid', 'driving',
+          'photography', 'teaching', 'cooking', 'cyber', 'electronics', 'management']
+LANGUAGES = ['hebrew', 'english', 'arabic', 'russian', 'french', 'amharic', 'spanish']
+CATEGORIES = ['technology', 'logistics', 'education', 'medical', 'administration']
+UNITS = ['north', 'center', 'south', 'jerusalem', 'haifa']
+
+
+def _chunks(rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        yield rows[start:start + BATCH_SIZE]
+
+
+def _insert(connection, model, rows):
+    for chunk in _chunks(rows):
+        connection.execute(insert(model), chunk)
+
+
+def seed(engine, scale=None, rng=None):
+    """Create the schema on ``engine`` and fill it. Returns the ids/emails benchmarks need."""
+    scale = dict(DEFAULT_SCALE, **(scale or {}))
+    rng = rng or random.Random(1)
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+    now = datetime.utcnow()
+
+    db.metadata.create_all(engine)
+
+    users, volunteers, commanders, hr_staff = [], [], [], []
+    user_id = 0
+    for index in range(scale['hr']):
+        user_id += 1
+        users.append({'id': user_id, 'email': f'hr{index}@bench.local', 'password_hash': password_hash,
+                      'role': 'hr', 'full_name': f'HR {index}'})
+        hr_staff.append({'id': index + 1, 'user_id': user_id, 'department': 'HR'})
+    for index in range(scale['commanders']):
+        user_id += 1
+        users.append({'id': user_id, 'email': f'commander{index}@bench.local', 'password_hash': password_hash,
+                      'role': 'commander', 'full_name': f'Commander {index}'})
+        commanders.append({'id': index + 1, 'user_id': user_id, 'name': f'Commander {index}',
+                           'department': rng.choice(CATEGORIES)})
+    for index in range(scale['volunteers']):
+        user_id += 1
+        users.append({'id': user_id, 'email': f'volunteer{index}@bench.local', 'password_hash': password_hash,
+                      'role': 'volunteer', 'full_name': f'Volunteer {index}', 'phone': f'05{index:08d}'})
+        volunteers.append({
+            'id': index + 1,
+            'user_id': user_id,
+            'full_name': f'Volunteer {index}',
+            'national_id': f'{index:09d}',
+            'date_of_birth': date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55)),
+            'gender': rng.choice(list(Gender)),
+            'profile': rng.choice([21, 45, 64, 72, 82, 97]),
+            'education': rng.choice(['high school', 'ba', 'msc', 'phd']),
+            'experience': ', '.join(rng.sample(SKILLS, 3)),
+            'courses': ', '.join(rng.sample(SKILLS, 2)),
+            'languages': ', '.join(rng.sample(LANGUAGES, 2)),
+            'interests': ', '.join(rng.sample(SKILLS, 2)),
+            'personal_summary': 'Synthetic volunteer profile for benchmarking.',
+        })
+
+    jobs, questions = [], []
+    for index in range(scale['jobs']):
+        jobs.append({
+            'id': index + 1,
+            'commander_id': rng.randint(1, scale['commanders']),
+            'title': f'Job {index}',
+            'description': 'Synthetic job for benchmarking. ' + ' '.join(rng.sample(SKILLS, 4)),
+            'vacant_positions': rng.randint(1, 5),
+            'is_active': True,
+            'created_at': now,
+            'status': JobStatus.OPEN,
+            'is_open_base': rng.random() < 0.5,
+            'category': rng.choice(CATEGORIES),
+            'unit': rng.choice(UNITS),
+            'tech_skills': ', '.join(rng.sample(SKILLS, 3)),
+            'required_languages': ', '.join(rng.sample(LANGUAGES, 1)),
+            'education': rng.choice(['high school', 'ba', 'msc']),
+        })
+        for question in range(scale['questions_per_job']):
+            questions.append({'job_id': index + 1, 'question_text': f'Question {question}?', 'answer_text': 'Answer'})
+
+    applications, interviews = [], []
+    application_id = 0
+    per_volunteer = min(scale['applications_per_volunteer'], scale['jobs'])
+    for volunteer in volunteers:
+        for job_id in rng.sample(range(1, scale['jobs'] + 1), per_volunteer):
+            application_id += 1
+            applications.append({
+                'id': application_id,
+                'job_id': job_id,
+                'volunteer_id': volunteer['id'],
+                'status': rng.choice(list(ApplicationStatus)),
+                'application_date': now,
+            })
+            if rng.random() < scale['interview_ratio']:
+                # Same shape as migration a3d85e6f1c47's backfill: the job's commander and a one-hour slot
+                scheduled_date = now + timedelta(hours=rng.randrange(24 * 60))
+                interviews.append({
+                    'application_id': application_id,
+                    'commander_id': jobs[job_id - 1]['commander_id'],
+                    'scheduled_date': scheduled_date,
+                    'scheduled_end': scheduled_date + timedelta(hours=1),
+                    'status': 'scheduled',
+                    'created_at': now,
+                    'updated_at': now,
+                })
+
+    counts = Counter((application['job_id'], application['status']) for application in applications)
+    application_counts = [{'job_id': job_id, 'status': status, 'total': total}
+                          for (job_id, status), total in counts.items()]
+    per_job = Counter(application['job_id'] for application in applications)
+
+    with engine.begin() as connection:
+        _insert(connection, User, users)
+        _insert(connection, HR, hr_staff)
+        _insert(connection, Commander, commanders)
+        _insert(connection, Volunteer, volunteers)
+        _insert(connection, Job, jobs)
+        _insert(connection, JobQuestion, questions)
+        _insert(connection, JobApplication, applications)
+        _insert(connection, JobApplicationCount, application_counts)
+        _insert(connection, Interview, interviews)
+
+    busiest_job = max(jobs, key=lambda job: per_job[job['id']]) if jobs else None
+    return {
+        'scale': scale,
+        'password': BENCH_PASSWORD,
+        'hr_email': users[0]['email'] if scale['hr'] else None,
+        'commanders': {commander['id']: f"commander{commander['id'] - 1}@bench.local" for commander in commanders},
+        'volunteer_email': 'volunteer0@bench.local' if scale['volunteers'] else None,
+        'busiest_job': busiest_job and {'id': busiest_job['id'], 'commander_id': busiest_job['commander_id']},
+        'counts': {
+            'users': len(users), 'volunteers': len(volunteers), 'commanders': len(commanders), 'jobs': len(jobs),
+            'questions': len(questions), 'applications': len(applications), 'interviews': len(interviews),
+        },
+    }
+
+
+def scale_arguments(parser):
+    for key, value in DEFAULT_SCALE.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value, dest=key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', required=True, help='SQLAlchemy URL of an empty database')
+    scale_arguments(parser)
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    info = seed(engine, {key: getattr(args, key) for key in DEFAULT_SCALE})
+    engine.dispose()
+    print(info['counts'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Compare SQLite read/write concurrency with default settings and with db_engine tuning.
+
+Runs the same mixed workload (writer threads inserting users, reader
+threads looking users up by email) against two throwaway databases: one
+with SQLite and pysqlite defaults (rollback journal, FULL sync) and one
+configured through db_engine (WAL, synchronous=NORMAL, busy_timeout, mmap,
+cache).
+Prints throughput, latency percentiles and "database is locked" errors as
+JSON.
+
+    python -m benchmarks.sqlite_concurrency --writers 4 --readers 8 --seconds 10
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db import db  # noqa: E402
+import models  # noqa: E402,F401  (registers every table on db.metadata)
+from db_engine import configure_engine, engine_options  # noqa: E402
+
+INSERT_SQL = text("INSERT INTO users (email, password_hash, role) VALUES (:email, 'x', 'volunteer')")
+SELECT_SQL = text("SELECT id, role FROM users WHERE email = :email")
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[max(int(len(values) * fraction) - 1, 0)], 3)
+
+
+def run_workload(engine, writers, readers, seconds, seed_users):
+    with engine.begin() as connection:
+        connection.execute(INSERT_SQL, [{'email': f'seed{i}@example.com'} for i in range(seed_users)])
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {'writes': [], 'reads': [], 'write_errors': 0, 'read_errors': 0}
+
+    def writer(worker_id):
+        counter = 0
+        while not stop.is_set():
+            counter += 1
+            started = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    connection.execute(INSERT_SQL, {'email': f'w{worker_id}-{counter}@example.com'})
+            except OperationalError:
+                with lock:
+                    stats['write_errors'] += 1
+                continue
+            with lock:
+                stats['writes'].append((time.perf_counter() - started) * 1000)
+
+    def reader(worker_id):
+        rng = random.Random(worker_id)
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(SELECT_SQL, {'email': f'seed{rng.randrange(seed_users)}@example.com'}).first()
+            except OperationalError:
+                with lock:
+                    stats['read_errors'] += 1
+                continue
+            with lock:
+                stats['reads'].append((time.perf_counter() - started) * 1000)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'writes_per_second': round(len(stats['writes']) / seconds, 1),
+        'reads_per_second': round(len(stats['reads']) / seconds, 1),
+        'write_p50_ms': percentile(stats['writes'], 0.50),
+        'write_p99_ms': percentile(stats['writes'], 0.99),
+        'read_p50_ms': percentile(stats['reads'], 0.50),
+        'read_p99_ms': percentile(stats['reads'], 0.99),
+        'write_errors': stats['write_errors'],
+        'read_errors': stats['read_errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--seed-users', type=int, default=10000)
+    args = parser.parse_args()
+
+    report = {'writers': args.writers, 'readers': args.readers, 'seconds': args.seconds}
+    pool = {'pool_size': args.writers + args.readers, 'max_overflow': 0}
+    with tempfile.TemporaryDirectory() as directory:
+        default_url = f"sqlite:///{os.path.join(directory, 'default.db')}"
+        default_engine = create_engine(default_url, connect_args={'check_same_thread': False}, **pool)
+        db.metadata.create_all(default_engine)
+        report['default'] = run_workload(default_engine, args.writers, args.readers, args.seconds, args.seed_users)
+        default_engine.dispose()
+
+        tuned_url = f"sqlite:///{os.path.join(directory, 'tuned.db')}"
+        options = engine_options(tuned_url)
+        options.update(pool)
+        tuned_engine = create_engine(tuned_url, **options)
+        configure_engine(tuned_engine)
+        db.metadata.create_all(tuned_engine)
+        report['tuned'] = run_workload(tuned_engine, args.writers, args.readers, args.seconds, args.seed_users)
+        tuned_engine.dispose()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
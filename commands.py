@@ -0,0 +1,64 @@
+import click
+from flask import current_app
+
+from services.job_stats_service import JobStatsService
+
+
+def register_commands(app):
+    @app.cli.command('rebuild-job-counts')
+    def rebuild_job_counts():
+        """Recompute the materialized per-job application counters."""
+        JobStatsService.rebuild_counts()
+        click.echo('Job application counts rebuilt.')
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index():
+        """Recreate the full-text search indexes from their source tables."""
+        from db import db
+        from utils.fts import fts_supported, rebuild_fts
+
+        with db.engine.begin() as connection:
+            if not fts_supported(connection):
+                click.echo('Full-text indexes are only used on SQLite; nothing to rebuild.')
+                return
+            rebuild_fts(connection)
+        click.echo('Search indexes rebuilt.')
+
+    @app.cli.command('send-invitations')
+    @click.option('--once', is_flag=True, help='Exit once no invitation is due instead of polling.')
+    @click.option('--poll-interval', type=float, default=None, help='Seconds to sleep when the outbox is empty.')
+    def send_invitations(once, poll_interval):
+        """Deliver queued interview invitations to Google Calendar."""
+        from services.invitation_service import InvitationService
+        from utils.calendar_client import FakeCalendarService, get_calendar_service
+
+        if current_app.config['CALENDAR_BACKEND'] == 'fake':
+            fake = FakeCalendarService()
+            get_service = lambda: fake  # noqa: E731
+        else:
+            get_service = get_calendar_service
+        InvitationService.run_worker(get_service, poll_interval=poll_interval, once=once)
+        if once:
+            click.echo('No invitations due.')
+
+    @app.cli.command('extract-resumes')
+    @click.option('--once', is_flag=True, help='Exit once no resume is pending instead of polling.')
+    @click.option('--poll-interval', type=float, default=None, help='Seconds to sleep when nothing is pending.')
+    @click.option('--retry-failed', is_flag=True, help='Also retry resumes whose extraction failed.')
+    def extract_resumes(once, poll_interval, retry_failed):
+        """Extract and index the text of uploaded resumes still pending extraction."""
+        from services.resume_service import ResumeService
+
+        statuses = ('pending', 'failed') if retry_failed else ('pending',)
+        ResumeService.run_worker(poll_interval=poll_interval, once=once, statuses=statuses)
+        if once:
+            click.echo('No resumes pending extraction.')
+
+    @app.cli.command('prune-resumes')
+    @click.option('--grace-seconds', type=int, default=None, help='Keep unreferenced files younger than this.')
+    def prune_resumes(grace_seconds):
+        """Delete stored resume files that no resume row references any more."""
+        from services.resume_service import ResumeService
+
+        removed = ResumeService.prune_blobs(grace_seconds)
+        click.echo(f'Removed {len(removed)} unreferenced resume files.')
@@ -1,6 +1,8 @@
 import os
 from datetime import timedelta
 
+from db_engine import database_url, engine_options
+
 # class Config:
 #     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///volunteer_system.db')
 #     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -10,7 +12,8 @@ from datetime import timedelta
 class Config:
     # Absolute path to the database file
     db_path = os.path.join(os.getcwd(), 'volunteer_system.db')
-    SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
+    SQLALCHEMY_DATABASE_URI = database_url(f'sqlite:///{db_path}')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'dev-secret-key')
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key' # Use SECRET_KEY for JWT
@@ -28,3 +31,68 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.abspath(os.path.dirname(__file__)), 'uploads')
     RESUMES_FOLDER = os.path.join(UPLOAD_FOLDER, 'resumes')  # Subfolder for resumes
     MAX_CONTENT_LENGTH = 10 * 1024 * 1024  # 10 MB limit
+
+    # Read per-job application counts from the job_application_counts table
+    # instead of aggregating job_applications on every listing
+    MATERIALIZED_JOB_COUNTS = os.getenv('MATERIALIZED_JOB_COUNTS', 'false').lower() == 'true'
+
+    # Seconds to remember user id -> Commander/HR/Volunteer id across requests (0 disables)
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', '0'))
+    IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', '4096'))
+
+    # Interview invitations are queued in calendar_invitations and sent by `flask send-invitations`.
+    # CALENDAR_BACKEND=fake swaps Google Calendar for an in-memory client (local development)
+    CALENDAR_BACKEND = os.getenv('CALENDAR_BACKEND', 'google')
+    CALENDAR_ID = os.getenv('CALENDAR_ID', 'primary')
+    INVITATION_BATCH_SIZE = int(os.getenv('INVITATION_BATCH_SIZE', '50'))
+    INVITATION_MAX_ATTEMPTS = int(os.getenv('INVITATION_MAX_ATTEMPTS', '6'))
+    INVITATION_RETRY_BASE_SECONDS = int(os.getenv('INVITATION_RETRY_BASE_SECONDS', '30'))
+    INVITATION_RETRY_MAX_SECONDS = int(os.getenv('INVITATION_RETRY_MAX_SECONDS', '3600'))
+    INVITATION_SENDING_TIMEOUT = int(os.getenv('INVITATION_SENDING_TIMEOUT', '300'))
+    INVITATION_POLL_SECONDS = int(os.getenv('INVITATION_POLL_SECONDS', '5'))
+
+    # Interview slots: default and longest duration in minutes, and the working hours free slots are
+    # offered in (local time in INTERVIEW_TIMEZONE, on INTERVIEW_WORK_DAYS). Conflict checks only look back
+    # INTERVIEW_MAX_MINUTES from a new interview's start, so lowering it hides longer existing interviews
+    INTERVIEW_DURATION_MINUTES = int(os.getenv('INTERVIEW_DURATION_MINUTES', '60'))
+    INTERVIEW_MAX_MINUTES = int(os.getenv('INTERVIEW_MAX_MINUTES', '480'))
+    INTERVIEW_SLOT_STEP_MINUTES = int(os.getenv('INTERVIEW_SLOT_STEP_MINUTES', '15'))
+    INTERVIEW_TIMEZONE = os.getenv('INTERVIEW_TIMEZONE', 'Asia/Jerusalem')
+    INTERVIEW_DAY_START = os.getenv('INTERVIEW_DAY_START', '08:00')
+    INTERVIEW_DAY_END = os.getenv('INTERVIEW_DAY_END', '17:00')
+    INTERVIEW_WORK_DAYS = os.getenv('INTERVIEW_WORK_DAYS', 'sun,mon,tue,wed,thu')
+
+    # Algorithm and cost for new password hashes (see utils/passwords.py); older hashes are upgraded on login
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Threads verifying passwords per process (0 verifies on the request thread)
+    PASSWORD_VERIFY_WORKERS = int(os.getenv('PASSWORD_VERIFY_WORKERS', '0'))
+
+    # POST /api/hr/volunteers/bulk: rows per transaction and processes hashing passwords (0 hashes inline)
+    BULK_IMPORT_BATCH_SIZE = int(os.getenv('BULK_IMPORT_BATCH_SIZE', '500'))
+    BULK_IMPORT_HASH_WORKERS = int(os.getenv('BULK_IMPORT_HASH_WORKERS', str(os.cpu_count() or 1)))
+
+    # Seconds to cache the serialized GET /api/volunteer/jobs board (0 disables). With CACHE_REDIS_URL set
+    # (and the redis package installed) entries and invalidations are shared by all workers
+    JOB_BOARD_CACHE_TTL = int(os.getenv('JOB_BOARD_CACHE_TTL', '30'))
+    JOB_BOARD_CACHE_SIZE = int(os.getenv('JOB_BOARD_CACHE_SIZE', '256'))
+    # Seconds to cache a commander's .ics interview feed (0 disables); any interview change drops every feed
+    INTERVIEW_FEED_CACHE_TTL = int(os.getenv('INTERVIEW_FEED_CACHE_TTL', '300'))
+    INTERVIEW_FEED_CACHE_SIZE = int(os.getenv('INTERVIEW_FEED_CACHE_SIZE', '1024'))
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL')
+
+    # Full-text searches rank at most this many of the newest matches (0 ranks every match)
+    SEARCH_RANK_WINDOW = int(os.getenv('SEARCH_RANK_WINDOW', '2000'))
+
+    # Seconds before a worker rebuilds its volunteer/job matching index (0 never does). Edits made through
+    # this worker and newly created rows show up immediately; edits made through other workers after the TTL
+    MATCHING_INDEX_TTL = int(os.getenv('MATCHING_INDEX_TTL', '600'))
+
+    # Processes extracting resume text after upload (0 leaves every upload to `flask extract-resumes`)
+    RESUME_EXTRACTION_WORKERS = int(os.getenv('RESUME_EXTRACTION_WORKERS', '2'))
+    RESUME_EXTRACTION_POLL_SECONDS = float(os.getenv('RESUME_EXTRACTION_POLL_SECONDS', '10'))
+    # `flask prune-resumes` keeps unreferenced resume files younger than this
+    RESUME_BLOB_GRACE_SECONDS = int(os.getenv('RESUME_BLOB_GRACE_SECONDS', '3600'))
+    # Resume downloads: let the front proxy send the file. USE_X_SENDFILE adds an X-Sendfile header
+    # (Apache/lighttpd); RESUME_X_ACCEL_PREFIX is an nginx `internal` location aliased to RESUMES_FOLDER
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'false').lower() in ('1', 'true', 'yes')
+    RESUME_X_ACCEL_PREFIX = os.getenv('RESUME_X_ACCEL_PREFIX', '')
@@ -1,178 +1,69 @@
+import mimetypes
 import os
-from datetime import date
-from flask import Blueprint, request, jsonify, send_file, current_app, send_from_directory
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from werkzeug.exceptions import BadRequest
+import unicodedata
+from datetime import date, timedelta
+from urllib.parse import quote
+from flask import Blueprint, request, jsonify, current_app, send_file, Response, stream_with_context, url_for
+from werkzeug.exceptions import BadRequest, Conflict
 
-from models import Resume, JobApplication
+from models.application import ApplicationStatus
 from services.commander_service import CommanderService
-from models.user import User
-import io
-
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-import pickle
-from datetime import datetime, timedelta
-import pytz
+from services.interview_service import InterviewService
+from services.invitation_service import InvitationService
+from services.resume_service import ResumeService
+from utils.filters import parse_filters, JOB_FILTERS
+from utils.fts import parse_search_args
+from utils.identity import role_required, current_profile_id
+from utils.pagination import PageRequest, page_response, parse_limit
+from utils.response_cache import interview_feed_cache
 
 commander_bp = Blueprint('commander', __name__)
 
-SCOPES = ['https://www.googleapis.com/auth/calendar']
-
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-CLIENT_SECRET_FILE = os.getenv("GOOGLE_CLIENT_SECRET")
-if not CLIENT_SECRET_FILE:
-    raise RuntimeError("GOOGLE_CLIENT_SECRET environment variable is not set!")
-CLIENT_SECRET_FILE = os.path.join(BASE_DIR, 'utils', CLIENT_SECRET_FILE)
-TOKEN_FILE = os.path.join(BASE_DIR, 'utils', 'token1.pickle')
-REDIRECT_URI = 'http://localhost:8080/'
-
-
-def get_calendar_service():
-    """Get or create Calendar API service"""
-    creds = None
-
-    # Check if token file exists
-    if os.path.exists(TOKEN_FILE):
-        with open(TOKEN_FILE, 'rb') as token:
-            creds = pickle.load(token)
-
-    # If no valid credentials available, let the user log in
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists(CLIENT_SECRET_FILE):
-                raise FileNotFoundError(
-                    f"Client secret file not found at {CLIENT_SECRET_FILE}. "
-                    "Please download it from Google Cloud Console and place it in the config directory."
-                )
-
-            flow = InstalledAppFlow.from_client_secrets_file(
-                CLIENT_SECRET_FILE,
-                SCOPES,
-                redirect_uri=REDIRECT_URI
-            )
-            creds = flow.run_local_server(port=8080)
-
-            # Save the credentials for future use
-            os.makedirs(os.path.dirname(TOKEN_FILE), exist_ok=True)
-            with open(TOKEN_FILE, 'wb') as token:
-                pickle.dump(creds, token)
-
-    return build('calendar', 'v3', credentials=creds)
+MAX_BATCH_STATUS_CHANGES = 500
+MAX_AUTO_SCHEDULE = 100
 
 
 @commander_bp.route('/send-interview-invitation', methods=['POST'])
-@jwt_required()
+@role_required('commander')
 def invite_interview():
-    """Schedule an interview and send calendar invitations to both candidate and commander"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
+    """Queue calendar invitations to both candidate and commander; the invitation worker sends them"""
     try:
-        # Get the calendar service using our configuration
-        service = get_calendar_service()
+        invitation = InvitationService.enqueue_invitation(current_profile_id(), request.get_json())
+    except BadRequest as e:
+        return jsonify({'error': e.description}), 400
 
-        data = request.get_json()
-        required_fields = ['candidate_email', 'commander_email', 'job_title', 'interview_time']
-        if not all(field in data for field in required_fields):
-            return jsonify({'error': 'Missing required fields'}), 400
+    return jsonify({
+        'message': 'Interview invitation queued',
+        'invitation_id': invitation.id,
+        'status': invitation.status,
+        'status_url': url_for('commander.get_interview_invitation', invitation_id=invitation.id),
+        'scheduled_time': InvitationService.scheduled_time(invitation)
+    }), 202
 
-        # Parse the interview time
-        try:
-            interview_time = datetime.fromisoformat(data['interview_time'].replace('Z', '+00:00'))
-        except ValueError:
-            return jsonify({'error': 'Invalid interview time format. Use ISO 8601 format'}), 400
-
-        # Set interview duration
-        interview_end = interview_time + timedelta(hours=1)
-
-        event = {
-            'summary': f'Interview for {data["job_title"]} Position',
-            'location': 'Online',
-            'description': f'''Interview for the position of {data["job_title"]}
-
-        Commander: {data.get("commander_name", "Interview Commander")}
-        Candidate: {data.get("candidate_name", "Candidate")}
-
-        Additional Info: {data.get("additional_info", "")}''',
-            'start': {
-                'dateTime': interview_time.isoformat(),
-                'timeZone': 'Asia/Jerusalem',
-            },
-            'end': {
-                'dateTime': interview_end.isoformat(),
-                'timeZone': 'Asia/Jerusalem',
-            },
-            'attendees': [
-                {
-                    'email': data['commander_email'],
-                    'responseStatus': 'accepted',  # Auto-accept for organizer
-                    'optional': False  # Mark as required attendee
-                },
-                {
-                    'email': data['candidate_email'],
-                    'responseStatus': 'needsAction',
-                    'optional': False  # Mark as required attendee
-                }
-            ],
-            'reminders': {
-                'useDefault': False,
-                'overrides': [
-                    {'method': 'email', 'minutes': 24 * 60},
-                    {'method': 'popup', 'minutes': 30}
-                ]
-            },
-            'guestsCanModify': False,  # Prevents attendees from modifying the event
-            'guestsCanInviteOthers': False,  # Prevents attendees from inviting others
-            'sendNotifications': True  # Explicitly request notifications
-        }
-
-        if data.get('include_meet_link', True):
-            event['conferenceData'] = {
-                'createRequest': {
-                    'requestId': f"interview-{datetime.now().timestamp()}",
-                    'conferenceSolutionKey': {'type': 'hangoutsMeet'}
-                }
-            }
 
-        try:
-            event_result = service.events().insert(
-                calendarId='primary',
-                body=event,
-                conferenceDataVersion=1,
-                sendUpdates='all',  # This ensures all attendees get notifications
-                sendNotifications=True  # Additional parameter to force notifications
-            ).execute()
-
-            return jsonify({
-                'message': 'Interview scheduled successfully',
-                'event_link': event_result.get('htmlLink'),
-                'meeting_link': event_result.get('conferenceData', {}).get('entryPoints', [{}])[0].get('uri', None),
-                'scheduled_time': interview_time.isoformat()
-            }), 201
-
-        except HttpError as error:
-            return jsonify({'error': f'Calendar API error: {str(error)}'}), 500
+@commander_bp.route('/interview-invitations/<int:invitation_id>', methods=['GET'])
+@role_required('commander')
+def get_interview_invitation(invitation_id):
+    invitation = InvitationService.get_invitation(invitation_id, current_profile_id())
+    if not invitation:
+        return jsonify({'message': 'Invitation not found'}), 404
 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+    return jsonify({
+        'invitation_id': invitation.id,
+        'status': invitation.status,
+        'attempts': invitation.attempts,
+        'event_link': invitation.event_link,
+        'meeting_link': invitation.meeting_link,
+        'error': invitation.last_error if invitation.status != 'sent' else None,
+        'scheduled_time': InvitationService.scheduled_time(invitation)
+    }), 200
 
 
 @commander_bp.route('/jobs', methods=['POST'])
-@jwt_required()
+@role_required('commander')
 def create_job():
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     data = request.get_json()
-    job = CommanderService.create_job(current_user.commander.id, data)
+    job = CommanderService.create_job(current_profile_id(), data)
 
     return jsonify({
         'message': 'Job created successfully',
@@ -181,13 +72,15 @@ def create_job():
 
 
 @commander_bp.route('/jobs', methods=['GET'])
-@jwt_required()
+@role_required('commander')
 def get_jobs():
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
+    try:
+        page = PageRequest.from_args(request.args)
+        jobs, next_cursor = CommanderService.get_commander_jobs(
+            current_profile_id(), parse_filters(request.args, JOB_FILTERS), page)
+    except BadRequest as e:
+        return jsonify({'message': str(e)}), 400
 
-    jobs = CommanderService.get_commander_jobs(current_user.commander.id)
     payload = [{
         'id': str(job.id),
         'jobName': job.title,
@@ -218,16 +111,61 @@ def get_jobs():
         'applications_count': len(job.applications)
     } for job in jobs]
 
-    return jsonify(payload), 200
+    return jsonify(page_response(payload, page, next_cursor)), 200
+
+
+@commander_bp.route('/dashboard', methods=['GET'])
+@role_required('commander')
+def get_dashboard():
+    """Per-job pipeline counts, vacancy fill rate and the next interviews, in one request"""
+    try:
+        upcoming_limit = parse_limit(request.args, default=20, maximum=100)
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+    jobs, upcoming = CommanderService.get_dashboard(current_profile_id(), upcoming_limit)
+
+    payload, totals = [], dict.fromkeys(('applications', 'hired', 'vacantPositions', 'upcomingInterviews'), 0)
+    for job, counts, upcoming_interviews in jobs:
+        hired = counts[ApplicationStatus.HIRED.value]
+        positions = hired + (job.vacant_positions or 0)
+        payload.append({
+            'id': str(job.id),
+            'jobName': job.title,
+            'status': job.status.name,
+            'isActive': job.is_active,
+            'positions': job.vacant_positions,
+            'hired': hired,
+            'fillRate': round(hired / positions, 4) if positions else None,
+            'candidateCount': counts['total'],
+            'applicationCounts': {status: total for status, total in counts.items() if status != 'total'},
+            'upcomingInterviews': upcoming_interviews
+        })
+        totals['applications'] += counts['total']
+        totals['hired'] += hired
+        totals['vacantPositions'] += job.vacant_positions or 0
+        totals['upcomingInterviews'] += upcoming_interviews
+    positions = totals['hired'] + totals['vacantPositions']
+    totals.update(jobs=len(payload), fillRate=round(totals['hired'] / positions, 4) if positions else None)
+
+    return jsonify({
+        'totals': totals,
+        'jobs': payload,
+        'upcomingInterviews': [{
+            'interviewId': interview.id,
+            'applicationId': application.id,
+            'jobId': str(application.job_id),
+            'jobName': job_title,
+            'candidateId': str(application.volunteer_id),
+            'candidateName': full_name,
+            'interviewDate': interview.scheduled_date.isoformat(),
+            'status': interview.status
+        } for interview, application, full_name, job_title in upcoming]
+    }), 200
 
 
 @commander_bp.route('/jobs/<int:job_id>', methods=['PATCH'])
-@jwt_required()
+@role_required('commander')
 def patch_job_route(job_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     job = CommanderService.get_job_by_id(job_id)
     if not job:
         return jsonify({'message': 'Job not found'}), 404
@@ -278,13 +216,9 @@ def calculate_age(born):
 
 
 @commander_bp.route('/jobs/<int:job_id>/applications', methods=['GET'])
-@jwt_required()
+@role_required('commander')
 def get_job_applications(job_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
-    applications = CommanderService.get_job_applications(job_id, current_user.commander.id)
+    applications = CommanderService.get_job_applications(job_id, current_profile_id())
     return jsonify([{
         'candidateUserId': app.volunteer.id,
         'name': app.volunteer.full_name,
@@ -294,90 +228,195 @@ def get_job_applications(job_id):
     } for app in applications]), 200
 
 
+@commander_bp.route('/jobs/<int:job_id>/applications', methods=['PATCH'])
+@role_required('commander')
+def update_job_application_statuses(job_id):
+    """Change the status of many applications to a job in one transaction; returns a result per change"""
+    data = request.get_json(silent=True) or {}
+    changes = data.get('changes')
+    if not isinstance(changes, list) or not changes:
+        return jsonify({'message': "'changes' must be a non-empty list"}), 400
+    if len(changes) > MAX_BATCH_STATUS_CHANGES:
+        return jsonify({'message': f'At most {MAX_BATCH_STATUS_CHANGES} changes per request'}), 400
+    if not all(isinstance(change, dict) for change in changes):
+        return jsonify({'message': "Each change must be an object with 'volunteer_id' and 'status'"}), 400
+
+    results = CommanderService.patch_job_application_statuses(job_id, current_profile_id(), changes)
+    updated = sum(result['updated'] for result in results)
+    failed = sum('error' in result for result in results)
+    return jsonify({
+        'message': f'{updated} applications updated',
+        'updated': updated,
+        'unchanged': len(results) - updated - failed,
+        'failed': failed,
+        'results': results
+    }), 200 if failed < len(results) else 400
+
+
 @commander_bp.route('/jobs/<int:job_id>/volunteers/<int:volunteer_id>', methods=['PATCH'])
-@jwt_required()
+@role_required('commander')
 def update_job_application_status(job_id, volunteer_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     try:
-        updated_application = CommanderService.patch_job_application_status(job_id, volunteer_id, request.get_json())
+        updated_application = CommanderService.patch_job_application_status(
+            job_id, volunteer_id, request.get_json(), current_profile_id())
         return jsonify({'message': 'Job application status updated successfully', 'application': {
             'id': str(updated_application.id),
             'status': updated_application.status.name,
         }}), 200
     except BadRequest as e:
         return jsonify({"message": str(e)}), 400
+    except Conflict as e:
+        return jsonify({"message": e.description}), 409
+
+
+def interview_payload(interview, job_id, user_id):
+    duration = interview.scheduled_end - interview.scheduled_date \
+        if interview.scheduled_date and interview.scheduled_end else None
+    return {
+        "candidateId": str(user_id),
+        "jobId": str(job_id),
+        "applicationId": interview.application_id,
+        "interviewNotes": interview.general_info,
+        "interviewDate": interview.scheduled_date.isoformat() if interview.scheduled_date else None,
+        "interviewEnd": interview.scheduled_end.isoformat() if interview.scheduled_end else None,
+        "durationMinutes": duration // timedelta(minutes=1) if duration else None,
+        "automaticMessage": interview.schedule,
+        "status": interview.status
+    }
 
 
 @commander_bp.route('/jobs/<int:job_id>/volunteers/<int:user_id>/interviews', methods=['POST', 'GET', 'PATCH', 'DELETE'])
-@jwt_required()
+@role_required('commander')
 def interview_management(job_id, user_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     try:
         if request.method == 'POST':
             data = request.get_json()
-            interview = CommanderService.create_interview(job_id, user_id, data)
-            return jsonify({'message': 'Interview created successfully', 'interview': {
-                "candidateId": str(user_id),
-                "jobId": str(job_id),
-                "interviewNotes": interview.general_info,
-                "interviewDate": interview.scheduled_date.isoformat() if interview.scheduled_date else None,
-                "automaticMessage": interview.schedule,
-                "status": interview.status
-            }}), 201
+            interview = CommanderService.create_interview(job_id, user_id, data, current_profile_id())
+            return jsonify({'message': 'Interview created successfully',
+                            'interview': interview_payload(interview, job_id, user_id)}), 201
 
         elif request.method == 'GET':
-            interview = CommanderService.get_interview(job_id, user_id)
+            interview = CommanderService.get_interview(job_id, user_id, current_profile_id())
             if not interview:
                 return jsonify({'message': 'Interview not found'}), 404
-            return jsonify({
-                "candidateId": str(user_id),
-                "jobId": str(job_id),
-                'applicationId':interview.application_id,
-                "interviewNotes": interview.general_info,
-                "interviewDate": interview.scheduled_date.isoformat() if interview.scheduled_date else None,
-                "automaticMessage": interview.schedule,
-                "status": interview.status
-            }), 200
+            return jsonify(interview_payload(interview, job_id, user_id)), 200
 
         elif request.method == 'PATCH':
             data = request.get_json()
-            interview = CommanderService.patch_interview(job_id, user_id, data)
+            interview = CommanderService.patch_interview(job_id, user_id, data, current_profile_id())
             if not interview:
                 return jsonify({'message': 'Interview not found'}), 404
-            return jsonify({
-                "candidateId": str(user_id),
-                "jobId": str(job_id),
-                "interviewNotes": interview.general_info,
-                "interviewDate": interview.scheduled_date.isoformat() if interview.scheduled_date else None,
-                "automaticMessage": interview.schedule,
-                "status": interview.status
-            }), 200
+            return jsonify(interview_payload(interview, job_id, user_id)), 200
         elif request.method == 'DELETE':
-            CommanderService.delete_interview(job_id, user_id)
+            CommanderService.delete_interview(job_id, user_id, current_profile_id())
             return jsonify({'message': 'Interview deleted successfully'}), 200
 
     except BadRequest as e:
         return jsonify({"message": str(e)}), 400
+    except Conflict as e:
+        return jsonify({"message": e.description}), 409
     except Exception as e:
         return jsonify({"message": "An error occurred: " + str(e)}), 500
 
 
+@commander_bp.route('/interviews', methods=['GET'])
+@role_required('commander')
+def get_interviews():
+    """The commander's interviews between ?from= and ?to= (UTC, default next 7 days), soonest first"""
+    try:
+        start, end = InterviewService.parse_range(request.args)
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+    rows = InterviewService.agenda(current_profile_id(), start, end)
+
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'interviews': [dict(interview_payload(interview, job_id, volunteer_id),
+                            interviewId=interview.id, candidateName=full_name, jobName=job_title)
+                       for interview, job_id, volunteer_id, full_name, job_title in rows]
+    }), 200
+
+
+@commander_bp.route('/interviews/feed', methods=['GET'])
+@role_required('commander')
+def get_interview_feed_url():
+    """Subscription URL of the commander's .ics interview feed; the token in it is the only credential"""
+    token = InterviewService.feed_token(current_profile_id())
+    return jsonify({'url': url_for('commander.get_interview_feed', token=token, _external=True)}), 200
+
+
+@commander_bp.route('/interviews/feed/<token>.ics', methods=['GET'])
+def get_interview_feed(token):
+    """iCalendar feed for calendar clients, which cannot send a JWT; served from cache with an ETag"""
+    commander_id = InterviewService.feed_commander_id(token)
+    if commander_id is None:
+        return jsonify({'message': 'Invalid feed token'}), 404
+
+    entry, slot = interview_feed_cache.lookup(str(commander_id))
+    if entry is None:
+        entry = interview_feed_cache.store(slot, InterviewService.feed_ics(commander_id).encode('utf-8'))
+
+    etag, body = entry
+    response = Response(body, mimetype='text/calendar')
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@commander_bp.route('/interviews/free-slots', methods=['GET'])
+@role_required('commander')
+def get_free_interview_slots():
+    """Free interview slots in the commander's working hours between ?from= and ?to= (UTC, default next 7 days)"""
+    try:
+        start, end = InterviewService.parse_range(request.args)
+        duration = InterviewService.duration(request.args.get('duration'))
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+    slots = InterviewService.free_slots(current_profile_id(), start, end, duration)
+
+    return jsonify({
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'durationMinutes': duration // timedelta(minutes=1),
+        'slots': [{'start': slot_start.isoformat(), 'end': slot_end.isoformat()} for slot_start, slot_end in slots]
+    }), 200
+
+
+@commander_bp.route('/jobs/<int:job_id>/interviews/auto-schedule', methods=['POST'])
+@role_required('commander')
+def auto_schedule_interviews(job_id):
+    """Book candidates into the earliest free slots: the given volunteer_ids, or every preferred candidate"""
+    data = request.get_json(silent=True) or {}
+    volunteer_ids = data.get('volunteer_ids')
+    try:
+        if volunteer_ids is not None:
+            if not isinstance(volunteer_ids, list) or len(volunteer_ids) > MAX_AUTO_SCHEDULE:
+                raise BadRequest(f"'volunteer_ids' must be a list of at most {MAX_AUTO_SCHEDULE} ids")
+            try:
+                volunteer_ids = list(dict.fromkeys(int(volunteer_id) for volunteer_id in volunteer_ids))
+            except (TypeError, ValueError):
+                raise BadRequest("'volunteer_ids' must be integers")
+        start, end = InterviewService.parse_range(data, default_days=14)
+        duration = InterviewService.duration(data.get('durationMinutes'))
+        results = InterviewService.auto_schedule(job_id, current_profile_id(), start, end, duration, volunteer_ids)
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+
+    scheduled = sum('interview_id' in result for result in results)
+    return jsonify({
+        'message': f'{scheduled} interviews scheduled',
+        'scheduled': scheduled,
+        'failed': len(results) - scheduled,
+        'results': results
+    }), 201 if scheduled else 200
+
+
 @commander_bp.route('/volunteers/<int:volunteer_id>', methods=['GET'])
-@jwt_required()
+@role_required('commander')
 def get_volunteer(volunteer_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
-    current_commander_id = current_user.id
-    print('id of commander is', current_commander_id)
-    volunteer = CommanderService.get_volunteer_if_applied_to_commander_jobs(current_commander_id, volunteer_id)
+    volunteer = CommanderService.get_volunteer_if_applied_to_commander_jobs(current_profile_id(), volunteer_id)
 
     if not volunteer:
         return jsonify({'message': 'Volunteer has not applied to any of your jobs'}), 404
@@ -410,32 +449,29 @@ def get_volunteer(volunteer_id):
 
 
 @commander_bp.route('/applications/<int:application_id>/status', methods=['PUT'])
-@jwt_required()
+@role_required('commander')
 def update_application_status(application_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
-    data = request.get_json()
-    application = CommanderService.update_application_status(
-        application_id,
-        current_user.commander.id,
-        data['status']
-    )
+    data = request.get_json(silent=True) or {}
+    try:
+        application = CommanderService.update_application_status(
+            application_id,
+            current_profile_id(),
+            data.get('status')
+        )
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+    except Conflict as e:
+        return jsonify({'message': e.description}), 409
     return jsonify({'message': 'Status updated successfully'}), 200
 
 
 @commander_bp.route('/applications/<int:application_id>/interview', methods=['POST'])
-@jwt_required()
+@role_required('commander')
 def schedule_interview(application_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     data = request.get_json()
     interview = CommanderService.schedule_interview(
         application_id,
-        current_user.commander.id,
+        current_profile_id(),
         data
     )
     return jsonify({
@@ -444,60 +480,111 @@ def schedule_interview(application_id):
     }), 201
 
 
-@commander_bp.route('/jobs/<int:job_id>/volunteers/<int:user_id>/resume', methods=['GET'])
-@jwt_required()
-def get_resume_for_application(job_id, user_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
+def set_inline_filename(response, filename):
+    """Content-Disposition: inline for ``filename``, the way send_file writes it.
 
-    application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=user_id).first()
-    if not application:
-        return jsonify({'message': 'Application not found'}), 404
+    Non-ASCII names get an RFC 5987 ``filename*`` plus an ASCII fallback, and
+    the header encoder quotes and escapes the values; control characters are
+    dropped, so a stored name can neither break out of the header nor make
+    setting it fail.
+    """
+    filename = ''.join(char for char in filename if char.isprintable()) or 'resume'
+    try:
+        filename.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+        names = {'filename': simple, 'filename*': f"UTF-8''{quote(filename, safe='!#$&+^`|~')}"}
+    else:
+        names = {'filename': filename}
+    response.headers.set('Content-Disposition', 'inline', **names)
 
-    resume = Resume.query.filter_by(application_id=application.id).first()
+
+@commander_bp.route('/jobs/<int:job_id>/volunteers/<int:user_id>/resume', methods=['GET'])
+@role_required('commander')
+def get_resume_for_application(job_id, user_id):
+    resume = ResumeService.get_application_resume(job_id, user_id, current_profile_id())
     if not resume:
         return jsonify({'message': 'Resume not found for this application'}), 404
 
-    resumes_folder = current_app.config['RESUMES_FOLDER']
-    upload_folder = current_app.config['UPLOAD_FOLDER']
-    full_path = os.path.join(upload_folder, resumes_folder, resume.file_path)
+    full_path = ResumeService.resume_path(resume)
+    accel_prefix = current_app.config['RESUME_X_ACCEL_PREFIX']
+    if accel_prefix:
+        # nginx serves the bytes (and Range) from an internal location; only 304s are answered here
+        response = Response(mimetype=mimetypes.guess_type(resume.original_filename or full_path)[0]
+                            or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + resume.file_path.replace(os.sep, '/')
+        set_inline_filename(response, resume.original_filename or 'resume')
+        response.last_modified = resume.upload_date
+        if resume.content_hash:
+            response.set_etag(resume.content_hash)
+        response = response.make_conditional(request)
+    else:
+        try:
+            # Handles Range and If-None-Match / If-Modified-Since; honours USE_X_SENDFILE
+            response = send_file(full_path, conditional=True, etag=resume.content_hash or True,
+                                 last_modified=resume.upload_date, download_name=resume.original_filename)
+        except FileNotFoundError:
+            return jsonify({'message': 'File not found on server'}), 404
+    # Resumes are personal data: never stored by shared caches, always revalidated
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@commander_bp.route('/jobs/<int:job_id>/resumes.zip', methods=['GET'])
+@role_required('commander')
+def download_job_resumes(job_id):
+    files = ResumeService.job_resume_files(job_id, current_profile_id())
+    if not files:
+        return jsonify({'message': 'No resumes found'}), 404
+
+    return Response(
+        ResumeService.stream_zip(files),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename=resumes_job_{job_id}.zip'}
+    )
 
-    if not os.path.exists(full_path):
-        return jsonify({'message': 'File not found on server'}), 404
 
-    uploads_path = os.path.join(current_app.root_path, current_app.config['UPLOAD_FOLDER'])
-    resumes_path = os.path.join(uploads_path, current_app.config['RESUMES_FOLDER'])
-    filename = resume.file_path
+@commander_bp.route('/jobs/<int:job_id>/resumes/search', methods=['GET'])
+@role_required('commander')
+def search_job_resumes(job_id):
+    """Full-text search over the resumes of a job's applicants: ?q=words[&limit=&offset=]"""
+    if not ResumeService.job_owned_by(job_id, current_profile_id()):
+        return jsonify({'message': 'Job not found'}), 404
     try:
-        return send_from_directory(resumes_path, filename)
-        # return send_from_directory(resumes_path, filename, as_attachment=True, download_name="resume.pdf")
-    except FileNotFoundError:
-        return jsonify({'message': 'File not found on server'}), 404
-    except Exception as e:
-        return jsonify({'message': f'An unexpected error occurred: {str(e)}'}), 500  # Return JSON error
-    # return jsonify({
-    #     'file_path': resume.file_path,
-    #     'application_id': resume.application_id,
-    #     # ... other resume details
-    # }), 200
+        query, limit, offset = parse_search_args(request.args)
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+
+    return jsonify([{
+        'applicationId': application.id,
+        'candidateUserId': volunteer.id,
+        'name': volunteer.full_name,
+        'status': application.status.value,
+        'snippet': snippet,
+        'rank': rank
+    } for application, volunteer, rank, snippet in ResumeService.search_job_resumes(job_id, query, limit, offset)]), 200
 
 
 @commander_bp.route('/jobs/<int:job_id>/applications/export', methods=['GET'])
-@jwt_required()
+@role_required('commander')
 def export_applications(job_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'commander':
-        return jsonify({'message': 'Unauthorized'}), 403
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format == 'csv':
+        chunks = CommanderService.stream_applications_csv(job_id)
+        mimetype = 'text/csv'
+    elif export_format == 'xlsx':
+        chunks = CommanderService.stream_applications_xlsx(job_id)
+        mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    else:
+        return jsonify({'message': f'Invalid export format: {export_format}'}), 400
 
-    csv_data = CommanderService.generate_applications_csv(job_id, current_user.commander.id)
-    if not csv_data:
+    if not CommanderService.has_job_applications(job_id, current_profile_id()):
         return jsonify({'message': 'No applications found'}), 404
 
-    output = io.StringIO(csv_data)
-    return send_file(
-        io.BytesIO(output.getvalue().encode('utf-8')),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'applications_job_{job_id}.csv'
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=applications_job_{job_id}.{export_format}'}
     )
@@ -1,12 +1,22 @@
 # controllers/hr_controller.py
+import csv
+
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from werkzeug.exceptions import BadRequest
+
 from services.hr_service import HRService
-from models import User
+from services.matching_service import MatchingService
+from services.volunteer_import_service import VolunteerImportService
 from datetime import datetime, date, timedelta
+from utils.filters import parse_filters, JOB_FILTERS, VOLUNTEER_FILTERS
+from utils.pagination import PageRequest, page_response, parse_limit
+from utils.fts import parse_search_args
+from utils.identity import role_required
 
 hr_bp = Blueprint('hr', __name__)
 
+MAX_BATCH_ASSIGNMENTS = 500
+
 
 @hr_bp.route('/hr', methods=['POST'])
 def create_hr():
@@ -23,13 +33,9 @@ def create_hr():
 
 
 @hr_bp.route('/volunteers', methods=['POST'])
-@jwt_required()
+@role_required('hr')
 def create_volunteer():
     """Create a new volunteer user"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     try:
         data = request.get_json()
         volunteer, error = HRService.create_volunteer(data)
@@ -48,6 +54,28 @@ def create_volunteer():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+
+@hr_bp.route('/volunteers/bulk', methods=['POST'])
+@role_required('hr')
+def bulk_create_volunteers():
+    """Create volunteers from a CSV or JSON Lines body (or uploaded 'file'); returns a per-row error report"""
+    upload = request.files.get('file')
+    try:
+        import_format = VolunteerImportService.detect_format(
+            request.args.get('format'), request.mimetype, upload.filename if upload else None)
+        created, errors = VolunteerImportService.import_volunteers(
+            upload.stream if upload else request.stream, import_format)
+    except (BadRequest, UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': getattr(e, 'description', str(e))}), 400
+
+    return jsonify({
+        'message': f'{created} volunteers created',
+        'created': created,
+        'failed': len(errors),
+        'errors': errors
+    }), 201 if created else 400
+
+
 def calculate_age(born):
     today = date.today()
     try:
@@ -59,24 +87,8 @@ def calculate_age(born):
     else:
         return today.year - born.year
 
-@hr_bp.route('/volunteers', methods=['GET'])
-@jwt_required()
-def get_volunteers():
-    """Get all volunteers"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
-
-    volunteers = HRService.get_all_volunteers()
-    # return jsonify([{
-    #     'id': v.id,
-    #     'full_name': v.full_name,
-    #     'email': v.user.email,
-    #     'phone': v.phone,
-    #     'education': v.education,
-    #     'primary_profession': v.primary_profession
-    # } for v in volunteers]), 200
-    payload = [{
+def volunteer_payload(v):
+    return {
         'id': v.id,
         'fullName': v.full_name,
         'idNumber': v.national_id,  # Assuming national_id is the same as idNumber
@@ -94,57 +106,56 @@ def get_volunteers():
         'interests': v.interests,
         'personalSummary': v.personal_summary,
         'jobStatuses': {str(job_app.job_id): job_app.status.value
-                         for job_app in v.applications},  # Map job application status
+                        for job_app in v.applications},  # Map job application status
         'imageUrl': v.user.image_url if v.user.image_url else None  # Handle potential null values
-    } for v in volunteers]
+    }
+
+
+@hr_bp.route('/volunteers', methods=['GET'])
+@role_required('hr')
+def get_volunteers():
+    """Get all volunteers"""
+    try:
+        page = PageRequest.from_args(request.args)
+        volunteers, next_cursor = HRService.get_all_volunteers(parse_filters(request.args, VOLUNTEER_FILTERS), page)
+    except BadRequest as e:
+        return jsonify({'message': str(e)}), 400
+
+    payload = [volunteer_payload(v) for v in volunteers]
+    return jsonify(page_response(payload, page, next_cursor)), 200
+
+@hr_bp.route('/volunteers/search', methods=['GET'])
+@role_required('hr')
+def search_volunteers():
+    """Full-text search over volunteer profiles: ?q=words[&limit=&offset=&gender=&min_age=&max_age=&min_profile=&max_profile=]"""
+    try:
+        query, limit, offset = parse_search_args(request.args)
+        results = HRService.search_volunteers(query, limit, offset, parse_filters(request.args, VOLUNTEER_FILTERS))
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+
+    return jsonify([dict(volunteer_payload(volunteer), snippet=snippet, rank=rank)
+                    for volunteer, rank, snippet in results]), 200
 
-    return jsonify(payload), 200
 
 @hr_bp.route('/volunteers/<int:volunteer_id>', methods=['GET'])
-@jwt_required()
+@role_required('hr')
 def get_volunteer(volunteer_id):
     """Get specific volunteer details"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     volunteer = HRService.get_volunteer_by_id(volunteer_id)
-    payload = {
-        'id': volunteer.id,
-        'fullName': volunteer.full_name,
-        'idNumber': volunteer.national_id,  # Assuming national_id is the same as idNumber
-        'dateOfBirth': volunteer.date_of_birth.strftime('%Y-%m-%d') if volunteer.date_of_birth else None,
-        # Format dateOfBirth
-        'age': calculate_age(volunteer.date_of_birth) if volunteer.date_of_birth else None,
-        # Function to calculate age (optional)
-        'gender': volunteer.gender.value if volunteer.gender else None,  # Handle potential null values
-        'profile': volunteer.profile,
-        'phone': volunteer.user.phone,
-        'email': volunteer.user.email,
-        'address': volunteer.address,
-        'experience': volunteer.experience,
-        'education': volunteer.education,
-        'courses': volunteer.courses,
-        'languages': volunteer.languages,  # Function to extract languages (optional)
-        'interests': volunteer.interests,
-        'personalSummary': volunteer.personal_summary,
-        'jobStatuses': {str(job_app.job_id): job_app.status.value
-                        for job_app in volunteer.applications},  # Map job application status
-        'imageUrl': volunteer.user.image_url if volunteer.user.image_url else None  # Handle potential null values
-    }
-
-    return jsonify(payload), 200
+    return jsonify(volunteer_payload(volunteer)), 200
 
 
 @hr_bp.route('/jobs', methods=['GET'])
-@jwt_required()
+@role_required('hr')
 def get_jobs():
     """Get all jobs"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
+    try:
+        page = PageRequest.from_args(request.args)
+        jobs, next_cursor = HRService.get_all_jobs(parse_filters(request.args, JOB_FILTERS), page)
+    except BadRequest as e:
+        return jsonify({'message': str(e)}), 400
 
-    jobs = HRService.get_all_jobs()
     payload = [{
         'id': str(job.id),
         'jobName': job.title,
@@ -162,24 +173,35 @@ def get_jobs():
         'techSkills': job.tech_skills,
         'workExperience': job.experience,
         'passedCourses': job.passed_courses,
-        'candidateCount': len(job.applications),
+        'candidateCount': counts['total'],
         'status': job.status.name,
-        'department':job.commander.department if job.commander else None,   # Get department from job
+        'department': department,
         'commanderId': job.commander_id,
-        'applications_count': len(job.applications)
-    } for job in jobs]
+        'applications_count': counts['total'],
+        'applicationCounts': {status: total for status, total in counts.items() if status != 'total'}
+    } for job, department, counts in jobs]
+
+    return jsonify(page_response(payload, page, next_cursor)), 200
 
-    return jsonify(payload), 200
+
+@hr_bp.route('/jobs/<int:job_id>/recommended-volunteers', methods=['GET'])
+@role_required('hr')
+def get_recommended_volunteers(job_id):
+    """Volunteers whose profile best fits the job, excluding those who already applied: ?limit="""
+    try:
+        limit = parse_limit(request.args)
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+
+    matches = MatchingService.recommended_volunteers(job_id, limit)
+    return jsonify([dict(volunteer_payload(volunteer), score=round(score, 4), matchedTerms=terms)
+                    for volunteer, score, terms in matches]), 200
 
 
 @hr_bp.route('/assignments', methods=['POST'])
-@jwt_required()
+@role_required('hr')
 def assign_volunteer():
     """Assign a volunteer to a job"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     try:
         data = request.get_json()
         application = HRService.assign_volunteer_to_job(
@@ -194,14 +216,35 @@ def assign_volunteer():
         return jsonify({'error': str(e)}), 400
 
 
+@hr_bp.route('/assignments/batch', methods=['POST'])
+@role_required('hr')
+def assign_volunteers_batch():
+    """Assign many volunteers in one transaction; returns a result per assignment"""
+    data = request.get_json(silent=True) or {}
+    assignments = data.get('assignments')
+    if not isinstance(assignments, list) or not assignments:
+        return jsonify({'error': "'assignments' must be a non-empty list"}), 400
+    if len(assignments) > MAX_BATCH_ASSIGNMENTS:
+        return jsonify({'error': f'At most {MAX_BATCH_ASSIGNMENTS} assignments per request'}), 400
+    try:
+        pairs = [(int(item['volunteer_id']), int(item['job_id'])) for item in assignments]
+    except (TypeError, KeyError, ValueError):
+        return jsonify({'error': "Each assignment needs an integer 'volunteer_id' and 'job_id'"}), 400
+
+    results = HRService.assign_volunteers(pairs, atomic=bool(data.get('atomic')))
+    assigned = sum(result['assigned'] for result in results)
+    return jsonify({
+        'message': f'{assigned} volunteers assigned',
+        'assigned': assigned,
+        'failed': len(results) - assigned,
+        'results': results
+    }), 200 if assigned else 400
+
+
 @hr_bp.route('/volunteers/<int:volunteer_id>/applications', methods=['GET'])
-@jwt_required()
+@role_required('hr')
 def get_volunteer_applications(volunteer_id):
     """Get all applications for a specific volunteer"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     applications = HRService.get_volunteer_applications(volunteer_id)
     return jsonify([{
         'id': app.id,
@@ -212,13 +255,9 @@ def get_volunteer_applications(volunteer_id):
 
 
 @hr_bp.route('/jobs/<int:job_id>/applications', methods=['GET'])
-@jwt_required()
+@role_required('hr')
 def get_job_applications(job_id):
     """Get all applications for a specific job"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     applications = HRService.get_job_applications(job_id)
     return jsonify([{
         'id': app.id,
@@ -229,13 +268,9 @@ def get_job_applications(job_id):
 
 
 @hr_bp.route('/volunteers/<int:volunteer_id>', methods=['PUT'])
-@jwt_required()
+@role_required('hr')
 def update_volunteer(volunteer_id):
     """Update volunteer information"""
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'hr':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     try:
         data = request.get_json()
         volunteer = HRService.update_volunteer(volunteer_id, data)
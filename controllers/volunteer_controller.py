@@ -1,11 +1,16 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from werkzeug.exceptions import BadRequest
+from flask import Blueprint, request, jsonify, current_app, Response
+from flask_jwt_extended import jwt_required
+from werkzeug.exceptions import BadRequest, NotFound
 
+from services.matching_service import MatchingService
 from services.volunteer_service import VolunteerService
-from models import User, Job
 from utils.helpers import calculate_age
+from utils.filters import parse_filters, JOB_FILTERS
+from utils.pagination import PageRequest, page_response, parse_limit
+from utils.fts import parse_search_args
+from utils.identity import role_required, current_role, current_profile, current_profile_id
+from utils.response_cache import job_board_cache
 
 volunteer_bp = Blueprint('volunteer', __name__)
 
@@ -13,50 +18,123 @@ volunteer_bp = Blueprint('volunteer', __name__)
 @volunteer_bp.route('/jobs', methods=['GET'])
 @jwt_required()
 def get_available_jobs():
-    jobs = Job.query.filter_by(is_active=True).all()
+    # The job board is the same for every caller: serve it from the cache, with an ETag for 304s
+    entry, slot = job_board_cache.lookup(job_board_cache.request_key())
+    if entry is None:
+        try:
+            page = PageRequest.from_args(request.args)
+            jobs, next_cursor = VolunteerService.get_available_jobs(parse_filters(request.args, JOB_FILTERS), page)
+        except BadRequest as e:
+            return jsonify({'message': str(e)}), 400
+
+        payload = [{
+            'id': job.id,
+            'title': job.title,
+            'description': job.description,
+            'vacant_positions': job.vacant_positions,
+            'required_certificates': job.required_certificates,
+            'required_languages': job.required_languages,
+            'additional_info': job.additional_info,
+            'questions': [{
+                'id': question.id,
+                'job_id': question.job_id,
+                'question_text': question.question_text,
+                'answer_text': question.answer_text
+            } for question in job.questions] if job.questions else [],
+            'experience': job.experience,
+            'education': job.education,
+            'passed_courses': job.passed_courses,
+            'tech_skills': job.tech_skills,
+            'unit': job.unit,
+            'status': job.status.name
+
+        } for job in jobs]
+        body = current_app.json.dumps(page_response(payload, page, next_cursor)).encode('utf-8')
+        entry = job_board_cache.store(slot, body)
+
+    etag, body = entry
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Clients must revalidate, which costs a 304 while the board is unchanged
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@volunteer_bp.route('/jobs/search', methods=['GET'])
+@jwt_required()
+def search_jobs():
+    """Full-text job search: ?q=words[&limit=&offset=&status=&category=&unit=], best matches first"""
+    try:
+        query, limit, offset = parse_search_args(request.args)
+        results = VolunteerService.search_jobs(query, limit, offset, parse_filters(request.args, JOB_FILTERS))
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
+
     return jsonify([{
         'id': job.id,
         'title': job.title,
-        'description': job.description,
+        'titleHighlight': title_highlight,
+        'snippet': snippet,
+        'rank': rank,
+        'category': job.category,
+        'unit': job.unit,
         'vacant_positions': job.vacant_positions,
-        'required_certificates': job.required_certificates,
-        'required_languages': job.required_languages,
-        'additional_info': job.additional_info,
-        'questions': [{
-            'id': question.id,
-            'job_id': question.job_id,
-            'question_text': question.question_text,
-            'answer_text': question.answer_text
-        } for question in job.questions] if job.questions else [],
-        'experience': job.experience,
-        'education': job.education,
-        'passed_courses': job.passed_courses,
         'tech_skills': job.tech_skills,
-        'unit': job.unit,
         'status': job.status.name
+    } for job, rank, title_highlight, snippet in results]), 200
+
+
+@volunteer_bp.route('/recommended-jobs', methods=['GET'])
+@role_required('volunteer')
+def get_recommended_jobs():
+    """Open jobs that best fit the caller's profile, excluding ones already applied to: ?limit="""
+    try:
+        limit = parse_limit(request.args)
+    except BadRequest as e:
+        return jsonify({'message': e.description}), 400
 
-    } for job in jobs]), 200
+    return jsonify([{
+        'id': job.id,
+        'title': job.title,
+        'score': round(score, 4),
+        'matchedTerms': terms,
+        'category': job.category,
+        'unit': job.unit,
+        'vacant_positions': job.vacant_positions,
+        'required_languages': job.required_languages,
+        'tech_skills': job.tech_skills,
+        'status': job.status.name
+    } for job, score, terms in MatchingService.recommended_jobs(current_profile_id(), limit)]), 200
 
 
 @volunteer_bp.route('/jobs/<int:job_id>/apply', methods=['POST', 'DELETE'])
-@jwt_required()
+@role_required('volunteer')
 def apply_for_job(job_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'volunteer':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     if request.method == 'POST':
         try:
-            data = request.get_json()
-            application = VolunteerService.apply_for_job(current_user.volunteer.id, job_id, data)
-            return jsonify({'message': 'Application submitted successfully'}), 201
+            # multipart/form-data: `answers` (JSON) plus an optional `resume` file; or a JSON body with `answers`
+            if request.mimetype == 'multipart/form-data':
+                answers = VolunteerService.parse_answers(request.form.get('answers'))
+                resume_file = request.files.get('resume') or None
+            else:
+                answers = VolunteerService.parse_answers((request.get_json(silent=True) or {}).get('answers'))
+                resume_file = None
+            application = VolunteerService.apply_for_job(current_profile_id(), job_id, answers, resume_file)
+            return jsonify({
+                'message': 'Application submitted successfully',
+                'application_id': application.id,
+                'resume_id': application.resume.id if application.resume else None
+            }), 201
+        except NotFound as e:
+            return jsonify({'message': e.description}), 404
         except BadRequest as e:
             return jsonify({'message': str(e)}), 400
         except Exception as e:
             return jsonify({'message': 'An error occurred: ' + str(e)}), 500
 
     elif request.method == 'DELETE':
-        application = VolunteerService.delete_application(current_user.volunteer.id, job_id)
+        application = VolunteerService.delete_application(current_profile_id(), job_id)
         if application:
             return jsonify({'message': 'Application deleted successfully'}), 200
         else:
@@ -77,11 +155,9 @@ def format_date_of_birth(data):
 
 
 @volunteer_bp.route('/<int:volunteer_id>', methods=['PATCH'])
-@jwt_required()
+@role_required('volunteer')
 def update_volunteer(volunteer_id):
-    current_user = User.query.get(get_jwt_identity())
-
-    if current_user.volunteer.id != volunteer_id:
+    if current_profile_id() != volunteer_id:
         return jsonify({'message': 'Unauthorized'}), 403
     try:
         data = request.get_json()
@@ -123,12 +199,8 @@ def update_volunteer(volunteer_id):
 
 
 @volunteer_bp.route('/jobs/<int:job_id>/resume', methods=['POST'])
-@jwt_required()
+@role_required('volunteer')
 def upload_resume(job_id):
-    current_user = User.query.get(get_jwt_identity())
-    if current_user.role != 'volunteer':
-        return jsonify({'message': 'Unauthorized'}), 403
-
     if 'resume' not in request.files:
         return jsonify({'message': 'No resume file uploaded'}), 400
 
@@ -136,7 +208,7 @@ def upload_resume(job_id):
     original_filename = resume_file.filename  # Access the original filename
 
     try:
-        resume = VolunteerService.upload_resume(current_user.volunteer.id, job_id, resume_file)
+        resume = VolunteerService.upload_resume(current_profile_id(), job_id, resume_file)
         # You can potentially use the original_filename in the service call
         return jsonify({'message': 'Resume uploaded successfully', 'resume_id': resume.id}), 201
     except BadRequest as e:
@@ -147,10 +219,9 @@ def upload_resume(job_id):
 
 
 @volunteer_bp.route('/jobs/<int:job_id>/check-application', methods=['GET'])
-@jwt_required()
+@role_required('volunteer')
 def check_application(job_id):
-    current_user = User.query.get(get_jwt_identity())
-    already_applied = VolunteerService.check_if_applied(current_user.volunteer.id, job_id)
+    already_applied = VolunteerService.check_if_applied(current_profile_id(), job_id)
     return jsonify({'alreadyApplied': already_applied}), 200
 
 
@@ -158,18 +229,11 @@ def check_application(job_id):
 @volunteer_bp.route('/get-profile-details', methods=['GET'])
 @jwt_required()
 def get_profile_details():
-    current_user_id = get_jwt_identity()
-    print(f"User ID from JWT: {current_user_id}")
-
     try:
-        user = User.query.get(int(current_user_id))
-        if not user:
-            return jsonify({'message': 'User not found'}), 404
-
-        if user.role != 'volunteer':
+        if current_role() != 'volunteer':
             return jsonify({'message': 'User is not a volunteer'}), 403
 
-        volunteer = VolunteerService.get_user_info(user.id)
+        volunteer = current_profile()
         if not volunteer:
             return jsonify({'message': 'Volunteer profile not found'}), 404
 
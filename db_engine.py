@@ -0,0 +1,81 @@
+"""Database engine configuration.
+
+Picks the database URL (``DATABASE_URL`` or the local SQLite file), sizes the
+connection pool per process and, for SQLite, applies the pragmas that let
+several Gunicorn workers read and write concurrently: WAL journaling,
+``synchronous=NORMAL``, a busy timeout instead of immediate "database is
+locked" errors, memory-mapped I/O and a larger page cache.
+
+Every Gunicorn worker has its own pool, so the total number of connections
+is workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW); keep that below the server's
+max_connections when running on PostgreSQL.
+"""
+import os
+
+from sqlalchemy import event
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def database_url(default):
+    url = os.getenv('DATABASE_URL') or default
+    # Heroku/Render style URLs use the scheme SQLAlchemy dropped in 1.4
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def is_sqlite(url):
+    return url.startswith('sqlite')
+
+
+def sqlite_pragmas():
+    return {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000),
+        'mmap_size': _env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024),
+        # Negative values are KiB rather than pages
+        'cache_size': -_env_int('SQLITE_CACHE_SIZE_KB', 64 * 1024),
+        'temp_store': 'MEMORY',
+    }
+
+
+def engine_options(url):
+    """SQLALCHEMY_ENGINE_OPTIONS for ``url``."""
+    if is_sqlite(url):
+        if url in ('sqlite://', 'sqlite:///:memory:'):
+            return {}
+        return {
+            'pool_size': _env_int('DB_POOL_SIZE', 5),
+            'max_overflow': _env_int('DB_MAX_OVERFLOW', 5),
+            'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+            'connect_args': {
+                'timeout': _env_int('SQLITE_BUSY_TIMEOUT_MS', 5000) / 1000,
+                'check_same_thread': False,
+            },
+        }
+    return {
+        'pool_size': _env_int('DB_POOL_SIZE', 5),
+        'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+        'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30),
+        'pool_recycle': _env_int('DB_POOL_RECYCLE', 1800),
+        'pool_pre_ping': True,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine):
+    """Install per-connection settings on ``engine``."""
+    if engine.dialect.name == 'sqlite' and not event.contains(engine, 'connect', _apply_sqlite_pragmas):
+        event.listen(engine, 'connect', _apply_sqlite_pragmas)
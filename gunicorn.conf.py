@@ -0,0 +1,18 @@
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 2))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
+
+def post_fork(server, worker):
+    # With preload_app the engine is created in the master; give each worker
+    # its own pool instead of sharing inherited connections across processes.
+    if preload_app:
+        from app import app
+        from db import db
+        with app.app_context():
+            db.engine.dispose(close=False)
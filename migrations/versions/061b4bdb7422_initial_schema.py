@@ -0,0 +1,160 @@
+"""initial schema
+
+Revision ID: 061b4bdb7422
+Revises:
+Create Date: 2025-02-09 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '061b4bdb7422'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=120), nullable=False),
+    sa.Column('password_hash', sa.String(length=256), nullable=False),
+    sa.Column('role', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('image_url', sa.String(length=255), nullable=True),
+    sa.Column('full_name', sa.String(length=100), nullable=True),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('email')
+    )
+    op.create_table('commanders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('rank', sa.String(length=50), nullable=True),
+    sa.Column('department', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('hr_staff',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('department', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('volunteers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=100), nullable=False),
+    sa.Column('national_id', sa.String(length=20), nullable=False),
+    sa.Column('join_date', sa.DateTime(), nullable=True),
+    sa.Column('address', sa.String(length=200), nullable=True),
+    sa.Column('primary_profession', sa.String(length=100), nullable=True),
+    sa.Column('education', sa.String(length=100), nullable=True),
+    sa.Column('area_of_interest', sa.String(length=100), nullable=True),
+    sa.Column('contact_reference', sa.String(length=200), nullable=True),
+    sa.Column('profile', sa.Integer(), nullable=True),
+    sa.Column('date_of_birth', sa.Date(), nullable=True),
+    sa.Column('gender', sa.Enum('MALE', 'FEMALE', name='gender'), nullable=True),
+    sa.Column('experience', sa.Text(), nullable=True),
+    sa.Column('courses', sa.Text(), nullable=True),
+    sa.Column('languages', sa.Text(), nullable=True),
+    sa.Column('interests', sa.Text(), nullable=True),
+    sa.Column('personal_summary', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('national_id')
+    )
+    op.create_table('jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('commander_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=100), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('vacant_positions', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('required_certificates', sa.String(length=200), nullable=True),
+    sa.Column('required_languages', sa.String(length=200), nullable=True),
+    sa.Column('status', sa.Enum('OPEN', 'CLOSED', name='jobstatus'), nullable=True),
+    sa.Column('is_open_base', sa.Boolean(), nullable=True),
+    sa.Column('additional_info', sa.Text(), nullable=True),
+    sa.Column('common_questions', sa.Text(), nullable=True),
+    sa.Column('common_answers', sa.Text(), nullable=True),
+    sa.Column('experience', sa.Text(), nullable=True),
+    sa.Column('education', sa.Text(), nullable=True),
+    sa.Column('passed_courses', sa.Text(), nullable=True),
+    sa.Column('tech_skills', sa.Text(), nullable=True),
+    sa.Column('category', sa.String(length=100), nullable=True),
+    sa.Column('unit', sa.String(length=100), nullable=True),
+    sa.Column('address', sa.String(length=200), nullable=True),
+    sa.Column('position', sa.String(length=100), nullable=True),
+    sa.ForeignKeyConstraint(['commander_id'], ['commanders.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('job_questions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('question_text', sa.Text(), nullable=False),
+    sa.Column('answer_text', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('job_applications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('volunteer_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PREFERRED', 'REJECTED', 'HIRED', 'PREFERRED_FINAL',
+                                name='applicationstatus'), nullable=True),
+    sa.Column('application_date', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.ForeignKeyConstraint(['volunteer_id'], ['volunteers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('application_answers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('answer_text', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['job_applications.id'], ),
+    sa.ForeignKeyConstraint(['question_id'], ['job_questions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('interviews',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('scheduled_date', sa.DateTime(), nullable=True),
+    sa.Column('general_info', sa.Text(), nullable=True),
+    sa.Column('schedule', sa.Text(), nullable=True),
+    sa.Column('management_results', sa.Text(), nullable=True),
+    sa.Column('personal_results', sa.Text(), nullable=True),
+    sa.Column('summary', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['job_applications.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('resumes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('application_id', sa.Integer(), nullable=False),
+    sa.Column('file_path', sa.String(length=255), nullable=True),
+    sa.Column('upload_date', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['application_id'], ['job_applications.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('resumes')
+    op.drop_table('interviews')
+    op.drop_table('application_answers')
+    op.drop_table('job_applications')
+    op.drop_table('job_questions')
+    op.drop_table('jobs')
+    op.drop_table('volunteers')
+    op.drop_table('hr_staff')
+    op.drop_table('commanders')
+    op.drop_table('users')
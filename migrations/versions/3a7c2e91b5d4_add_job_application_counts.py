@@ -0,0 +1,44 @@
+"""add job application counts
+
+Revision ID: 3a7c2e91b5d4
+Revises: 061b4bdb7422
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3a7c2e91b5d4'
+down_revision = '061b4bdb7422'
+branch_labels = None
+depends_on = None
+
+
+APPLICATION_STATUSES = ('PENDING', 'PREFERRED', 'REJECTED', 'HIRED', 'PREFERRED_FINAL')
+
+# The applicationstatus type already exists on PostgreSQL (job_applications.status)
+application_status = sa.Enum(*APPLICATION_STATUSES, name='applicationstatus').with_variant(
+    postgresql.ENUM(*APPLICATION_STATUSES, name='applicationstatus', create_type=False), 'postgresql')
+
+
+def upgrade():
+    op.create_table('job_application_counts',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('status', application_status, nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ),
+    sa.PrimaryKeyConstraint('job_id', 'status')
+    )
+    # Seed the counters from the applications that already exist
+    op.execute(
+        "INSERT INTO job_application_counts (job_id, status, total) "
+        "SELECT job_id, status, COUNT(id) FROM job_applications "
+        "WHERE status IS NOT NULL GROUP BY job_id, status"
+    )
+
+
+def downgrade():
+    op.drop_table('job_application_counts')
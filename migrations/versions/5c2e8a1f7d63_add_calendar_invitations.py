@@ -0,0 +1,44 @@
+"""add calendar invitation outbox
+
+Revision ID: 5c2e8a1f7d63
+Revises: 8f4d1b6c2a90
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8a1f7d63'
+down_revision = '8f4d1b6c2a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('calendar_invitations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('commander_id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.String(length=64), nullable=False),
+    sa.Column('event', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('event_link', sa.String(length=500), nullable=True),
+    sa.Column('meeting_link', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['commander_id'], ['commanders.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id')
+    )
+    op.create_index(op.f('ix_calendar_invitations_commander_id'), 'calendar_invitations', ['commander_id'], unique=False)
+    op.create_index('ix_calendar_invitations_status_next_attempt_at', 'calendar_invitations', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_calendar_invitations_status_next_attempt_at', table_name='calendar_invitations')
+    op.drop_index(op.f('ix_calendar_invitations_commander_id'), table_name='calendar_invitations')
+    op.drop_table('calendar_invitations')
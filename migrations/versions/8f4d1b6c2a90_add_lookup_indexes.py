@@ -0,0 +1,44 @@
+"""add lookup indexes and unique job application constraint
+
+Revision ID: 8f4d1b6c2a90
+Revises: 3a7c2e91b5d4
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f4d1b6c2a90'
+down_revision = '3a7c2e91b5d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A unique index rather than ALTER TABLE ... ADD CONSTRAINT, which SQLite
+    # does not support; it enforces the same rule on every backend.
+    op.create_index('uq_job_applications_job_volunteer', 'job_applications', ['job_id', 'volunteer_id'], unique=True)
+    op.create_index(op.f('ix_job_applications_volunteer_id'), 'job_applications', ['volunteer_id'], unique=False)
+    op.create_index(op.f('ix_jobs_commander_id'), 'jobs', ['commander_id'], unique=False)
+    op.create_index(op.f('ix_jobs_is_active'), 'jobs', ['is_active'], unique=False)
+    op.create_index(op.f('ix_job_questions_job_id'), 'job_questions', ['job_id'], unique=False)
+    op.create_index(op.f('ix_volunteers_user_id'), 'volunteers', ['user_id'], unique=False)
+    op.create_index(op.f('ix_commanders_user_id'), 'commanders', ['user_id'], unique=False)
+    op.create_index(op.f('ix_hr_staff_user_id'), 'hr_staff', ['user_id'], unique=False)
+    op.create_index(op.f('ix_resumes_application_id'), 'resumes', ['application_id'], unique=False)
+    op.create_index(op.f('ix_interviews_application_id'), 'interviews', ['application_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_interviews_application_id'), table_name='interviews')
+    op.drop_index(op.f('ix_resumes_application_id'), table_name='resumes')
+    op.drop_index(op.f('ix_hr_staff_user_id'), table_name='hr_staff')
+    op.drop_index(op.f('ix_commanders_user_id'), table_name='commanders')
+    op.drop_index(op.f('ix_volunteers_user_id'), table_name='volunteers')
+    op.drop_index(op.f('ix_job_questions_job_id'), table_name='job_questions')
+    op.drop_index(op.f('ix_jobs_is_active'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_commander_id'), table_name='jobs')
+    op.drop_index(op.f('ix_job_applications_volunteer_id'), table_name='job_applications')
+    op.drop_index('uq_job_applications_job_volunteer', table_name='job_applications')
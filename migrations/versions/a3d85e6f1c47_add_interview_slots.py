@@ -0,0 +1,64 @@
+"""add interview end time and per-commander schedule index
+
+Revision ID: a3d85e6f1c47
+Revises: f7c1a3e9b250
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from datetime import timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d85e6f1c47'
+down_revision = 'f7c1a3e9b250'
+branch_labels = None
+depends_on = None
+
+# Length given to interviews booked before durations were stored: the old fixed invitation slot
+LEGACY_DURATION = timedelta(hours=1)
+
+interviews = sa.table(
+    'interviews',
+    sa.column('id', sa.Integer),
+    sa.column('application_id', sa.Integer),
+    sa.column('commander_id', sa.Integer),
+    sa.column('scheduled_date', sa.DateTime),
+    sa.column('scheduled_end', sa.DateTime),
+)
+job_applications = sa.table('job_applications', sa.column('id', sa.Integer), sa.column('job_id', sa.Integer))
+jobs = sa.table('jobs', sa.column('id', sa.Integer), sa.column('commander_id', sa.Integer))
+
+
+def upgrade():
+    with op.batch_alter_table('interviews', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('commander_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('scheduled_end', sa.DateTime(), nullable=True))
+        batch_op.create_foreign_key('fk_interviews_commander_id_commanders', 'commanders', ['commander_id'], ['id'])
+        batch_op.create_index('ix_interviews_commander_id_scheduled_date', ['commander_id', 'scheduled_date'],
+                              unique=False)
+
+    owner = sa.select(jobs.c.commander_id) \
+        .select_from(job_applications.join(jobs, jobs.c.id == job_applications.c.job_id)) \
+        .where(job_applications.c.id == interviews.c.application_id) \
+        .scalar_subquery()
+    op.execute(interviews.update().values(commander_id=owner))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(interviews.c.id, interviews.c.scheduled_date)
+                              .where(interviews.c.scheduled_date.isnot(None))).all()
+    if rows:
+        connection.execute(
+            interviews.update().where(interviews.c.id == sa.bindparam('interview_id'))
+            .values(scheduled_end=sa.bindparam('end')),
+            [{'interview_id': interview_id, 'end': start + LEGACY_DURATION} for interview_id, start in rows])
+
+
+def downgrade():
+    with op.batch_alter_table('interviews', schema=None) as batch_op:
+        batch_op.drop_index('ix_interviews_commander_id_scheduled_date')
+        batch_op.drop_constraint('fk_interviews_commander_id_commanders', type_='foreignkey')
+        batch_op.drop_column('scheduled_end')
+        batch_op.drop_column('commander_id')
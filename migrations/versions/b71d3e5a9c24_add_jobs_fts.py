@@ -0,0 +1,41 @@
+"""add jobs full-text search index
+
+Revision ID: b71d3e5a9c24
+Revises: 5c2e8a1f7d63
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.fts import FtsIndex
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71d3e5a9c24'
+down_revision = '5c2e8a1f7d63'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of utils.fts.JOBS_FTS as of this revision
+JOBS_FTS = FtsIndex(
+    'jobs_fts', 'jobs',
+    ('title', 'description', 'tech_skills', 'experience', 'education', 'passed_courses', 'category', 'unit'),
+    weights=(10.0, 1.0, 5.0, 2.0, 2.0, 2.0, 3.0, 3.0),
+)
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases use the LIKE fallback in VolunteerService.search_jobs
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in JOBS_FTS.create_statements():
+        op.execute(statement)
+    op.execute(JOBS_FTS.rebuild_statement())
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in JOBS_FTS.drop_statements():
+        op.execute(statement)
@@ -0,0 +1,41 @@
+"""add volunteers full-text search index
+
+Revision ID: d4a6f0c3e815
+Revises: b71d3e5a9c24
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.fts import FtsIndex
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a6f0c3e815'
+down_revision = 'b71d3e5a9c24'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of utils.fts.VOLUNTEERS_FTS as of this revision
+VOLUNTEERS_FTS = FtsIndex(
+    'volunteers_fts', 'volunteers',
+    ('primary_profession', 'experience', 'courses', 'languages', 'education', 'interests', 'personal_summary'),
+    weights=(4.0, 3.0, 3.0, 4.0, 2.0, 1.0, 1.0),
+)
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases use the LIKE fallback in HRService.search_volunteers
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in VOLUNTEERS_FTS.create_statements():
+        op.execute(statement)
+    op.execute(VOLUNTEERS_FTS.rebuild_statement())
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in VOLUNTEERS_FTS.drop_statements():
+        op.execute(statement)
@@ -0,0 +1,55 @@
+"""add resume text extraction columns and full-text index
+
+Revision ID: e2b9c7d41a06
+Revises: d4a6f0c3e815
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from utils.fts import FtsIndex
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9c7d41a06'
+down_revision = 'd4a6f0c3e815'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of utils.fts.RESUMES_FTS as of this revision
+RESUMES_FTS = FtsIndex('resumes_fts', 'resumes', ('extracted_text',))
+
+
+def upgrade():
+    # Existing resumes start out 'pending' and are picked up by `flask extract-resumes`
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('extraction_status', sa.String(length=20), server_default='pending',
+                                      nullable=False))
+        batch_op.add_column(sa.Column('extracted_text', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('extraction_error', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('extracted_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resumes_extraction_status'), ['extraction_status'], unique=False)
+        batch_op.create_index(batch_op.f('ix_resumes_content_hash'), ['content_hash'], unique=False)
+
+    # FTS5 is SQLite-only; other databases use the LIKE fallback in ResumeService.search_job_resumes
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in RESUMES_FTS.create_statements():
+            op.execute(statement)
+        op.execute(RESUMES_FTS.rebuild_statement())
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in RESUMES_FTS.drop_statements():
+            op.execute(statement)
+
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resumes_content_hash'))
+        batch_op.drop_index(batch_op.f('ix_resumes_extraction_status'))
+        batch_op.drop_column('extracted_at')
+        batch_op.drop_column('extraction_error')
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('extracted_text')
+        batch_op.drop_column('extraction_status')
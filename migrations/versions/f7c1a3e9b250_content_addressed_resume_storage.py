@@ -0,0 +1,112 @@
+"""move resumes to content-addressed storage
+
+Revision ID: f7c1a3e9b250
+Revises: e2b9c7d41a06
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+
+from alembic import op
+import sqlalchemy as sa
+from flask import current_app
+
+from utils.fts import FtsIndex
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c1a3e9b250'
+down_revision = 'e2b9c7d41a06'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of utils.fts.RESUMES_FTS as of this revision
+RESUMES_FTS = FtsIndex('resumes_fts', 'resumes', ('extracted_text',))
+
+resumes = sa.table(
+    'resumes',
+    sa.column('id', sa.Integer),
+    sa.column('file_path', sa.String),
+    sa.column('original_filename', sa.String),
+    sa.column('content_hash', sa.String),
+)
+
+
+def _root():
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], current_app.config['RESUMES_FOLDER'])
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy_into_place(source, destination):
+    # Frozen copy of the BlobStore layout and write path as of this revision
+    if os.path.exists(destination):
+        return
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(destination))
+    os.close(fd)
+    shutil.copyfile(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+def upgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('original_filename', sa.String(length=255), nullable=True))
+        batch_op.create_index(batch_op.f('ix_resumes_file_path'), ['file_path'], unique=False)
+
+    connection = op.get_bind()
+    root = _root()
+    moved = set()
+    for resume_id, file_path in connection.execute(sa.select(resumes.c.id, resumes.c.file_path)).all():
+        values = {'original_filename': file_path}
+        source = os.path.join(root, file_path or '')
+        # Rows whose file is missing keep their flat name, which the blob store still resolves
+        if file_path and os.sep not in file_path and os.path.isfile(source):
+            digest = _sha256(source)
+            extension = file_path.rsplit('.', 1)[-1].lower() if '.' in file_path else 'bin'
+            relative_path = os.path.join(digest[:2], digest[2:4], f'{digest}.{extension}')
+            _copy_into_place(source, os.path.join(root, relative_path))
+            values.update(file_path=relative_path, content_hash=digest)
+            moved.add(source)
+        connection.execute(resumes.update().where(resumes.c.id == resume_id).values(**values))
+
+    # Only after every row points at its blob: several rows may have shared one flat file
+    for source in moved:
+        os.remove(source)
+
+
+def downgrade():
+    connection = op.get_bind()
+    root = _root()
+    blobs = set()
+    rows = connection.execute(sa.select(resumes.c.id, resumes.c.file_path, resumes.c.original_filename)).all()
+    for resume_id, file_path, original_filename in rows:
+        if not file_path or os.sep not in file_path or not original_filename:
+            continue
+        blob = os.path.join(root, file_path)
+        if os.path.isfile(blob):
+            # Flat names collide again after a downgrade: the first file with a name keeps it
+            _copy_into_place(blob, os.path.join(root, original_filename))
+            blobs.add(blob)
+        connection.execute(resumes.update().where(resumes.c.id == resume_id).values(file_path=original_filename))
+
+    for blob in blobs:
+        os.remove(blob)
+
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resumes_file_path'))
+        batch_op.drop_column('original_filename')
+
+    # SQLite drops a column by rebuilding the table, which takes its triggers with it
+    if connection.dialect.name == 'sqlite':
+        for statement in RESUMES_FTS.create_statements():
+            op.execute(statement)
@@ -4,5 +4,6 @@ from . volunteer import Resume
 from .commander import Commander
 from .hr import HR
 from .job import Job, JobQuestion
-from .application import JobApplication, ApplicationAnswer
+from .application import JobApplication, ApplicationAnswer, JobApplicationCount
 from .interview import Interview
+from .invitation import CalendarInvitation
@@ -17,9 +17,13 @@ class ApplicationStatus(enum.Enum):
 
 class JobApplication(db.Model):
     __tablename__ = 'job_applications'
+    __table_args__ = (
+        # One application per volunteer and job; also serves every (job_id, volunteer_id) lookup
+        db.Index('uq_job_applications_job_volunteer', 'job_id', 'volunteer_id', unique=True),
+    )
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
-    volunteer_id = db.Column(db.Integer, db.ForeignKey('volunteers.id'), nullable=False)
+    volunteer_id = db.Column(db.Integer, db.ForeignKey('volunteers.id'), nullable=False, index=True)
     status = db.Column(db.Enum(ApplicationStatus), default=ApplicationStatus.PENDING)
     application_date = db.Column(db.DateTime, default=datetime.utcnow)
     # resume = db.relationship('Resume', uselist=False, backref='application')
@@ -41,3 +45,15 @@ class ApplicationAnswer(db.Model):
     application_id = db.Column(db.Integer, db.ForeignKey('job_applications.id'), nullable=False)
     question_id = db.Column(db.Integer, db.ForeignKey('job_questions.id'), nullable=False)
     answer_text = db.Column(db.Text)
+
+
+class JobApplicationCount(db.Model):
+    """Materialized number of applications per job and status.
+
+    Kept in step with job_applications by JobStatsService; read instead of
+    aggregating job_applications when MATERIALIZED_JOB_COUNTS is enabled.
+    """
+    __tablename__ = 'job_application_counts'
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), primary_key=True)
+    status = db.Column(db.Enum(ApplicationStatus), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
@@ -3,9 +3,16 @@ from datetime import datetime
 
 class Interview(db.Model):
     __tablename__ = 'interviews'
+    __table_args__ = (
+        # Conflict checks and free-slot searches scan one commander's interviews by start time
+        db.Index('ix_interviews_commander_id_scheduled_date', 'commander_id', 'scheduled_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    application_id = db.Column(db.Integer, db.ForeignKey('job_applications.id'), nullable=False)
-    scheduled_date = db.Column(db.DateTime)
+    application_id = db.Column(db.Integer, db.ForeignKey('job_applications.id'), nullable=False, index=True)
+    # Owner of the job, copied here so a commander's calendar is one index range
+    commander_id = db.Column(db.Integer, db.ForeignKey('commanders.id'))
+    scheduled_date = db.Column(db.DateTime)  # Start, naive UTC
+    scheduled_end = db.Column(db.DateTime)
     general_info = db.Column(db.Text)
     schedule = db.Column(db.Text)
     management_results = db.Column(db.Text)
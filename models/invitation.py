@@ -0,0 +1,27 @@
+from db import db
+from datetime import datetime
+
+
+class CalendarInvitation(db.Model):
+    """Outbox row for a Google Calendar interview invitation.
+
+    Written by the request that schedules the interview and delivered later by
+    InvitationService's worker, so no Calendar API call happens inside a request.
+    """
+    __tablename__ = 'calendar_invitations'
+    __table_args__ = (
+        # The worker polls for due rows: WHERE status = 'pending' AND next_attempt_at <= now
+        db.Index('ix_calendar_invitations_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    commander_id = db.Column(db.Integer, db.ForeignKey('commanders.id'), nullable=False, index=True)
+    event_id = db.Column(db.String(64), nullable=False, unique=True)  # Client-chosen Calendar event id
+    event = db.Column(db.Text, nullable=False)  # JSON body for events().insert
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, sending, sent, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    event_link = db.Column(db.String(500))
+    meeting_link = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
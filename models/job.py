@@ -11,11 +11,11 @@ class JobStatus(enum.Enum):
 class Job(db.Model):
     __tablename__ = 'jobs'
     id = db.Column(db.Integer, primary_key=True)
-    commander_id = db.Column(db.Integer, db.ForeignKey('commanders.id'), nullable=False)
+    commander_id = db.Column(db.Integer, db.ForeignKey('commanders.id'), nullable=False, index=True)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     vacant_positions = db.Column(db.Integer, default=1)
-    is_active = db.Column(db.Boolean, default=True)
+    is_active = db.Column(db.Boolean, default=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     required_certificates = db.Column(db.String(200))
     required_languages = db.Column(db.String(200))
@@ -44,7 +44,7 @@ class Job(db.Model):
 class JobQuestion(db.Model):
     __tablename__ = 'job_questions'
     id = db.Column(db.Integer, primary_key=True)
-    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False, index=True)
     question_text = db.Column(db.Text, nullable=False)
     answer_text = db.Column(db.Text, nullable=False)
     # required = db.Column(db.Boolean, default=True)
\ No newline at end of file
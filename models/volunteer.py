@@ -14,7 +14,7 @@ class Gender(enum.Enum):
 class Volunteer(db.Model):
     __tablename__ = 'volunteers'
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     full_name = db.Column(db.String(100), nullable=False)
     national_id = db.Column(db.String(20), unique=True, nullable=False)
     join_date = db.Column(db.DateTime, default=datetime.utcnow)
@@ -46,10 +46,20 @@ class Resume(db.Model):
     # volunteer_id = db.Column(db.Integer, db.ForeignKey('volunteers.id'), nullable=False)
     # application_id = db.Column(db.Integer, db.ForeignKey('job_applications.id'), nullable=False) # changed
     # application = db.relationship('JobApplication', backref=db.backref('resumes', cascade="all, delete-orphan", uselist=False))
-    application_id = db.Column(db.Integer, ForeignKey('job_applications.id', ondelete="CASCADE"), nullable=False)
+    application_id = db.Column(db.Integer, ForeignKey('job_applications.id', ondelete="CASCADE"), nullable=False,
+                               index=True)
     application = db.relationship('JobApplication', back_populates='resume')
 
     # application = db.relationship('JobApplication', foreign_keys=[application_id],
     #                               backref=db.backref('resumes', cascade="all, delete-orphan", uselist=False))
-    file_path = db.Column(db.String(255))
+    file_path = db.Column(db.String(255), index=True)  # <h[0:2]>/<h[2:4]>/<sha256>.<ext> in the blob store
+    original_filename = db.Column(db.String(255))
     upload_date = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Filled in by ResumeService's extraction pool after the upload has been saved
+    extraction_status = db.Column(db.String(20), nullable=False, default='pending',
+                                  server_default='pending', index=True)  # pending, done, empty, failed
+    extracted_text = db.Column(db.Text)
+    content_hash = db.Column(db.String(64), index=True)  # sha256 of the file
+    extraction_error = db.Column(db.String(255))
+    extracted_at = db.Column(db.DateTime)
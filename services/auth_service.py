@@ -4,6 +4,7 @@ from flask_jwt_extended import create_access_token
 
 from db import db
 from models import *
+from utils.passwords import needs_rehash
 
 
 class AuthService:
@@ -11,6 +12,10 @@ class AuthService:
     def login(email, password):
         user = User.query.filter_by(email=email).first()
         if user and user.check_password(password):
+            if needs_rehash(user.password_hash):
+                # Upgrade hashes made with an older method or cost while we have the plaintext
+                user.set_password(password)
+                db.session.commit()
             access_token = AuthService.generate_token(user)
             return access_token, user.role, user.id
         return None, None, None
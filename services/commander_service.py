@@ -1,5 +1,3 @@
-from flask_jwt_extended import get_jwt_identity
-
 from models import Volunteer
 from models.commander import Commander
 from models.job import Job, JobQuestion, JobStatus
@@ -10,8 +8,43 @@ from datetime import datetime
 from flask import abort
 import csv
 import io
-from werkzeug.exceptions import BadRequest
+import tempfile
+from openpyxl import Workbook
+from sqlalchemy import func, update
+from sqlalchemy.orm import joinedload, selectinload
+from werkzeug.exceptions import BadRequest, Conflict
 from models.user import User
+from services.job_stats_service import JobStatsService, as_application_status
+from services.interview_service import InterviewService
+from services.matching_service import MatchingService
+from utils.filters import apply_job_filters
+from utils.pagination import PageRequest, keyset_paginate
+from utils.response_cache import interview_feed_cache, job_board_cache
+
+
+# Status changes a commander may make. HIRED is only reached through HR's
+# assignment, which also takes a vacant position, and is final.
+STATUS_TRANSITIONS = {
+    ApplicationStatus.PENDING: {ApplicationStatus.PREFERRED, ApplicationStatus.PREFERRED_FINAL,
+                                ApplicationStatus.REJECTED},
+    ApplicationStatus.PREFERRED: {ApplicationStatus.PENDING, ApplicationStatus.PREFERRED_FINAL,
+                                  ApplicationStatus.REJECTED},
+    ApplicationStatus.PREFERRED_FINAL: {ApplicationStatus.PENDING, ApplicationStatus.PREFERRED,
+                                        ApplicationStatus.REJECTED},
+    ApplicationStatus.REJECTED: {ApplicationStatus.PENDING, ApplicationStatus.PREFERRED},
+    ApplicationStatus.HIRED: set(),
+}
+
+
+def _transition_error(previous, status):
+    """Why ``previous`` cannot become ``status``, or None when STATUS_TRANSITIONS allows it.
+
+    The status column is nullable; a row without one has never left the
+    default PENDING state and may move like a pending one.
+    """
+    if status in STATUS_TRANSITIONS.get(previous or ApplicationStatus.PENDING, ()):
+        return None
+    return f"Cannot change status from {previous.value if previous else 'none'} to {status.value}"
 
 
 class CommanderService:
@@ -59,11 +92,51 @@ class CommanderService:
             db.session.add(question)
 
         db.session.commit()
+        job_board_cache.invalidate()
         return job
 
     @staticmethod
-    def get_commander_jobs(commander_id):
-        return Job.query.filter_by(commander_id=commander_id).all()
+    def get_commander_jobs(commander_id, filters=None, page=None):
+        query = apply_job_filters(Job.query.filter_by(commander_id=commander_id), filters)
+        return keyset_paginate(query, page or PageRequest(), (Job.id,))
+
+    @staticmethod
+    def get_dashboard(commander_id, upcoming_limit=20, now=None):
+        """Summary of the commander's jobs in three queries, whatever the number of applications.
+
+        Returns (jobs, upcoming): ``jobs`` is a list of (job, application
+        counts by status, number of upcoming interviews); ``upcoming`` holds
+        the next ``upcoming_limit`` interviews as (interview, application,
+        volunteer name, job title), soonest first.
+        """
+        now = now or datetime.utcnow()
+        source, job_id_column, status_column, weight = JobStatsService.count_source()
+        rows = db.session.query(Job, *JobStatsService.count_columns(status_column, weight)) \
+            .outerjoin(source, job_id_column == Job.id) \
+            .filter(Job.commander_id == commander_id) \
+            .group_by(Job.id) \
+            .order_by(Job.id) \
+            .all()
+
+        upcoming_filter = (Job.commander_id == commander_id,
+                           Interview.scheduled_date >= now,
+                           func.coalesce(Interview.status, 'scheduled').notin_(('cancelled', 'completed')))
+        interviews_per_job = dict(db.session.query(JobApplication.job_id, func.count(Interview.id))
+                                  .select_from(Interview)
+                                  .join(Interview.application).join(JobApplication.job)
+                                  .filter(*upcoming_filter)
+                                  .group_by(JobApplication.job_id)
+                                  .all())
+        upcoming = db.session.query(Interview, JobApplication, Volunteer.full_name, Job.title) \
+            .join(Interview.application).join(JobApplication.job).join(JobApplication.volunteer) \
+            .filter(*upcoming_filter) \
+            .order_by(Interview.scheduled_date, Interview.id) \
+            .limit(upcoming_limit) \
+            .all()
+
+        jobs = [(row[0], JobStatsService.counts_from_row(row, 1), interviews_per_job.get(row[0].id, 0))
+                for row in rows]
+        return jobs, upcoming
 
     @staticmethod
     def get_job_by_id(job_id):
@@ -166,6 +239,10 @@ class CommanderService:
                 setattr(job, model_field, value)
 
         db.session.commit()
+        job_board_cache.invalidate()
+        if 'name' in data:
+            interview_feed_cache.invalidate()  # Interview feeds show the job title
+        MatchingService.job_changed(job)
         return job
     @staticmethod
     def get_volunteer_by_id(volunteer_id):
@@ -190,17 +267,47 @@ class CommanderService:
             abort(404)
         return JobApplication.query.filter_by(job_id=job_id).all()
 
+    @staticmethod
+    def _change_status(application, status):
+        """Move one application to ``status`` under STATUS_TRANSITIONS and commit.
+
+        Raises BadRequest for a transition the rules forbid (HIRED is only
+        reached through HR's assignment, which takes a vacant position) and
+        Conflict when another request changed the status in the meantime.
+        """
+        previous = application.status
+        if previous == status:
+            return application
+        error = _transition_error(previous, status)
+        if error:
+            raise BadRequest(error)
+        updated = db.session.execute(
+            update(JobApplication)
+            .where(JobApplication.id == application.id, JobApplication.status == previous)
+            .values(status=status)
+        ).rowcount
+        if not updated:
+            db.session.rollback()
+            raise Conflict('Application status was changed by another request')
+        JobStatsService.status_changed(application.job_id, previous, status)
+        db.session.commit()
+        return application
+
     @staticmethod
     def update_application_status(application_id, commander_id, status):
+        try:
+            status = as_application_status(status)
+        except (KeyError, ValueError):
+            raise BadRequest(f"Invalid status value: {status}")
+        if status is None:
+            raise BadRequest("Missing 'status' field in request data.")
         application = JobApplication.query.get_or_404(application_id)
         if application.job.commander_id != commander_id:
             abort(403)
-        application.status = status
-        db.session.commit()
-        return application
+        return CommanderService._change_status(application, status)
 
     @staticmethod
-    def patch_job_application_status(job_id, volunteer_id, data):
+    def patch_job_application_status(job_id, volunteer_id, data, commander_id):
         if 'status' not in data:
             raise BadRequest("Missing 'status' field in request data.")
 
@@ -209,62 +316,145 @@ class CommanderService:
         except ValueError:
             raise BadRequest(f"Invalid status value: {data['status']}")
 
-        application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=volunteer_id).first()
+        application = JobApplication.query.join(JobApplication.job).filter(
+            JobApplication.job_id == job_id,
+            JobApplication.volunteer_id == volunteer_id,
+            Job.commander_id == commander_id
+        ).first()
 
         if not application:
             raise BadRequest('Job application not found')
 
-        commander_id = get_jwt_identity()
-        job = Job.query.get(job_id)
+        return CommanderService._change_status(application, status_value)
 
-        if not job or str(job.commander_id) != str(commander_id):
-            raise BadRequest("You don't have permission to update this application.")
+    @staticmethod
+    def patch_job_application_statuses(job_id, commander_id, changes):
+        """Apply many {volunteer_id, status} changes to one job's applications in one transaction.
+
+        Every change is checked against STATUS_TRANSITIONS; the valid ones are
+        applied with one bulk UPDATE per (current, new) status pair, guarded on
+        the current status so a concurrent change is reported instead of
+        overwritten. Returns one result per change, in order:
+        {'volunteer_id', 'status', 'updated', 'previous_status'?, 'error'?}.
+        """
+        if not Job.query.filter_by(id=job_id, commander_id=commander_id).first():
+            abort(404)
 
-        application.status = status_value
-        db.session.commit()
-        return application
+        results, targets = [], {}
+        for change in changes:
+            result = {'volunteer_id': change.get('volunteer_id'), 'status': change.get('status'), 'updated': False}
+            results.append(result)
+            try:
+                volunteer_id, status = int(change['volunteer_id']), as_application_status(change['status'])
+            except (TypeError, KeyError, ValueError):
+                result['error'] = "Each change needs an integer 'volunteer_id' and a valid 'status'"
+                continue
+            if volunteer_id in targets:
+                result['error'] = 'Duplicate change for this volunteer'
+                continue
+            result.update(volunteer_id=volunteer_id, status=status.value)
+            targets[volunteer_id] = (result, status)
+
+        current = dict(db.session.query(JobApplication.volunteer_id, JobApplication.status)
+                       .filter(JobApplication.job_id == job_id, JobApplication.volunteer_id.in_(targets))
+                       .all()) if targets else {}
+        transitions = {}
+        for volunteer_id, (result, status) in targets.items():
+            if volunteer_id not in current:
+                result['error'] = 'Job application not found'
+                continue
+            previous = current[volunteer_id]
+            result['previous_status'] = previous.value if previous else None
+            if previous == status:
+                continue
+            error = _transition_error(previous, status)
+            if error:
+                result['error'] = error
+                continue
+            transitions.setdefault((previous, status), []).append(volunteer_id)
+
+        try:
+            for (previous, status), volunteer_ids in transitions.items():
+                updated = db.session.execute(
+                    update(JobApplication)
+                    .where(JobApplication.job_id == job_id,
+                           JobApplication.volunteer_id.in_(volunteer_ids),
+                           JobApplication.status == previous)
+                    .values(status=status)
+                    .returning(JobApplication.volunteer_id)
+                ).scalars().all()
+                JobStatsService.status_changed(job_id, previous, status, count=len(updated))
+                updated = set(updated)
+                for volunteer_id in volunteer_ids:
+                    result = targets[volunteer_id][0]
+                    if volunteer_id in updated:
+                        result['updated'] = True
+                    else:
+                        result['error'] = 'Application status was changed by another request'
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return results
+
+    @staticmethod
+    def _commander_application(job_id, volunteer_id, commander_id):
+        return JobApplication.query.join(JobApplication.job).filter(
+            JobApplication.job_id == job_id,
+            JobApplication.volunteer_id == volunteer_id,
+            Job.commander_id == commander_id
+        ).first()
+
+    @staticmethod
+    def _book(interview, commander_id):
+        """Lock the commander's schedule and refuse the interview's slot if another interview holds it."""
+        if interview.scheduled_date is None or interview.status == 'cancelled':
+            return
+        InterviewService.lock_schedule(commander_id)
+        InterviewService.check_available(commander_id, interview.scheduled_date, interview.scheduled_end,
+                                         exclude_id=interview.id)
 
     @staticmethod
-    def create_interview(job_id, user_id, data):
-        user = User.query.get(user_id)
-        application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=user_id).first()
+    def create_interview(job_id, user_id, data, commander_id):
+        application = CommanderService._commander_application(job_id, user_id, commander_id)
         if not application:
             raise BadRequest('Job application not found')
 
-        scheduled_date_str = data.get('interviewDate')
-        scheduled_date = None  # Default to None if no date is provided
-        if scheduled_date_str:
-            try:
-                # scheduled_date = datetime.fromisoformat(scheduled_date_str)  # convert to datetime
-                scheduled_date = datetime.fromisoformat(scheduled_date_str.replace('Z', '+00:00'))  # convert to datetime
-            except ValueError:
-                raise BadRequest("Invalid date format. Use ISO 8601 format (YYYY-MM-DDTHH:MM:SS).")
+        scheduled_date = scheduled_end = None  # Default to None if no date is provided
+        if data.get('interviewDate'):
+            scheduled_date = InterviewService.parse_time(data['interviewDate'])
+            scheduled_end = InterviewService.end_time(scheduled_date, data)
 
         interview = Interview(
             application_id=application.id,
+            commander_id=commander_id,
             general_info=data.get('interviewNotes'),
             scheduled_date=scheduled_date,  # Now a datetime object or None
+            scheduled_end=scheduled_end,
             schedule=data.get('automaticMessage'),
             status=data.get('status')
         )
-        db.session.add(interview)
-        db.session.commit()
+        try:
+            CommanderService._book(interview, commander_id)
+            db.session.add(interview)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        interview_feed_cache.invalidate()
         return interview
 
     @staticmethod
-    def get_interview(job_id, user_id):
-        user = User.query.get(user_id)
-        application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=user_id).first()
-        if not application:
-            return None
-        return application.interview
+    def get_interview(job_id, user_id, commander_id):
+        return Interview.query.join(Interview.application).join(JobApplication.job).filter(
+            JobApplication.job_id == job_id,
+            JobApplication.volunteer_id == user_id,
+            Job.commander_id == commander_id
+        ).first()
 
     @staticmethod
-    def patch_interview(job_id, user_id, data):
-        user = User.query.get(user_id)
-        application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=user_id).first()
-
-        # application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=volunteer_id).first()
+    def patch_interview(job_id, user_id, data, commander_id):
+        application = CommanderService._commander_application(job_id, user_id, commander_id)
         if not application:
             raise BadRequest('Job application not found')
         interview = application.interview
@@ -274,59 +464,76 @@ class CommanderService:
         if "interviewNotes" in data:
             interview.general_info = data.get('interviewNotes')
 
-        if "interviewDate" in data:
-            scheduled_date_str = data.get('interviewDate')
-            scheduled_date = None
-            if scheduled_date_str:
-                try:
-                    scheduled_date_str = scheduled_date_str.replace('.000Z', '')
-                    scheduled_date = datetime.fromisoformat(scheduled_date_str)
-                    # scheduled_date = datetime.fromisoformat(scheduled_date_str)
-                except ValueError:
-                    raise BadRequest("Invalid date format. Use ISO 8601 format (YYYY-MM-DDTHH:MM:SS).")
-            interview.scheduled_date = scheduled_date
+        rebook = False
+        if "interviewDate" in data or "interviewEnd" in data or "durationMinutes" in data:
+            previous_length = interview.scheduled_date and interview.scheduled_end and \
+                interview.scheduled_end - interview.scheduled_date
+            if "interviewDate" in data:
+                interview.scheduled_date = InterviewService.parse_time(data['interviewDate']) \
+                    if data.get('interviewDate') else None
+            if interview.scheduled_date is None:
+                interview.scheduled_end = None
+            elif data.get('interviewEnd') or data.get('durationMinutes') or not previous_length:
+                interview.scheduled_end = InterviewService.end_time(interview.scheduled_date, data)
+            else:  # Moved without a new length: keep the old one
+                interview.scheduled_end = interview.scheduled_date + previous_length
+            rebook = True
 
         if "automaticMessage" in data:
             interview.schedule = data.get('automaticMessage')
         if "status" in data:
+            rebook = rebook or (interview.status == 'cancelled') != (data.get('status') == 'cancelled')
             interview.status = data.get('status')
 
-        db.session.commit()
+        interview.commander_id = commander_id
+        try:
+            if rebook:
+                CommanderService._book(interview, commander_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        interview_feed_cache.invalidate()
         return interview
 
     @staticmethod
-    def delete_interview(job_id, user_id):
-        user = User.query.get(user_id)
-        application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=user_id).first()
-
-        # application = JobApplication.query.filter_by(job_id=job_id, volunteer_id=volunteer_id).first()
+    def delete_interview(job_id, user_id, commander_id):
+        application = CommanderService._commander_application(job_id, user_id, commander_id)
         if not application:
             raise BadRequest('Job application not found')
-        
+
         interview = application.interview
         if not interview:
             raise BadRequest('Interview not found')
-        
+
         db.session.delete(interview)
         db.session.commit()
+        interview_feed_cache.invalidate()
         return {"message": "Interview deleted successfully"}
 
-
     @staticmethod
     def schedule_interview(application_id, commander_id, interview_data):
         application = JobApplication.query.get_or_404(application_id)
         if application.job.commander_id != commander_id:
             abort(403)
 
+        scheduled_date = InterviewService.parse_time(interview_data.get('scheduled_date'), 'scheduled_date')
         interview = Interview(
             application_id=application_id,
-            scheduled_date=datetime.fromisoformat(interview_data['scheduled_date']),
+            commander_id=commander_id,
+            scheduled_date=scheduled_date,
+            scheduled_end=scheduled_date + InterviewService.duration(interview_data.get('duration_minutes')),
             schedule=interview_data.get('schedule'),
             status='scheduled'
         )
-        db.session.add(interview)
-        application.status = 'interview_scheduled'
-        db.session.commit()
+        try:
+            CommanderService._book(interview, commander_id)
+            db.session.add(interview)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        interview_feed_cache.invalidate()
         return interview
 
     @staticmethod
@@ -340,36 +547,89 @@ class CommanderService:
         interview.summary = results_data.get('summary')
         interview.status = 'completed'
         db.session.commit()
+        interview_feed_cache.invalidate()
         return interview
 
-    @staticmethod
-    def generate_applications_csv(job_id, commander_id):
-        applications = JobApplication.query.filter_by(job_id=job_id).all()
-        if not applications:
-            return None
+    EXPORT_HEADER = ['Application ID', 'Volunteer Name', 'Status', 'Application Date',
+                     'Phone', 'Email', 'Education', 'Interview Status']
+    EXPORT_BATCH_SIZE = 500
 
-        output = io.StringIO()
-        writer = csv.writer(output)
+    @staticmethod
+    def has_job_applications(job_id, commander_id):
+        return db.session.query(
+            JobApplication.query.join(Job).filter(
+                Job.id == job_id,
+                Job.commander_id == commander_id
+            ).exists()
+        ).scalar()
 
-        # Write header
-        writer.writerow(['Application ID', 'Volunteer Name', 'Status', 'Application Date',
-                         'Phone', 'Email', 'Education', 'Interview Status'])
+    @staticmethod
+    def iter_application_export_rows(job_id):
+        """Yield one export row per application, reading the table in batches.
+
+        Volunteer and user are joined into each batch and interviews are
+        selectin-loaded per batch, so memory stays bounded by the batch size.
+        """
+        applications = JobApplication.query.filter_by(job_id=job_id) \
+            .options(
+                joinedload(JobApplication.volunteer).joinedload(Volunteer.user),
+                selectinload(JobApplication.interview)
+            ) \
+            .order_by(JobApplication.id) \
+            .yield_per(CommanderService.EXPORT_BATCH_SIZE)
 
-        # Write data
         for app in applications:
-            writer.writerow([
+            volunteer = app.volunteer
+            yield [
                 app.id,
-                app.volunteer.full_name,
-                app.status,
-                app.application_date.strftime('%Y-%m-%d'),
-                app.volunteer.phone,
-                app.volunteer.user.email,
-                app.volunteer.education,
+                volunteer.full_name,
+                str(app.status),
+                app.application_date.date() if app.application_date else None,
+                volunteer.user.phone,
+                volunteer.user.email,
+                volunteer.education,
                 app.interview.status if app.interview else 'No interview'
-            ])
+            ]
+
+    @staticmethod
+    def stream_applications_csv(job_id):
+        """Yield the CSV export as UTF-8 chunks of EXPORT_BATCH_SIZE rows."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CommanderService.EXPORT_HEADER)
+
+        for index, row in enumerate(CommanderService.iter_application_export_rows(job_id), start=1):
+            writer.writerow(row)
+            if index % CommanderService.EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue().encode('utf-8')
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def stream_applications_xlsx(job_id, chunk_size=64 * 1024):
+        """Yield the XLSX export in chunks.
+
+        The write-only workbook spools rows to disk, and the finished file is
+        streamed from a temporary file rather than held in memory.
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('Applications')
+        sheet.append(CommanderService.EXPORT_HEADER)
+        for row in CommanderService.iter_application_export_rows(job_id):
+            sheet.append(row)
+
+        with tempfile.TemporaryFile() as output:
+            workbook.save(output)
+            output.seek(0)
+            while True:
+                chunk = output.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
 
-        return output.getvalue()
-    
     @staticmethod
     def get_commander_user_info(user_id):
         return User.query.filter_by(id=user_id).first()
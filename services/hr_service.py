@@ -1,11 +1,23 @@
 # services/hr_service.py
 from datetime import datetime
 from random import randint
-from models import User, HR, Volunteer, JobApplication, Job
+from models import User, HR, Volunteer, JobApplication, Job, Commander
+from models.application import ApplicationStatus
+from models.job import JobStatus
 from models.volunteer import Gender
 from services.auth_service import AuthService
+from services.job_stats_service import JobStatsService
+from services.matching_service import MatchingService
 from db import db
-from flask import abort, jsonify
+from flask import abort, current_app, jsonify
+from werkzeug.exceptions import HTTPException
+from sqlalchemy import case, literal, null, update
+from sqlalchemy.orm import joinedload, selectinload
+from utils.filters import apply_job_filters, apply_volunteer_filters
+from utils.fts import VOLUNTEERS_FTS, fts_supported, like_filter, ranked_page, search_columns
+from utils.pagination import PageRequest, keyset_paginate
+from utils.identity import invalidate_identity
+from utils.response_cache import interview_feed_cache, job_board_cache
 
 
 class HRService:
@@ -96,53 +108,160 @@ class HRService:
 
 
     @staticmethod
-    def get_all_volunteers():
-        return Volunteer.query.all()
+    def _volunteer_listing_options():
+        # The listing payload reads volunteer.user and every application's
+        # (job_id, status); load them up front so the whole list costs two
+        # queries instead of 2+ lazy loads per volunteer.
+        return (
+            joinedload(Volunteer.user),
+            selectinload(Volunteer.applications).load_only(JobApplication.job_id, JobApplication.status),
+        )
 
     @staticmethod
-    def get_volunteer_by_id(volunteer_id):
-        return Volunteer.query.get_or_404(volunteer_id)
+    def get_all_volunteers(filters=None, page=None):
+        query = Volunteer.query.options(*HRService._volunteer_listing_options())
+        query = apply_volunteer_filters(query, filters)
+        return keyset_paginate(query, page or PageRequest(), (Volunteer.id,))
 
     @staticmethod
-    def get_all_jobs():
-        return Job.query.all()
+    def search_volunteers(query, limit=20, offset=0, filters=None):
+        """Volunteers whose profile text matches ``query`` as (volunteer, rank, snippet), best first.
+
+        Ranked by BM25 over the volunteers_fts index on SQLite (languages and
+        profession weighted highest); a LIKE scan in id order elsewhere.
+        Like job search, broad queries rank the SEARCH_RANK_WINDOW newest
+        matches unless the filters leave too few of them to fill the page.
+        """
+        connection = db.session.connection()
+        if fts_supported(connection):
+            results = apply_volunteer_filters(
+                db.session.query(Volunteer, *search_columns(VOLUNTEERS_FTS, highlight=False))
+                .options(*HRService._volunteer_listing_options()), filters)
+            rows = ranked_page(results, VOLUNTEERS_FTS, Volunteer.id, query, connection,
+                               current_app.config['SEARCH_RANK_WINDOW'], limit, offset)
+        else:
+            columns = [getattr(Volunteer, name) for name in VOLUNTEERS_FTS.columns]
+            results = db.session.query(Volunteer, null(), null(), null()) \
+                .filter(like_filter(columns, query)) \
+                .options(*HRService._volunteer_listing_options()) \
+                .order_by(Volunteer.id)
+            rows = apply_volunteer_filters(results, filters).limit(limit).offset(offset).all()
+        return [(volunteer, rank, snippet) for volunteer, rank, _, snippet in rows]
 
     @staticmethod
-    def assign_volunteer_to_job(volunteer_id, job_id):
-        try:
-            volunteer = Volunteer.query.get_or_404(volunteer_id)
-            job = Job.query.get_or_404(job_id)
+    def get_volunteer_by_id(volunteer_id):
+        return Volunteer.query.options(*HRService._volunteer_listing_options()).get_or_404(volunteer_id)
 
-            application = JobApplication.query.filter_by(
-                volunteer_id=volunteer_id,
-                job_id=job_id
-            ).first()
+    @staticmethod
+    def get_all_jobs(filters=None, page=None):
+        """Jobs read-model: (job, commander department, application counts) per job.
+
+        Counts are broken down by ApplicationStatus and come from a single
+        GROUP BY over job_applications, or over the materialized
+        job_application_counts table when MATERIALIZED_JOB_COUNTS is set.
+        """
+        source, job_id_column, status_column, weight = JobStatsService.count_source()
+        query = db.session.query(Job, Commander.department, *JobStatsService.count_columns(status_column, weight)) \
+            .outerjoin(Commander, Job.commander_id == Commander.id) \
+            .outerjoin(source, job_id_column == Job.id) \
+            .group_by(Job.id, Commander.department)
+        query = apply_job_filters(query, filters)
+        rows, next_cursor = keyset_paginate(query, page or PageRequest(), (Job.id,))
+        return [(row[0], row[1], JobStatsService.counts_from_row(row, 2)) for row in rows], next_cursor
 
-            print(application.status)
+    @staticmethod
+    def _assign(volunteer_id, job_id):
+        """Hire one volunteer inside the current transaction; returns the application id.
 
-            if not application:
+        Both steps are conditional UPDATEs, so concurrent assignments can
+        neither hire the same application twice nor take more positions than
+        the job has: the database re-checks each WHERE clause under the row's
+        write lock. Raises an HTTPException (via abort) and leaves no change
+        behind when the volunteer cannot be assigned.
+        """
+        hired = db.session.execute(
+            update(JobApplication)
+            .where(JobApplication.job_id == job_id,
+                   JobApplication.volunteer_id == volunteer_id,
+                   JobApplication.status == ApplicationStatus.PREFERRED_FINAL)
+            .values(status=ApplicationStatus.HIRED)
+            .returning(JobApplication.id)
+        ).first()
+        if hired is None:
+            status = db.session.query(JobApplication.status).filter_by(
+                job_id=job_id, volunteer_id=volunteer_id).scalar()
+            if status is None:
                 abort(404, description="Application Not Found!")
-                
-            applicationStatus = str(application.status)
-            if applicationStatus.strip().lower() != 'preferred_final':
-                abort(400, description="Application must be accepted by commander first")
+            if status == ApplicationStatus.HIRED:
+                abort(400, description="Volunteer is already assigned to this job")
+            abort(400, description="Application must be accepted by commander first")
 
-            if job.vacant_positions <= 0:
-                abort(400, description="No vacant positions available")
+        # Take a position only if one is left, closing the job when it was the last one
+        claimed = db.session.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.vacant_positions > 0)
+            .values(vacant_positions=Job.vacant_positions - 1,
+                    status=case((Job.vacant_positions <= 1, literal(JobStatus.CLOSED, Job.status.type)),
+                                else_=Job.status))
+        ).rowcount
+        if not claimed:
+            db.session.execute(update(JobApplication).where(JobApplication.id == hired.id)
+                               .values(status=ApplicationStatus.PREFERRED_FINAL))
+            abort(400, description="No vacant positions available")
 
-            job.vacant_positions -= 1
+        JobStatsService.status_changed(job_id, ApplicationStatus.PREFERRED_FINAL, ApplicationStatus.HIRED)
+        return hired.id
 
-            application.status = 'HIRED'
+    @staticmethod
+    def _after_assignments(job_ids):
+        job_board_cache.invalidate()
+        for job in Job.query.filter(Job.id.in_(job_ids)):
+            MatchingService.job_changed(job)
 
-            if job.vacant_positions == 0:
-                job.status = 'CLOSED'
+    @staticmethod
+    def assign_volunteer_to_job(volunteer_id, job_id):
+        try:
+            application_id = HRService._assign(volunteer_id, job_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        HRService._after_assignments({job_id})
+        return db.session.get(JobApplication, application_id)
+
+    @staticmethod
+    def assign_volunteers(assignments, atomic=False):
+        """Assign many (volunteer_id, job_id) pairs in one transaction with one commit.
 
+        Returns a result per pair, in order: {'volunteer_id', 'job_id',
+        'assigned', 'application_id' or 'error'}. A failed pair changes
+        nothing; with ``atomic`` any failure rolls back the whole batch.
+        """
+        results = []
+        try:
+            for volunteer_id, job_id in assignments:
+                result = {'volunteer_id': volunteer_id, 'job_id': job_id}
+                try:
+                    result.update(assigned=True, application_id=HRService._assign(volunteer_id, job_id))
+                except HTTPException as e:
+                    result.update(assigned=False, error=e.description)
+                results.append(result)
+            if atomic and not all(result['assigned'] for result in results):
+                db.session.rollback()
+                for result in results:
+                    if result.pop('assigned'):
+                        result.pop('application_id')
+                        result['error'] = 'Batch rolled back'
+                    result['assigned'] = False
+                return results
             db.session.commit()
-            return application
-            
-        except Exception as e:
+        except Exception:
             db.session.rollback()
-            raise e
+            raise
+        assigned_jobs = {result['job_id'] for result in results if result['assigned']}
+        if assigned_jobs:
+            HRService._after_assignments(assigned_jobs)
+        return results
 
     @staticmethod
     def get_volunteer_applications(volunteer_id):
@@ -189,6 +308,10 @@ class HRService:
                 elif hasattr(volunteer, key):
                     setattr(volunteer, key, value)
             db.session.commit()
+            invalidate_identity(volunteer.user_id)
+            if 'full_name' in data:
+                interview_feed_cache.invalidate()  # Interview feeds show the candidate's name
+            MatchingService.volunteer_changed(volunteer)
             return volunteer
         except Exception as e:
             db.session.rollback()
@@ -0,0 +1,247 @@
+from datetime import datetime, time, timedelta
+
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import func, update
+from werkzeug.exceptions import BadRequest, Conflict
+
+from db import db
+from models import Commander, Interview, Job, JobApplication, Volunteer
+from models.application import ApplicationStatus
+from utils import ics, scheduling
+from utils.response_cache import interview_feed_cache
+
+# Longest range a free-slot search or an auto-schedule may cover
+MAX_SLOT_RANGE = timedelta(days=31)
+# Interviews an .ics feed covers, relative to when it is built
+FEED_PAST = timedelta(days=30)
+FEED_FUTURE = timedelta(days=365)
+# Every interview holds its slot until it is cancelled
+ACTIVE_INTERVIEW = func.coalesce(Interview.status, 'scheduled') != 'cancelled'
+
+
+class InterviewService:
+    @staticmethod
+    def parse_time(value, field='interviewDate'):
+        """Naive UTC datetime from an ISO 8601 string (a trailing Z or an offset is converted)."""
+        try:
+            return scheduling.to_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+        except (AttributeError, ValueError):
+            raise BadRequest(f"Invalid {field} format. Use ISO 8601 format (YYYY-MM-DDTHH:MM:SS).")
+
+    @staticmethod
+    def duration(minutes=None):
+        """timedelta for ``minutes`` (INTERVIEW_DURATION_MINUTES when None), bounded by INTERVIEW_MAX_MINUTES."""
+        if minutes is None:
+            minutes = current_app.config['INTERVIEW_DURATION_MINUTES']
+        maximum = current_app.config['INTERVIEW_MAX_MINUTES']
+        try:
+            minutes = int(minutes)
+        except (TypeError, ValueError):
+            raise BadRequest('Invalid duration: must be a whole number of minutes')
+        if minutes < 1 or minutes > maximum:
+            raise BadRequest(f'Invalid duration: must be between 1 and {maximum} minutes')
+        return timedelta(minutes=minutes)
+
+    @staticmethod
+    def end_time(start, data):
+        """End of an interview starting at ``start`` from 'interviewEnd' or 'durationMinutes' in ``data``."""
+        if data.get('interviewEnd'):
+            end = InterviewService.parse_time(data['interviewEnd'], 'interviewEnd')
+            if end <= start:
+                raise BadRequest('interviewEnd must be after interviewDate')
+            InterviewService.duration((end - start) // timedelta(minutes=1) or 1)
+            return end
+        return start + InterviewService.duration(data.get('durationMinutes'))
+
+    @staticmethod
+    def parse_range(args, default_days=7):
+        """(start, end) from ?from=&to= (default: now to ``default_days`` ahead), at most MAX_SLOT_RANGE long."""
+        start = InterviewService.parse_time(args['from'], 'from') if args.get('from') else \
+            datetime.utcnow().replace(second=0, microsecond=0)
+        end = InterviewService.parse_time(args['to'], 'to') if args.get('to') else \
+            start + timedelta(days=default_days)
+        if end <= start:
+            raise BadRequest("'to' must be after 'from'")
+        if end - start > MAX_SLOT_RANGE:
+            raise BadRequest(f'The range may span at most {MAX_SLOT_RANGE.days} days')
+        return start, end
+
+    @staticmethod
+    def lock_schedule(commander_id):
+        """Serialize schedule changes of one commander until the transaction ends.
+
+        A no-op UPDATE of the commander row takes its row lock on PostgreSQL and
+        the database write lock on SQLite; issued before any read, it makes the
+        conflict check and the insert that follows atomic against other
+        requests booking for the same commander.
+        """
+        db.session.execute(update(Commander).where(Commander.id == commander_id).values(name=Commander.name))
+
+    @staticmethod
+    def find_conflict(commander_id, start, end, exclude_id=None):
+        """The commander's earliest active interview overlapping [start, end), or None.
+
+        Returns an (id, scheduled_date, scheduled_end) row. No interview is
+        longer than INTERVIEW_MAX_MINUTES, so only those starting in
+        (start - max, end) can overlap: one bounded range of the
+        (commander_id, scheduled_date) index, whatever the calendar's size.
+        """
+        horizon = start - timedelta(minutes=current_app.config['INTERVIEW_MAX_MINUTES'])
+        query = db.session.query(Interview.id, Interview.scheduled_date, Interview.scheduled_end).filter(
+            Interview.commander_id == commander_id,
+            Interview.scheduled_date > horizon,
+            Interview.scheduled_date < end,
+            Interview.scheduled_end > start,
+            ACTIVE_INTERVIEW
+        )
+        if exclude_id is not None:
+            query = query.filter(Interview.id != exclude_id)
+        return query.order_by(Interview.scheduled_date).first()
+
+    @staticmethod
+    def check_available(commander_id, start, end, exclude_id=None):
+        """Raise Conflict when [start, end) overlaps another active interview of the commander."""
+        conflict = InterviewService.find_conflict(commander_id, start, end, exclude_id)
+        if conflict:
+            raise Conflict(f'Overlaps interview {conflict.id} scheduled '
+                           f'{conflict.scheduled_date.isoformat()} - {conflict.scheduled_end.isoformat()}')
+
+    @staticmethod
+    def busy_intervals(commander_id, start, end):
+        """(start, end) of the commander's active interviews overlapping [start, end), by start time."""
+        horizon = start - timedelta(minutes=current_app.config['INTERVIEW_MAX_MINUTES'])
+        return db.session.query(Interview.scheduled_date, Interview.scheduled_end).filter(
+            Interview.commander_id == commander_id,
+            Interview.scheduled_date > horizon,
+            Interview.scheduled_date < end,
+            Interview.scheduled_end > start,
+            ACTIVE_INTERVIEW
+        ).order_by(Interview.scheduled_date).all()
+
+    @staticmethod
+    def free_slots(commander_id, start, end, duration):
+        """Non-overlapping free slots of ``duration`` in the commander's working hours within [start, end)."""
+        config = current_app.config
+        windows = scheduling.working_windows(
+            start, end, config['INTERVIEW_TIMEZONE'],
+            time.fromisoformat(config['INTERVIEW_DAY_START']), time.fromisoformat(config['INTERVIEW_DAY_END']),
+            scheduling.parse_weekdays(config['INTERVIEW_WORK_DAYS']))
+        free = scheduling.subtract(windows, InterviewService.busy_intervals(commander_id, start, end))
+        return scheduling.slots(free, duration, timedelta(minutes=config['INTERVIEW_SLOT_STEP_MINUTES']))
+
+    @staticmethod
+    def auto_schedule(job_id, commander_id, start, end, duration, volunteer_ids=None):
+        """Book the job's candidates into the earliest free slots of [start, end), in application order.
+
+        Candidates are the given volunteers' applications, or every PREFERRED
+        application, that have no interview yet. Everything happens under the
+        commander's schedule lock and is committed once. Returns a result per
+        candidate: {'volunteer_id', 'application_id', 'interview_id', 'start',
+        'end'} or {'volunteer_id', 'error'}.
+        """
+        if not Job.query.filter_by(id=job_id, commander_id=commander_id).first():
+            raise BadRequest('Job not found')
+
+        InterviewService.lock_schedule(commander_id)
+        query = JobApplication.query.outerjoin(JobApplication.interview).filter(JobApplication.job_id == job_id)
+        if volunteer_ids is None:
+            query = query.filter(JobApplication.status == ApplicationStatus.PREFERRED)
+        else:
+            query = query.filter(JobApplication.volunteer_id.in_(volunteer_ids))
+        applications = query.order_by(JobApplication.application_date, JobApplication.id) \
+            .add_columns(Interview.id).all()
+
+        results, found = [], set()
+        free = iter(InterviewService.free_slots(commander_id, start, end, duration))
+        interviews = []
+        for application, interview_id in applications:
+            found.add(application.volunteer_id)
+            result = {'volunteer_id': application.volunteer_id, 'application_id': application.id}
+            results.append(result)
+            if interview_id is not None:
+                result['error'] = 'Application already has an interview'
+                continue
+            if application.status in (ApplicationStatus.REJECTED, ApplicationStatus.HIRED):
+                result['error'] = f'Application is {application.status.value}'
+                continue
+            slot = next(free, None)
+            if slot is None:
+                result['error'] = 'No free slot left in the range'
+                continue
+            interview = Interview(application_id=application.id, commander_id=commander_id,
+                                  scheduled_date=slot[0], scheduled_end=slot[1], status='scheduled')
+            interviews.append((result, interview))
+            db.session.add(interview)
+        for volunteer_id in volunteer_ids or ():
+            if volunteer_id not in found:
+                results.append({'volunteer_id': volunteer_id, 'error': 'Job application not found'})
+
+        try:
+            db.session.flush()
+            for result, interview in interviews:
+                result.update(interview_id=interview.id, start=interview.scheduled_date.isoformat(),
+                              end=interview.scheduled_end.isoformat())
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        if interviews:
+            interview_feed_cache.invalidate()
+        return results
+
+    @staticmethod
+    def agenda(commander_id, start, end):
+        """The commander's interviews overlapping [start, end), soonest first, in one query.
+
+        Returns (interview, job id, volunteer id, volunteer name, job title)
+        rows; cancelled interviews are included with their status.
+        """
+        horizon = start - timedelta(minutes=current_app.config['INTERVIEW_MAX_MINUTES'])
+        return db.session.query(Interview, JobApplication.job_id, JobApplication.volunteer_id,
+                                Volunteer.full_name, Job.title) \
+            .join(Interview.application).join(JobApplication.job).join(JobApplication.volunteer) \
+            .filter(Interview.commander_id == commander_id,
+                    Interview.scheduled_date > horizon,
+                    Interview.scheduled_date < end,
+                    Interview.scheduled_end > start) \
+            .order_by(Interview.scheduled_date, Interview.id) \
+            .all()
+
+    @staticmethod
+    def _feed_serializer():
+        return URLSafeSerializer(current_app.config['SECRET_KEY'], salt='interview-feed')
+
+    @staticmethod
+    def feed_token(commander_id):
+        """Signed token naming the commander, for a feed URL calendar clients can poll without a JWT."""
+        return InterviewService._feed_serializer().dumps({'commander_id': commander_id})
+
+    @staticmethod
+    def feed_commander_id(token):
+        """The commander id a feed token was issued for, or None if its signature is invalid."""
+        try:
+            return int(InterviewService._feed_serializer().loads(token)['commander_id'])
+        except (BadSignature, KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def feed_ics(commander_id, now=None):
+        """iCalendar text of the commander's interviews from FEED_PAST ago to FEED_FUTURE ahead."""
+        now = now or datetime.utcnow()
+        events = []
+        for interview, job_id, volunteer_id, full_name, job_title in \
+                InterviewService.agenda(commander_id, now - FEED_PAST, now + FEED_FUTURE):
+            description = f'Candidate: {full_name}\nJob: {job_title}'
+            if interview.general_info:
+                description += f'\n\n{interview.general_info}'
+            events.append({
+                'uid': f'interview-{interview.id}@volunteer-system',
+                'start': interview.scheduled_date,
+                'end': interview.scheduled_end or interview.scheduled_date + InterviewService.duration(),
+                'summary': f'Interview: {full_name} ({job_title})',
+                'description': description,
+                'status': 'CANCELLED' if interview.status == 'cancelled' else 'CONFIRMED',
+                'updated': interview.updated_at,
+            })
+        return ics.calendar(events, 'Interviews')
@@ -0,0 +1,239 @@
+import json
+import logging
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from flask import current_app
+from googleapiclient.errors import HttpError
+from werkzeug.exceptions import BadRequest
+
+from db import db
+from models import CalendarInvitation
+from services.interview_service import InterviewService
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ('candidate_email', 'commander_email', 'job_title', 'interview_time')
+
+# Calendar answers these with a later success likely; anything else is permanent
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+def _http_status(error):
+    return getattr(getattr(error, 'resp', None), 'status', None)
+
+
+class InvitationService:
+    @staticmethod
+    def build_event(data, event_id):
+        """Calendar event body for an interview invitation request."""
+        if not data or not all(field in data for field in REQUIRED_FIELDS):
+            raise BadRequest('Missing required fields')
+
+        try:
+            interview_time = datetime.fromisoformat(data['interview_time'].replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            raise BadRequest('Invalid interview time format. Use ISO 8601 format')
+
+        # Interview length: duration_minutes, or INTERVIEW_DURATION_MINUTES
+        interview_end = interview_time + InterviewService.duration(data.get('duration_minutes'))
+
+        event = {
+            # Client-chosen id: a retried insert of an event Google already created fails with 409
+            'id': event_id,
+            'summary': f'Interview for {data["job_title"]} Position',
+            'location': 'Online',
+            'description': f'''Interview for the position of {data["job_title"]}
+
+        Commander: {data.get("commander_name", "Interview Commander")}
+        Candidate: {data.get("candidate_name", "Candidate")}
+
+        Additional Info: {data.get("additional_info", "")}''',
+            'start': {
+                'dateTime': interview_time.isoformat(),
+                'timeZone': 'Asia/Jerusalem',
+            },
+            'end': {
+                'dateTime': interview_end.isoformat(),
+                'timeZone': 'Asia/Jerusalem',
+            },
+            'attendees': [
+                {
+                    'email': data['commander_email'],
+                    'responseStatus': 'accepted',  # Auto-accept for organizer
+                    'optional': False  # Mark as required attendee
+                },
+                {
+                    'email': data['candidate_email'],
+                    'responseStatus': 'needsAction',
+                    'optional': False  # Mark as required attendee
+                }
+            ],
+            'reminders': {
+                'useDefault': False,
+                'overrides': [
+                    {'method': 'email', 'minutes': 24 * 60},
+                    {'method': 'popup', 'minutes': 30}
+                ]
+            },
+            'guestsCanModify': False,  # Prevents attendees from modifying the event
+            'guestsCanInviteOthers': False,  # Prevents attendees from inviting others
+        }
+
+        if data.get('include_meet_link', True):
+            event['conferenceData'] = {
+                'createRequest': {
+                    'requestId': f"interview-{event_id}",
+                    'conferenceSolutionKey': {'type': 'hangoutsMeet'}
+                }
+            }
+        return event
+
+    @staticmethod
+    def enqueue_invitation(commander_id, data):
+        """Store a pending invitation for the worker to send."""
+        # Hex digits are valid Calendar event id characters (base32hex)
+        event_id = uuid.uuid4().hex
+        event = InvitationService.build_event(data, event_id)
+        invitation = CalendarInvitation(
+            commander_id=commander_id,
+            event_id=event_id,
+            event=json.dumps(event),
+            status='pending',
+            next_attempt_at=datetime.utcnow()
+        )
+        db.session.add(invitation)
+        db.session.commit()
+        return invitation
+
+    @staticmethod
+    def get_invitation(invitation_id, commander_id):
+        return CalendarInvitation.query.filter_by(id=invitation_id, commander_id=commander_id).first()
+
+    @staticmethod
+    def scheduled_time(invitation):
+        return json.loads(invitation.event)['start']['dateTime']
+
+    @staticmethod
+    def retry_delay(attempts):
+        """Exponential backoff with full jitter, capped at INVITATION_RETRY_MAX_SECONDS."""
+        base = current_app.config['INVITATION_RETRY_BASE_SECONDS']
+        cap = current_app.config['INVITATION_RETRY_MAX_SECONDS']
+        return random.uniform(0, min(cap, base * 2 ** (attempts - 1)))
+
+    @staticmethod
+    def claim_batch(limit):
+        """Mark up to ``limit`` due invitations as sending and return them.
+
+        Each row is claimed with a conditional UPDATE, so several workers can
+        poll the same table without sending an invitation twice. Rows left in
+        'sending' by a crashed worker become due again after
+        INVITATION_SENDING_TIMEOUT seconds.
+        """
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=current_app.config['INVITATION_SENDING_TIMEOUT'])
+        due = db.or_(
+            db.and_(CalendarInvitation.status == 'pending', CalendarInvitation.next_attempt_at <= now),
+            db.and_(CalendarInvitation.status == 'sending', CalendarInvitation.updated_at <= stale),
+        )
+        candidate_ids = [row.id for row in db.session.query(CalendarInvitation.id)
+                         .filter(due)
+                         .order_by(CalendarInvitation.next_attempt_at)
+                         .limit(limit)]
+
+        claimed = []
+        for invitation_id in candidate_ids:
+            updated = CalendarInvitation.query \
+                .filter(CalendarInvitation.id == invitation_id, due) \
+                .update({'status': 'sending', 'attempts': CalendarInvitation.attempts + 1, 'updated_at': now},
+                        synchronize_session=False)
+            if updated:
+                claimed.append(invitation_id)
+        db.session.commit()
+
+        if not claimed:
+            return []
+        return CalendarInvitation.query.filter(CalendarInvitation.id.in_(claimed)).all()
+
+    @staticmethod
+    def _record_result(invitation, response, error):
+        if error is None:
+            invitation.status = 'sent'
+            invitation.last_error = None
+            invitation.event_link = response.get('htmlLink')
+            invitation.meeting_link = response.get('conferenceData', {}).get('entryPoints', [{}])[0].get('uri')
+            return
+
+        status = _http_status(error)
+        if status == 409:
+            # A previous attempt created the event but its response was lost
+            invitation.status = 'sent'
+            invitation.last_error = None
+            return
+
+        invitation.last_error = str(error)
+        retryable = status is None or status in RETRYABLE_STATUSES
+        if retryable and invitation.attempts < current_app.config['INVITATION_MAX_ATTEMPTS']:
+            invitation.status = 'pending'
+            invitation.next_attempt_at = datetime.utcnow() + timedelta(
+                seconds=InvitationService.retry_delay(invitation.attempts))
+        else:
+            invitation.status = 'failed'
+            logger.warning('Calendar invitation %s failed: %s', invitation.id, error)
+
+    @staticmethod
+    def send_batch(service, invitations):
+        """Insert the invitations' events with one batch HTTP request and record the outcomes."""
+        by_request_id = {str(invitation.id): invitation for invitation in invitations}
+        results = {}
+
+        def on_response(request_id, response, exception):
+            results[request_id] = (response, exception)
+
+        calendar_id = current_app.config['CALENDAR_ID']
+        batch = service.new_batch_http_request(callback=on_response)
+        for request_id, invitation in by_request_id.items():
+            batch.add(service.events().insert(
+                calendarId=calendar_id,
+                body=json.loads(invitation.event),
+                conferenceDataVersion=1,
+                sendUpdates='all',  # This ensures all attendees get notifications
+            ), request_id=request_id)
+
+        try:
+            batch.execute()
+        except (HttpError, OSError) as e:
+            # The whole batch failed in transit; every invitation is retried
+            results = {request_id: (None, e) for request_id in by_request_id}
+
+        for request_id, invitation in by_request_id.items():
+            response, error = results.get(request_id, (None, RuntimeError('No response in batch')))
+            InvitationService._record_result(invitation, response, error)
+        db.session.commit()
+
+    @staticmethod
+    def dispatch_pending(service, limit=None):
+        """Send one batch of due invitations. Returns how many were attempted."""
+        invitations = InvitationService.claim_batch(limit or current_app.config['INVITATION_BATCH_SIZE'])
+        if invitations:
+            InvitationService.send_batch(service, invitations)
+        return len(invitations)
+
+    @staticmethod
+    def run_worker(get_service, poll_interval=None, once=False):
+        """Deliver invitations until interrupted.
+
+        ``get_service`` is called before every batch; the calendar client
+        provider returns its cached Resource, refreshing credentials first if
+        they are about to expire.
+        """
+        poll_interval = poll_interval or current_app.config['INVITATION_POLL_SECONDS']
+        while True:
+            sent = InvitationService.dispatch_pending(get_service())
+            db.session.remove()
+            if once and not sent:
+                return
+            if not sent:
+                time.sleep(poll_interval)
@@ -0,0 +1,131 @@
+from flask import current_app
+from sqlalchemy import case, func, insert, update
+
+from db import db
+from models.application import JobApplication, JobApplicationCount, ApplicationStatus
+
+
+def as_application_status(value):
+    """Normalize a status given as enum member, name ('HIRED') or value ('hired')."""
+    if value is None or isinstance(value, ApplicationStatus):
+        return value
+    try:
+        return ApplicationStatus(value)
+    except ValueError:
+        return ApplicationStatus[str(value).upper()]
+
+
+class JobStatsService:
+    @staticmethod
+    def materialized():
+        return current_app.config.get('MATERIALIZED_JOB_COUNTS', False)
+
+    @staticmethod
+    def count_source():
+        """Return (source, job_id column, status column, weight) to aggregate counts from."""
+        if JobStatsService.materialized():
+            return JobApplicationCount, JobApplicationCount.job_id, JobApplicationCount.status, JobApplicationCount.total
+        # Outer joins yield one all-NULL row for jobs without applications
+        weight = case((JobApplication.id.isnot(None), 1), else_=0)
+        return JobApplication, JobApplication.job_id, JobApplication.status, weight
+
+    @staticmethod
+    def count_columns(status_column, weight):
+        """Aggregate columns: the total followed by one column per ApplicationStatus."""
+        columns = [func.coalesce(func.sum(weight), 0).label('total')]
+        for status in ApplicationStatus:
+            columns.append(
+                func.coalesce(func.sum(case((status_column == status, weight), else_=0)), 0).label(status.value))
+        return columns
+
+    @staticmethod
+    def counts_from_row(row, offset):
+        """Turn the aggregate columns of a result row (starting at ``offset``) into a dict."""
+        counts = {'total': row[offset]}
+        for index, status in enumerate(ApplicationStatus, start=offset + 1):
+            counts[status.value] = row[index]
+        return counts
+
+    @staticmethod
+    def application_counts(job_ids):
+        """Return {job_id: {'total': n, '<status>': n, ...}} for the given jobs."""
+        if not job_ids:
+            return {}
+        source, job_id_column, status_column, weight = JobStatsService.count_source()
+        rows = db.session.query(job_id_column, *JobStatsService.count_columns(status_column, weight)) \
+            .filter(job_id_column.in_(job_ids)) \
+            .group_by(job_id_column) \
+            .all()
+        counts = {job_id: JobStatsService.empty_counts() for job_id in job_ids}
+        for row in rows:
+            counts[row[0]] = JobStatsService.counts_from_row(row, 1)
+        return counts
+
+    @staticmethod
+    def empty_counts():
+        counts = {'total': 0}
+        counts.update({status.value: 0 for status in ApplicationStatus})
+        return counts
+
+    # Materialized counter maintenance. These only stage statements on the
+    # current session; the caller's commit makes them durable together with
+    # the application change itself.
+
+    @staticmethod
+    def _adjust(job_id, status, delta):
+        status = as_application_status(status)
+        if status is None or not delta:
+            return
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = dialect_insert(JobApplicationCount).values(job_id=job_id, status=status, total=delta)
+            statement = statement.on_conflict_do_update(
+                index_elements=['job_id', 'status'],
+                set_={'total': JobApplicationCount.total + delta}
+            )
+            db.session.execute(statement)
+            return
+
+        result = db.session.execute(
+            update(JobApplicationCount)
+            .where(JobApplicationCount.job_id == job_id, JobApplicationCount.status == status)
+            .values(total=JobApplicationCount.total + delta)
+        )
+        if not result.rowcount:
+            db.session.execute(insert(JobApplicationCount).values(job_id=job_id, status=status, total=delta))
+
+    @staticmethod
+    def application_added(job_id, status=ApplicationStatus.PENDING):
+        JobStatsService._adjust(job_id, status, 1)
+
+    @staticmethod
+    def application_removed(job_id, status):
+        JobStatsService._adjust(job_id, status, -1)
+
+    @staticmethod
+    def status_changed(job_id, old_status, new_status, count=1):
+        old_status = as_application_status(old_status)
+        new_status = as_application_status(new_status)
+        if old_status == new_status:
+            return
+        JobStatsService._adjust(job_id, old_status, -count)
+        JobStatsService._adjust(job_id, new_status, count)
+
+    @staticmethod
+    def rebuild_counts():
+        """Recompute every materialized counter from job_applications."""
+        db.session.query(JobApplicationCount).delete(synchronize_session=False)
+        db.session.execute(
+            insert(JobApplicationCount).from_select(
+                ['job_id', 'status', 'total'],
+                db.session.query(JobApplication.job_id, JobApplication.status, func.count(JobApplication.id))
+                .filter(JobApplication.status.isnot(None))
+                .group_by(JobApplication.job_id, JobApplication.status)
+            )
+        )
+        db.session.commit()
@@ -0,0 +1,175 @@
+import threading
+import time
+
+from flask import abort, current_app
+from sqlalchemy.orm import joinedload, selectinload
+
+from db import db
+from models import Job, JobApplication, Volunteer
+from models.job import JobStatus
+from utils.matching import RowIndex, Vectorizer, feature, inverse_document_frequency, weigh
+
+# (facet, column, weight): terms only match terms of the same facet on the other side
+VOLUNTEER_FIELDS = (
+    ('lang', 'languages', 1.0),
+    ('edu', 'education', 1.0),
+    ('skill', 'primary_profession', 2.0),
+    ('skill', 'experience', 1.0),
+    ('skill', 'courses', 1.0),
+    ('skill', 'area_of_interest', 0.5),
+    ('skill', 'interests', 0.5),
+    ('skill', 'personal_summary', 0.5),
+)
+JOB_FIELDS = (
+    ('lang', 'required_languages', 1.0),
+    ('edu', 'education', 1.0),
+    ('skill', 'title', 2.0),
+    ('skill', 'tech_skills', 2.0),
+    ('skill', 'passed_courses', 1.0),
+    ('skill', 'required_certificates', 1.0),
+    ('skill', 'experience', 1.0),
+    ('skill', 'category', 0.5),
+    ('skill', 'description', 0.25),
+)
+
+VOLUNTEER_COLUMNS = [getattr(Volunteer, column) for _, column, _ in VOLUNTEER_FIELDS]
+JOB_COLUMNS = [getattr(Job, column) for _, column, _ in JOB_FIELDS]
+volunteer_vectorizer = Vectorizer((facet, position, weight)
+                                  for position, (facet, _, weight) in enumerate(VOLUNTEER_FIELDS))
+job_vectorizer = Vectorizer((facet, position, weight) for position, (facet, _, weight) in enumerate(JOB_FIELDS))
+
+# Candidates fetched per requested result, to make up for rows filtered out when loading them
+OVERFETCH = 2
+MATCHED_TERMS = 8
+
+
+class MatchingIndex:
+    """Both sides vectorized with a shared IDF, built from the database in one pass.
+
+    ``volunteers`` and ``jobs`` are rows of (id, *columns) in VOLUNTEER_FIELDS
+    and JOB_FIELDS order.
+    """
+
+    def __init__(self, volunteers, jobs):
+        volunteer_counts = [volunteer_vectorizer.counts(row[1:]) for row in volunteers]
+        job_counts = [job_vectorizer.counts(row[1:]) for row in jobs]
+        self.idf = inverse_document_frequency(volunteer_counts + job_counts)
+        self.volunteers = RowIndex([row[0] for row in volunteers],
+                                   [weigh(counts, self.idf) for counts in volunteer_counts])
+        self.jobs = RowIndex([row[0] for row in jobs], [weigh(counts, self.idf) for counts in job_counts])
+        self.max_volunteer_id = max((row[0] for row in volunteers), default=0)
+        self.max_job_id = max((row[0] for row in jobs), default=0)
+        self.built_at = time.monotonic()
+
+    def volunteer_row(self, record):
+        return weigh(volunteer_vectorizer.counts(record), self.idf)
+
+    def job_row(self, record):
+        return weigh(job_vectorizer.counts(record), self.idf)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def _volunteer_query():
+    return db.session.query(Volunteer.id, *VOLUNTEER_COLUMNS)
+
+
+def _job_query():
+    return db.session.query(Job.id, *JOB_COLUMNS).filter(Job.is_active == True, Job.status == JobStatus.OPEN)
+
+
+def _record(instance, columns):
+    return tuple(getattr(instance, column.key) for column in columns)
+
+
+class MatchingService:
+    @staticmethod
+    def _index():
+        """The process-wide index, (re)built when missing or older than MATCHING_INDEX_TTL."""
+        global _index
+        ttl = current_app.config['MATCHING_INDEX_TTL']
+        index = _index
+        if index is None or (ttl and time.monotonic() - index.built_at > ttl):
+            with _index_lock:
+                index = _index
+                if index is None or (ttl and time.monotonic() - index.built_at > ttl):
+                    index = _index = MatchingIndex(_volunteer_query().all(), _job_query().all())
+        MatchingService._add_new_rows(index)
+        return index
+
+    @staticmethod
+    def _add_new_rows(index):
+        # Rows created since the build (by any worker) have higher ids: one indexed query picks them up.
+        # Read-modify-write of the high-water marks, so under the lock like the rebuild
+        with _index_lock:
+            for row in _volunteer_query().filter(Volunteer.id > index.max_volunteer_id):
+                index.volunteers.upsert(row[0], index.volunteer_row(row[1:]))
+                index.max_volunteer_id = max(index.max_volunteer_id, row[0])
+            for row in _job_query().filter(Job.id > index.max_job_id):
+                index.jobs.upsert(row[0], index.job_row(row[1:]))
+                index.max_job_id = max(index.max_job_id, row[0])
+
+    @staticmethod
+    def volunteer_changed(volunteer):
+        """Re-vectorize one volunteer after its profile was committed."""
+        index = _index
+        if index is not None:
+            index.volunteers.upsert(volunteer.id, index.volunteer_row(_record(volunteer, VOLUNTEER_COLUMNS)))
+
+    @staticmethod
+    def job_changed(job):
+        """Re-vectorize one job after it was committed; closed or inactive jobs leave the index."""
+        index = _index
+        if index is None:
+            return
+        if job.is_active and job.status == JobStatus.OPEN:
+            index.jobs.upsert(job.id, index.job_row(_record(job, JOB_COLUMNS)))
+        else:
+            index.jobs.remove(job.id)
+
+    @staticmethod
+    def _matched_terms(index, volunteer, job):
+        """Terms the two profiles share, rarest first."""
+        shared = volunteer_vectorizer.facet_terms(_record(volunteer, VOLUNTEER_COLUMNS)) \
+            & job_vectorizer.facet_terms(_record(job, JOB_COLUMNS))
+        shared = sorted(shared, key=lambda item: (-index.idf[feature(*item)], item))
+        return [term.replace('_', ' ') for _, term in shared[:MATCHED_TERMS]]
+
+    @staticmethod
+    def recommended_volunteers(job_id, limit=20):
+        """Volunteers whose profile best fits the job's requirements, as (volunteer, score, matched terms)."""
+        job = Job.query.get_or_404(job_id)
+        index = MatchingService._index()
+        applied = {volunteer_id for volunteer_id, in
+                   db.session.query(JobApplication.volunteer_id).filter(JobApplication.job_id == job_id)}
+        scored = index.volunteers.top(index.job_row(_record(job, JOB_COLUMNS)), limit, exclude=applied)
+        if not scored:
+            return []
+        volunteers = {volunteer.id: volunteer for volunteer in Volunteer.query.options(
+            joinedload(Volunteer.user),
+            selectinload(Volunteer.applications).load_only(JobApplication.job_id, JobApplication.status),
+        ).filter(Volunteer.id.in_([volunteer_id for volunteer_id, _ in scored]))}
+        return [(volunteer, score, MatchingService._matched_terms(index, volunteer, job))
+                for volunteer, score in ((volunteers.get(volunteer_id), score) for volunteer_id, score in scored)
+                if volunteer is not None]
+
+    @staticmethod
+    def recommended_jobs(volunteer_id, limit=20):
+        """Open jobs the volunteer has not applied to, best fit first, as (job, score, matched terms)."""
+        volunteer = db.session.get(Volunteer, volunteer_id) if volunteer_id is not None else None
+        if volunteer is None:
+            abort(404)
+        index = MatchingService._index()
+        applied = {job_id for job_id, in
+                   db.session.query(JobApplication.job_id).filter(JobApplication.volunteer_id == volunteer_id)}
+        scored = index.jobs.top(index.volunteer_row(_record(volunteer, VOLUNTEER_COLUMNS)),
+                                limit * OVERFETCH, exclude=applied)
+        if not scored:
+            return []
+        # The index can lag a job closed by another worker: only return jobs that are open right now
+        jobs = {job.id: job for job in Job.query.filter(
+            Job.id.in_([job_id for job_id, _ in scored]), Job.is_active == True, Job.status == JobStatus.OPEN)}
+        return [(jobs[job_id], score, MatchingService._matched_terms(index, volunteer, jobs[job_id]))
+                for job_id, score in scored if job_id in jobs][:limit]
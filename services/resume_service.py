@@ -0,0 +1,225 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import func, null
+from werkzeug.utils import secure_filename
+
+from db import db
+from models import Job, JobApplication, Resume, Volunteer
+from utils.blob_store import BlobStore
+from utils.fts import RESUMES_FTS, fts_supported, like_filter, ranked_match, search_columns
+from utils.text_extraction import ExtractionError, extract
+
+logger = logging.getLogger(__name__)
+
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+
+def _extraction_executor(workers):
+    global _extraction_pool
+    if _extraction_pool is None:
+        with _extraction_pool_lock:
+            if _extraction_pool is None:
+                # Spawned, not forked: a fork would copy the request thread's open database connection and
+                # whatever locks other threads held, and the pool's callbacks run on a thread of this process
+                _extraction_pool = ProcessPoolExecutor(max_workers=workers,
+                                                       mp_context=multiprocessing.get_context('spawn'))
+    return _extraction_pool
+
+
+class _ZipOutput:
+    """Write-only, unseekable file for ZipFile that hands written bytes over in chunks."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def write(self, data):
+        self._buffer += data
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class ResumeService:
+    @staticmethod
+    def blob_store():
+        return BlobStore(os.path.join(current_app.config['UPLOAD_FOLDER'], current_app.config['RESUMES_FOLDER']))
+
+    @staticmethod
+    def resume_path(resume):
+        return ResumeService.blob_store().path(resume.file_path)
+
+    @staticmethod
+    def store_upload(resume_file, extension):
+        """Stream an uploaded file into the blob store; returns (file_path, content_hash)."""
+        file_path, content_hash, _ = ResumeService.blob_store().save(resume_file.stream, extension)
+        return file_path, content_hash
+
+    @staticmethod
+    def reference_counts():
+        """{file_path: number of resumes pointing at it}."""
+        return dict(db.session.query(Resume.file_path, func.count(Resume.id)).group_by(Resume.file_path).all())
+
+    @staticmethod
+    def prune_blobs(grace_seconds=None):
+        """Delete stored files no resume references any more; returns their paths."""
+        if grace_seconds is None:
+            grace_seconds = current_app.config['RESUME_BLOB_GRACE_SECONDS']
+        return ResumeService.blob_store().prune(set(ResumeService.reference_counts()), grace_seconds)
+
+    @staticmethod
+    def schedule_extraction(resume):
+        """Extract the text of a just-committed resume in the background.
+
+        The work runs in a process pool and its result is written by a pool
+        callback, so the upload request returns without waiting. With
+        RESUME_EXTRACTION_WORKERS = 0 nothing is scheduled and the row stays
+        'pending' for `flask extract-resumes`, which also picks up rows whose
+        worker process died before finishing.
+        """
+        workers = current_app.config['RESUME_EXTRACTION_WORKERS']
+        if workers <= 0:
+            return
+        app = current_app._get_current_object()
+        resume_id = resume.id
+        future = _extraction_executor(workers).submit(extract, ResumeService.resume_path(resume))
+
+        def store(done):
+            with app.app_context():
+                ResumeService._store_result(resume_id, done)
+
+        future.add_done_callback(store)
+
+    @staticmethod
+    def _store_result(resume_id, future):
+        try:
+            text, content_hash = future.result()
+        except ExtractionError as e:
+            values = {'extraction_status': 'failed', 'extraction_error': str(e)[:255]}
+        except Exception as e:  # A crashed pool process or a parser bug: keep the row retryable by the CLI
+            logger.exception('Resume %s: text extraction failed', resume_id)
+            values = {'extraction_status': 'failed', 'extraction_error': f'{type(e).__name__}: {e}'[:255]}
+        else:
+            values = {'extraction_status': 'done' if text else 'empty', 'extracted_text': text or None,
+                      'content_hash': content_hash, 'extraction_error': None}
+        values['extracted_at'] = datetime.utcnow()
+        try:
+            Resume.query.filter_by(id=resume_id).update(values, synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception('Resume %s: could not store extracted text', resume_id)
+
+    @staticmethod
+    def extract_pending(statuses=('pending',), batch_size=50):
+        """Extract every resume in ``statuses``, a batch at a time through the pool. Returns the count."""
+        workers = max(current_app.config['RESUME_EXTRACTION_WORKERS'], 1)
+        processed, last_id = 0, 0
+        while True:
+            resumes = Resume.query.filter(Resume.extraction_status.in_(statuses), Resume.id > last_id) \
+                .order_by(Resume.id).limit(batch_size).all()
+            if not resumes:
+                return processed
+            last_id = resumes[-1].id
+            pool = _extraction_executor(workers)
+            futures = [(resume.id, pool.submit(extract, ResumeService.resume_path(resume))) for resume in resumes]
+            for resume_id, future in futures:
+                ResumeService._store_result(resume_id, future)
+            processed += len(futures)
+
+    @staticmethod
+    def run_worker(poll_interval=None, once=False, statuses=('pending',)):
+        """Extract pending resumes until stopped (or, with ``once``, until none is left)."""
+        if poll_interval is None:
+            poll_interval = current_app.config['RESUME_EXTRACTION_POLL_SECONDS']
+        while True:
+            processed = ResumeService.extract_pending(statuses)
+            statuses = ('pending',)  # Failed rows are retried on the first pass only
+            db.session.remove()
+            if once and not processed:
+                return
+            if not processed:
+                time.sleep(poll_interval)
+
+    @staticmethod
+    def search_job_resumes(job_id, query, limit=20, offset=0):
+        """Applications to ``job_id`` whose resume text matches ``query``, as (application, volunteer, rank, snippet)."""
+        connection = db.session.connection()
+        results = db.session.query(JobApplication, Volunteer).select_from(Resume) \
+            .join(Resume.application) \
+            .join(JobApplication.volunteer) \
+            .filter(JobApplication.job_id == job_id)
+        if fts_supported(connection):
+            # Scoped to one job, so every match is ranked: the newest-N window would drop this job's older rows
+            results = ranked_match(results.add_columns(*search_columns(RESUMES_FTS, highlight=False)),
+                                   RESUMES_FTS, Resume.id, query, connection, window=0)
+        else:
+            results = results.add_columns(null(), null(), null()) \
+                .filter(like_filter([Resume.extracted_text], query)) \
+                .order_by(Resume.id)
+        return [(application, volunteer, rank, snippet)
+                for application, volunteer, rank, _, snippet in results.limit(limit).offset(offset)]
+
+    @staticmethod
+    def get_application_resume(job_id, volunteer_id, commander_id):
+        """The resume a volunteer attached to their application for one of the commander's jobs, or None."""
+        return Resume.query.join(Resume.application).join(JobApplication.job).filter(
+            JobApplication.job_id == job_id,
+            JobApplication.volunteer_id == volunteer_id,
+            Job.commander_id == commander_id
+        ).first()
+
+    @staticmethod
+    def job_resume_files(job_id, commander_id):
+        """(archive name, absolute path) of every resume of a job the commander owns, in one query."""
+        rows = db.session.query(Resume, Volunteer.full_name).join(Resume.application) \
+            .join(JobApplication.job).join(JobApplication.volunteer) \
+            .filter(JobApplication.job_id == job_id, Job.commander_id == commander_id) \
+            .order_by(Resume.id).all()
+        files = []
+        for resume, full_name in rows:
+            extension = resume.file_path.rsplit('.', 1)[-1] if '.' in resume.file_path else 'bin'
+            name = secure_filename(full_name) or 'volunteer'
+            files.append((f'{name}_{resume.application_id}.{extension}', ResumeService.resume_path(resume)))
+        return files
+
+    @staticmethod
+    def stream_zip(files, chunk_size=64 * 1024):
+        """Yield a ZIP of ``files`` ((archive name, path) pairs) as it is written.
+
+        Entries are stored uncompressed (pdf and docx are compressed already)
+        and each file is copied a chunk at a time, so memory stays flat no
+        matter how many resumes a job has. Missing files are skipped.
+        """
+        output = _ZipOutput()
+        with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, path in files:
+                try:
+                    source = open(path, 'rb')
+                except FileNotFoundError:
+                    logger.warning('Resume file missing from the store: %s', path)
+                    continue
+                with source, archive.open(name, 'w', force_zip64=True) as entry:
+                    for chunk in iter(lambda: source.read(chunk_size), b''):
+                        entry.write(chunk)
+                        yield output.drain()
+                yield output.drain()
+        yield output.drain()
+
+    @staticmethod
+    def job_owned_by(job_id, commander_id):
+        return db.session.query(Job.query.filter_by(id=job_id, commander_id=commander_id).exists()).scalar()
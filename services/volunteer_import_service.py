@@ -0,0 +1,195 @@
+import codecs
+import csv
+import io
+import json
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from random import randint
+
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import BadRequest
+
+from db import db
+from models import User, Volunteer
+from utils.passwords import configured_method, hash_password
+
+REQUIRED_FIELDS = ('email', 'full_name', 'national_id')
+IMPORT_FORMATS = ('csv', 'jsonl')
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+
+def _hash_executor(workers):
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                # Spawned rather than forked from a request thread, like the resume extraction pool
+                _hash_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    return _hash_pool
+
+
+def _hash_passwords(passwords):
+    method = configured_method()
+    workers = current_app.config['BULK_IMPORT_HASH_WORKERS']
+    if workers <= 0 or len(passwords) < 2:
+        return [hash_password(password, method) for password in passwords]
+    return list(_hash_executor(workers).map(hash_password, passwords, [method] * len(passwords), chunksize=16))
+
+
+def _clean(record):
+    return {key.strip(): value.strip() if isinstance(value, str) else value
+            for key, value in record.items() if key}
+
+
+def _csv_records(stream):
+    reader = csv.DictReader(codecs.getreader('utf-8-sig')(stream))
+    for number, record in enumerate(reader, start=1):
+        yield number, _clean(record), None
+
+
+def _jsonl_records(stream):
+    number = 0
+    for line in io.TextIOWrapper(stream, encoding='utf-8-sig'):
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, {}, f'Invalid JSON: {e}'
+            continue
+        if not isinstance(record, dict):
+            yield number, {}, 'Each line must be a JSON object'
+            continue
+        yield number, _clean(record), None
+
+
+class VolunteerImportService:
+    @staticmethod
+    def detect_format(requested, content_type, filename=None):
+        if requested:
+            import_format = requested.lower()
+        elif filename and '.' in filename:
+            import_format = filename.rsplit('.', 1)[1].lower()
+        elif 'csv' in (content_type or ''):
+            import_format = 'csv'
+        else:
+            import_format = 'jsonl'
+        if import_format in ('ndjson', 'json'):
+            import_format = 'jsonl'
+        if import_format not in IMPORT_FORMATS:
+            raise BadRequest(f'Unsupported import format: {import_format}')
+        return import_format
+
+    @staticmethod
+    def import_volunteers(stream, import_format):
+        """Create volunteers from a CSV or JSON Lines stream, one transaction per batch.
+
+        Rows are read lazily and handled BULK_IMPORT_BATCH_SIZE at a time:
+        existing emails/national ids are looked up with one IN query each,
+        passwords (the national id, as in HRService.create_volunteer) are
+        hashed in a process pool, and users and volunteers are inserted with
+        one executemany each. Returns (created, errors) where errors is a list
+        of {'row', 'email', 'error'} with 1-based record numbers.
+        """
+        records = _csv_records(stream) if import_format == 'csv' else _jsonl_records(stream)
+        batch_size = current_app.config['BULK_IMPORT_BATCH_SIZE']
+        seen_emails, seen_national_ids = set(), set()
+        created, errors = 0, []
+
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+
+            valid = []
+            for number, record, error in batch:
+                email = record.get('email')
+                if not error:
+                    missing = [field for field in REQUIRED_FIELDS if not record.get(field)]
+                    if missing:
+                        error = f"Missing required fields: {', '.join(missing)}"
+                    elif email in seen_emails:
+                        error = f'Duplicate email {email} in file'
+                    elif str(record['national_id']) in seen_national_ids:
+                        error = f"Duplicate national_id {record['national_id']} in file"
+                if error:
+                    errors.append({'row': number, 'email': email, 'error': error})
+                    continue
+                record['national_id'] = str(record['national_id'])
+                seen_emails.add(email)
+                seen_national_ids.add(record['national_id'])
+                valid.append((number, record))
+
+            batch_created, batch_errors = VolunteerImportService._insert_batch(valid)
+            created += batch_created
+            errors.extend(batch_errors)
+
+        errors.sort(key=lambda error: error['row'])
+        return created, errors
+
+    @staticmethod
+    def _existing(records):
+        emails = {record['email'] for _, record in records}
+        national_ids = {record['national_id'] for _, record in records}
+        existing_emails = {email for email, in db.session.query(User.email).filter(User.email.in_(emails))}
+        existing_national_ids = {national_id for national_id, in
+                                 db.session.query(Volunteer.national_id).filter(Volunteer.national_id.in_(national_ids))}
+        return existing_emails, existing_national_ids
+
+    @staticmethod
+    def _insert_batch(records, retry=True):
+        if not records:
+            return 0, []
+
+        errors = []
+        existing_emails, existing_national_ids = VolunteerImportService._existing(records)
+        new_records = []
+        for number, record in records:
+            if record['email'] in existing_emails:
+                errors.append({'row': number, 'email': record['email'],
+                               'error': f"User with email {record['email']} already exists"})
+            elif record['national_id'] in existing_national_ids:
+                errors.append({'row': number, 'email': record['email'],
+                               'error': f"Volunteer with national_id {record['national_id']} already exists"})
+            else:
+                new_records.append((number, record))
+        if not new_records:
+            return 0, errors
+
+        password_hashes = _hash_passwords([record['national_id'] for _, record in new_records])
+        user_rows = [{
+            'email': record['email'],
+            'password_hash': password_hash,
+            'role': 'volunteer',
+            'phone': record.get('phone') or None,
+            'full_name': record['full_name'],
+            'image_url': f"https://mighty.tools/mockmind-api/content/human/{randint(1, 130)}.jpg",
+        } for (_, record), password_hash in zip(new_records, password_hashes)]
+
+        try:
+            user_ids = {email: user_id for user_id, email in db.session.execute(
+                insert(User).returning(User.id, User.email), user_rows)}
+            db.session.execute(insert(Volunteer), [{
+                'user_id': user_ids[record['email']],
+                'full_name': record['full_name'],
+                'national_id': record['national_id'],
+            } for _, record in new_records])
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if retry:
+                # Rows created concurrently since the pre-check: check again and skip them
+                created, retry_errors = VolunteerImportService._insert_batch(new_records, retry=False)
+                return created, errors + retry_errors
+            errors.extend({'row': number, 'email': record['email'], 'error': f'Database error: {e.orig}'}
+                          for number, record in new_records)
+            return 0, errors
+
+        return len(new_records), errors
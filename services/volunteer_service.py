@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 
 from werkzeug.utils import secure_filename
@@ -7,69 +8,167 @@ from db import db
 import os
 from models.volunteer import Volunteer
 from models import Volunteer, Resume
-from werkzeug.exceptions import BadRequest
+from werkzeug.exceptions import BadRequest, NotFound
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import null
+from sqlalchemy.orm import selectinload
+from models import Job, JobQuestion
+from models.application import ApplicationStatus
+from services.job_stats_service import JobStatsService
+from services.matching_service import MatchingService
+from services.resume_service import ResumeService
+from utils.filters import apply_job_filters
+from utils.pagination import PageRequest, keyset_paginate
+from utils.identity import invalidate_identity
+from utils.response_cache import interview_feed_cache
+from utils.fts import JOBS_FTS, fts_supported, like_filter, ranked_page, search_columns
+
+
+RESUME_EXTENSIONS = ('pdf', 'doc', 'docx', 'txt')
+
+
+def is_duplicate_application(error):
+    """Whether an IntegrityError comes from the one-application-per-job rule."""
+    message = str(error.orig)
+    return 'uq_job_applications_job_volunteer' in message or \
+        'job_applications.job_id, job_applications.volunteer_id' in message
 
 
 class VolunteerService:
 
     @staticmethod
-    def apply_for_job(volunteer_id, job_id, data):
-        existing_application = JobApplication.query.filter_by(
-            volunteer_id=volunteer_id, job_id=job_id).first()
-        if existing_application:
-            raise BadRequest("You have already applied for this job")
+    def get_available_jobs(filters=None, page=None):
+        query = Job.query.filter_by(is_active=True).options(selectinload(Job.questions))
+        query = apply_job_filters(query, filters)
+        return keyset_paginate(query, page or PageRequest(), (Job.id,))
 
-        application = JobApplication(
-            volunteer_id=volunteer_id,
-            job_id=job_id,
-            **data  # Unpack data dictionary into keyword arguments
-        )
+    @staticmethod
+    def search_jobs(query, limit=20, offset=0, filters=None):
+        """Active jobs matching ``query`` as (job, rank, highlighted title, snippet), best first.
+
+        Uses the jobs_fts index (BM25, title and skills weighted highest) on
+        SQLite and a LIKE scan without ranking or highlighting elsewhere.
+        Queries matching more than SEARCH_RANK_WINDOW jobs rank only the
+        newest that many matches, unless the filters leave too few of them
+        to fill the page.
+        """
+        connection = db.session.connection()
+        if fts_supported(connection):
+            results = apply_job_filters(
+                db.session.query(Job, *search_columns(JOBS_FTS)).filter(Job.is_active == True), filters)
+            return ranked_page(results, JOBS_FTS, Job.id, query, connection,
+                               current_app.config['SEARCH_RANK_WINDOW'], limit, offset)
+        columns = [getattr(Job, name) for name in JOBS_FTS.columns]
+        results = db.session.query(Job, null(), null(), null()) \
+            .filter(like_filter(columns, query), Job.is_active == True) \
+            .order_by(Job.id)
+        return apply_job_filters(results, filters).limit(limit).offset(offset).all()
+
+    @staticmethod
+    def parse_answers(raw):
+        """[(question_id, answer text)] from a JSON list of {question_id, text} or a {question_id: text} object."""
+        if raw is None or raw == '':
+            return []
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except ValueError:
+                raise BadRequest("Invalid answers: must be JSON")
+        if isinstance(raw, dict):
+            raw = [{'question_id': question_id, 'text': text} for question_id, text in raw.items()]
+        if not isinstance(raw, list):
+            raise BadRequest("Invalid answers: must be a list or an object")
+        answers = []
+        for answer in raw:
+            try:
+                answers.append((int(answer['question_id']), answer.get('text', answer.get('answer_text'))))
+            except (KeyError, TypeError, ValueError, AttributeError):
+                raise BadRequest("Invalid answers: each answer needs an integer question_id")
+        return answers
+
+    @staticmethod
+    def apply_for_job(volunteer_id, job_id, answers=(), resume_file=None):
+        """Create the application, its answers and its resume with a single commit.
+
+        The resume is streamed into the blob store before the transaction
+        starts, so no write lock is held during the upload; if the insert then
+        fails the blob is simply left unreferenced for `flask prune-resumes`.
+        """
+        job = db.session.get(Job, job_id)
+        if job is None or not job.is_active:
+            raise NotFound("Job not found")
+
+        question_ids = {question_id for question_id, in
+                        db.session.query(JobQuestion.id).filter(JobQuestion.job_id == job_id)}
+        answered = [question_id for question_id, _ in answers]
+        unknown = set(answered) - question_ids
+        if unknown:
+            raise BadRequest(f"Unknown question ids for this job: {', '.join(map(str, sorted(unknown)))}")
+        if len(answered) != len(set(answered)):
+            raise BadRequest("Each question can only be answered once")
+
+        extension = VolunteerService._resume_extension(resume_file) if resume_file else None
+        stored_resume = ResumeService.store_upload(resume_file, extension) if resume_file else None
+
+        application = JobApplication(volunteer_id=volunteer_id, job_id=job_id, status=ApplicationStatus.PENDING)
+        application.answers = [ApplicationAnswer(question_id=question_id, answer_text=text)
+                               for question_id, text in answers]
+        if stored_resume:
+            application.resume = VolunteerService._new_resume(resume_file, extension, *stored_resume)
         db.session.add(application)
+        try:
+            # UNIQUE(job_id, volunteer_id) rejects duplicates atomically,
+            # unlike a separate existence check before the insert
+            db.session.flush()
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_duplicate_application(e):
+                raise BadRequest("You have already applied for this job")
+            raise
+        JobStatsService.application_added(job_id, ApplicationStatus.PENDING)
         db.session.commit()
+        if application.resume:
+            ResumeService.schedule_extraction(application.resume)
         return application
 
-    # @staticmethod
-    # def apply_for_job(volunteer_id, job_id, data):
-    #     application = JobApplication(
-    #         volunteer_id=volunteer_id,
-    #         job_id=job_id
-    #     )
-    #     db.session.add(application)
-
-        # # Add answers
-        # for answer in data.get('answers', []):
-        #     app_answer = ApplicationAnswer(
-        #         application=application,
-        #         question_id=answer['question_id'],
-        #         answer_text=answer['text']
-        #     )
-        #     db.session.add(app_answer)
-
-        # db.session.commit()
-        # return application
-
     @staticmethod
     def delete_application(volunteer_id, job_id):
         application = JobApplication.query.filter_by(
             volunteer_id=volunteer_id, job_id=job_id).first()
         if not application:
             return None
-        Interview.query.filter_by(application_id=application.id).delete()
+        interviews = Interview.query.filter_by(application_id=application.id).delete()
+        ApplicationAnswer.query.filter_by(application_id=application.id).delete()
         db.session.delete(application)
+        JobStatsService.application_removed(job_id, application.status)
         db.session.commit()
+        if interviews:
+            interview_feed_cache.invalidate()
         return application
 
     @staticmethod
-    def upload_resume(volunteer_id, job_id, resume_file):
-        allowed_file_extensions = {'pdf', 'doc', 'docx', 'txt'}
+    def _resume_extension(resume_file):
         filename_parts = resume_file.filename.rsplit('.', 1)
         if len(filename_parts) == 1:
             raise BadRequest("Filename has no extension")
 
         file_extension = filename_parts[1].lower()
 
-        if file_extension not in allowed_file_extensions:
-            raise BadRequest("Invalid file format. Allowed extensions: " + ', '.join(allowed_file_extensions))
+        if file_extension not in RESUME_EXTENSIONS:
+            raise BadRequest("Invalid file format. Allowed extensions: " + ', '.join(RESUME_EXTENSIONS))
+        return file_extension
+
+    @staticmethod
+    def _new_resume(resume_file, file_extension, file_path, content_hash):
+        return Resume(
+            file_path=file_path,  # Relative to the resume blob store
+            original_filename=secure_filename(resume_file.filename)[:255] or f'resume.{file_extension}',
+            content_hash=content_hash
+        )
+
+    @staticmethod
+    def upload_resume(volunteer_id, job_id, resume_file):
+        file_extension = VolunteerService._resume_extension(resume_file)
 
         application = JobApplication.query.filter_by(volunteer_id=volunteer_id, job_id=job_id).first()
         if not application:
@@ -79,21 +178,13 @@ class VolunteerService:
         if existing_resume:
             raise BadRequest("A resume has already been uploaded for this application")
 
-        filename = secure_filename(resume_file.filename)
-        resumes_folder = current_app.config['RESUMES_FOLDER']
-        upload_folder = current_app.config['UPLOAD_FOLDER']
-        os.makedirs(os.path.join(upload_folder, resumes_folder), exist_ok=True)
-
-        full_file_path = os.path.join(upload_folder, resumes_folder, filename)
-
-        resume_file.save(full_file_path)
-
-        resume = Resume(
-            application_id=application.id,
-            file_path=filename  # Store ONLY the filename in the database
-        )
+        # Stored by content hash: identical files share one blob, equal names never collide
+        resume = VolunteerService._new_resume(resume_file, file_extension,
+                                              *ResumeService.store_upload(resume_file, file_extension))
+        resume.application_id = application.id
         db.session.add(resume)
         db.session.commit()
+        ResumeService.schedule_extraction(resume)
         return resume
 
 
@@ -147,6 +238,10 @@ class VolunteerService:
             setattr(user, key, value)
 
         db.session.commit()
+        invalidate_identity(volunteer.user_id)
+        if 'full_name' in volunteer_data:
+            interview_feed_cache.invalidate()  # Interview feeds show the candidate's name
+        MatchingService.volunteer_changed(volunteer)
         return volunteer
 
     @staticmethod
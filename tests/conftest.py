@@ -0,0 +1,71 @@
+"""Fixtures shared by the test suite.
+
+The suite moves to a throwaway directory and points DATABASE_URL at a
+SQLite file there before ``app`` is imported (config reads both at import
+time); every test starts from an empty schema.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+from flask import g, request_started
+
+_workdir = tempfile.mkdtemp(prefix='volunteer-tests-')
+os.chdir(_workdir)
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+
+from app import app as flask_app  # noqa: E402
+from db import db  # noqa: E402
+from utils.fts import FTS_INDEXES, ensure_fts  # noqa: E402
+from utils.response_cache import interview_feed_cache, job_board_cache  # noqa: E402
+
+
+@request_started.connect_via(flask_app)
+def _fresh_request_globals(sender, **extra):
+    # Requests run inside the app context a test holds and would share its ``g``
+    # (and the per-request identity cached there); start each one clean, as a server would
+    vars(g).clear()
+
+
+@pytest.fixture
+def app():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        # Cached responses outlive the schema they were built from
+        job_board_cache.invalidate()
+        interview_feed_cache.invalidate()
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def fts(app):
+    """The FTS5 indexes, which ``create_all`` does not build (and ``drop_all`` leaves behind)."""
+    with db.engine.begin() as connection:
+        ensure_fts(connection)
+    yield
+    db.session.remove()
+    with db.engine.begin() as connection:
+        for index in FTS_INDEXES:
+            for statement in index.drop_statements():
+                connection.exec_driver_sql(statement)
+
+
+@pytest.fixture
+def uploads(app, tmp_path, monkeypatch):
+    """Keep uploaded files out of the source tree (UPLOAD_FOLDER defaults to one inside it)."""
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setitem(app.config, 'RESUMES_FOLDER', 'resumes')
+    return tmp_path
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_workdir, ignore_errors=True)
@@ -0,0 +1,68 @@
+"""Small builders for the rows most tests need; each one flushes so ids are set."""
+from datetime import date
+
+from db import db
+from models import Commander, HR, Job, JobApplication, User, Volunteer
+from models.application import ApplicationStatus
+
+PASSWORD = 'password'
+
+
+def create_user(email, role, password=PASSWORD, **fields):
+    user = User(email=email, role=role, full_name=fields.pop('full_name', email.split('@')[0]), **fields)
+    user.set_password(password)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def create_hr(email='hr@example.com'):
+    hr = HR(user_id=create_user(email, 'hr').id, department='HR')
+    db.session.add(hr)
+    db.session.flush()
+    return hr
+
+
+def create_commander(email='commander@example.com', name='Commander'):
+    commander = Commander(user_id=create_user(email, 'commander').id, name=name, department='Logistics')
+    db.session.add(commander)
+    db.session.flush()
+    return commander
+
+
+def create_volunteer(index, **fields):
+    """Volunteer number ``index``; its account has no usable password unless ``password`` is given."""
+    password = fields.pop('password', None)
+    user = User(email=f'volunteer{index}@example.com', role='volunteer', full_name=f'Volunteer {index}',
+                phone=f'05{index:08d}')
+    if password:
+        user.set_password(password)
+    else:
+        user.password_hash = 'unused'
+    db.session.add(user)
+    db.session.flush()
+    fields.setdefault('date_of_birth', date(1990, 1, 1))
+    volunteer = Volunteer(user_id=user.id, full_name=user.full_name, national_id=str(100000 + index), **fields)
+    db.session.add(volunteer)
+    db.session.flush()
+    return volunteer
+
+
+def create_job(commander, title='Driver', **fields):
+    fields.setdefault('vacant_positions', 1)
+    job = Job(commander_id=commander.id, title=title, **fields)
+    db.session.add(job)
+    db.session.flush()
+    return job
+
+
+def create_application(volunteer, job, status=ApplicationStatus.PENDING):
+    application = JobApplication(volunteer_id=volunteer.id, job_id=job.id, status=status)
+    db.session.add(application)
+    db.session.flush()
+    return application
+
+
+def auth_headers(client, email, password=PASSWORD):
+    response = client.post('/api/auth/login', json={'email': email, 'password': password})
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
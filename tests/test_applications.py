@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from db import db
+from models import ApplicationAnswer, Job, JobApplication, JobQuestion, Resume
+from tests.factories import PASSWORD, auth_headers, create_commander, create_job, create_volunteer
+
+
+@pytest.fixture
+def job_id(app):
+    job = create_job(create_commander())
+    create_volunteer(0, password=PASSWORD)
+    db.session.commit()
+    return job.id
+
+
+def test_second_application_to_the_same_job_is_rejected(client, job_id):
+    headers = auth_headers(client, 'volunteer0@example.com')
+    assert client.post(f'/api/volunteer/jobs/{job_id}/apply', json={}, headers=headers).status_code == 201
+
+    response = client.post(f'/api/volunteer/jobs/{job_id}/apply', json={}, headers=headers)
+    assert response.status_code == 400
+    assert 'already applied' in response.get_json()['message']
+    assert JobApplication.query.filter_by(job_id=job_id).count() == 1
+
+
+def test_unique_index_rejects_a_duplicate_that_skips_the_service(job_id):
+    # What a concurrent request racing past any existence check would hit
+    db.session.add(JobApplication(job_id=job_id, volunteer_id=1))
+    db.session.commit()
+    db.session.add(JobApplication(job_id=job_id, volunteer_id=1))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+
+@pytest.fixture
+def question_id(job_id):
+    question = JobQuestion(job_id=job_id, question_text='Driving licence?', answer_text='')
+    db.session.add(question)
+    db.session.commit()
+    return question.id
+
+
+def apply_with_resume(client, job_id, answers):
+    return client.post(f'/api/volunteer/jobs/{job_id}/apply',
+                       data={'answers': json.dumps(answers), 'resume': (io.BytesIO(b'Driver'), 'cv.txt')},
+                       headers=auth_headers(client, 'volunteer0@example.com'))
+
+
+def test_application_answers_and_resume_are_created_together(app, client, uploads, job_id, question_id,
+                                                             monkeypatch):
+    monkeypatch.setitem(app.config, 'RESUME_EXTRACTION_WORKERS', 0)
+    response = apply_with_resume(client, job_id, [{'question_id': question_id, 'text': 'Yes'}])
+
+    assert response.status_code == 201
+    application = db.session.get(JobApplication, response.get_json()['application_id'])
+    assert [(answer.question_id, answer.answer_text) for answer in application.answers] == [(question_id, 'Yes')]
+    assert application.resume.id == response.get_json()['resume_id']
+    assert application.resume.original_filename == 'cv.txt'
+
+
+def test_unknown_question_id_leaves_nothing_behind(client, uploads, job_id, question_id):
+    response = apply_with_resume(client, job_id, [{'question_id': question_id, 'text': 'Yes'},
+                                                  {'question_id': question_id + 1, 'text': 'Hm'}])
+
+    assert response.status_code == 400
+    assert f'Unknown question ids for this job: {question_id + 1}' in response.get_json()['message']
+    assert JobApplication.query.count() == ApplicationAnswer.query.count() == Resume.query.count() == 0
+    assert not (uploads / 'resumes').exists()
+
+
+def test_applying_to_a_missing_or_inactive_job_is_not_found(client, job_id):
+    headers = auth_headers(client, 'volunteer0@example.com')
+    assert client.post(f'/api/volunteer/jobs/{job_id + 1}/apply', json={}, headers=headers).status_code == 404
+
+    db.session.get(Job, job_id).is_active = False
+    db.session.commit()
+    response = client.post(f'/api/volunteer/jobs/{job_id}/apply', json={}, headers=headers)
+    assert response.status_code == 404
+    assert response.get_json()['message'] == 'Job not found'
+    assert JobApplication.query.count() == 0
@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+from werkzeug.exceptions import HTTPException
+
+from db import db
+from models import Job, JobApplication
+from models.application import ApplicationStatus
+from models.job import JobStatus
+from services.hr_service import HRService
+from tests.factories import create_application, create_commander, create_job, create_volunteer
+
+THREADS = 8
+POSITIONS = 3
+
+
+@pytest.fixture
+def commander(app):
+    commander = create_commander()
+    db.session.commit()
+    return commander
+
+
+def hired(job_id):
+    return JobApplication.query.filter_by(job_id=job_id, status=ApplicationStatus.HIRED).count()
+
+
+def test_concurrent_assignments_never_overfill_a_job(app, commander):
+    job = create_job(commander, vacant_positions=POSITIONS)
+    volunteers = [create_volunteer(index) for index in range(THREADS)]
+    for volunteer in volunteers:
+        create_application(volunteer, job, ApplicationStatus.PREFERRED_FINAL)
+    db.session.commit()
+    job_id, volunteer_ids = job.id, [volunteer.id for volunteer in volunteers]
+    db.session.remove()
+
+    barrier = threading.Barrier(THREADS)
+    outcomes = []
+
+    def assign(volunteer_id):
+        # Each thread gets its own app context, and with it its own session and connection
+        with app.app_context():
+            barrier.wait()
+            try:
+                HRService.assign_volunteer_to_job(volunteer_id, job_id)
+                outcomes.append('assigned')
+            except HTTPException as e:
+                outcomes.append(e.description)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=assign, args=(volunteer_id,)) for volunteer_id in volunteer_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count('assigned') == POSITIONS
+    assert outcomes.count('No vacant positions available') == THREADS - POSITIONS
+    job = db.session.get(Job, job_id)
+    assert (job.vacant_positions, job.status) == (0, JobStatus.CLOSED)
+    assert hired(job_id) == POSITIONS
+    assert JobApplication.query.filter_by(job_id=job_id, status=ApplicationStatus.PREFERRED_FINAL).count() \
+        == THREADS - POSITIONS
+
+
+def test_batch_assigns_what_it_can(commander):
+    job = create_job(commander, vacant_positions=2)
+    ready, pending = create_volunteer(1), create_volunteer(2)
+    create_application(ready, job, ApplicationStatus.PREFERRED_FINAL)
+    create_application(pending, job)
+    db.session.commit()
+
+    results = HRService.assign_volunteers([(ready.id, job.id), (pending.id, job.id)])
+    assert [result['assigned'] for result in results] == [True, False]
+    assert results[1]['error'] == 'Application must be accepted by commander first'
+    assert hired(job.id) == 1
+    assert db.session.get(Job, job.id).vacant_positions == 1
+
+
+def test_atomic_batch_rolls_back_when_one_pair_fails(commander):
+    job = create_job(commander, vacant_positions=2)
+    first, second = create_volunteer(1), create_volunteer(2)
+    create_application(first, job, ApplicationStatus.PREFERRED_FINAL)
+    create_application(second, job, ApplicationStatus.PREFERRED_FINAL)
+    db.session.commit()
+
+    results = HRService.assign_volunteers([(first.id, job.id), (second.id, job.id), (999, job.id)], atomic=True)
+    assert [result['assigned'] for result in results] == [False, False, False]
+    assert [result['error'] for result in results] == ['Batch rolled back', 'Batch rolled back',
+                                                       'Application Not Found!']
+    db.session.expire_all()
+    assert hired(job.id) == 0
+    job = db.session.get(Job, job.id)
+    assert (job.vacant_positions, job.status) == (2, JobStatus.OPEN)
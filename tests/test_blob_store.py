@@ -0,0 +1,52 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from utils.blob_store import BlobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(str(tmp_path / 'blobs'))
+
+
+def test_same_content_is_stored_once(store):
+    first = store.save(io.BytesIO(b'resume'), 'PDF')
+    second = store.save(io.BytesIO(b'resume'), 'pdf')
+    other = store.save(io.BytesIO(b'another resume'), 'pdf')
+
+    digest = hashlib.sha256(b'resume').hexdigest()
+    assert first == second == (os.path.join(digest[:2], digest[2:4], f'{digest}.pdf'), digest, 6)
+    assert other[0] != first[0]
+    assert sorted(store.stored()) == sorted([first[0], other[0]])
+    with open(store.path(first[0]), 'rb') as file:
+        assert file.read() == b'resume'
+    assert os.listdir(os.path.join(store.root, 'tmp')) == []
+
+
+def test_paths_outside_the_store_are_rejected(store):
+    with pytest.raises(ValueError):
+        store.path(os.path.join('..', 'secret.txt'))
+
+
+def test_prune_keeps_referenced_and_recent_blobs(store):
+    kept, _, _ = store.save(io.BytesIO(b'kept'), 'txt')
+    recent, _, _ = store.save(io.BytesIO(b'recent'), 'txt')
+    orphan, _, _ = store.save(io.BytesIO(b'orphan'), 'txt')
+    old = os.path.getmtime(store.path(orphan)) - 7200
+    for relative_path in (kept, orphan):
+        os.utime(store.path(relative_path), (old, old))
+
+    assert store.prune({kept}, grace_seconds=3600) == [orphan]
+    assert sorted(store.stored()) == sorted([kept, recent])
+
+
+def test_saving_again_renews_the_grace_period(store):
+    relative_path, _, _ = store.save(io.BytesIO(b'resume'), 'txt')
+    old = os.path.getmtime(store.path(relative_path)) - 7200
+    os.utime(store.path(relative_path), (old, old))
+
+    store.save(io.BytesIO(b'resume'), 'txt')
+    assert store.prune(set(), grace_seconds=3600) == []
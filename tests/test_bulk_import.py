@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+import services.volunteer_import_service as volunteer_import_service
+from db import db
+from models import User, Volunteer
+from tests.factories import auth_headers, create_hr, create_volunteer
+
+
+@pytest.fixture
+def headers(app, client, monkeypatch):
+    # Hash in-process: a pool is pointless for a handful of rows
+    monkeypatch.setitem(app.config, 'BULK_IMPORT_HASH_WORKERS', 0)
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+    create_hr()
+    create_volunteer(0)
+    db.session.commit()
+    return auth_headers(client, 'hr@example.com')
+
+
+def test_csv_import_creates_valid_rows_and_reports_the_rest(app, client, headers, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_IMPORT_BATCH_SIZE', 2)
+    body = ('email,full_name,national_id\n'
+            'a@example.com,Alice,200001\n'
+            'b@example.com,,200002\n'
+            'a@example.com,Alice Again,200003\n'
+            'volunteer0@example.com,Taken,200004\n'
+            'c@example.com,Carol,100000\n'
+            'd@example.com,Dana,200005\n')
+    response = client.post('/api/hr/volunteers/bulk', data=body, content_type='text/csv', headers=headers)
+
+    assert response.status_code == 201
+    data = response.get_json()
+    assert (data['created'], data['failed']) == (2, 4)
+    assert [(error['row'], error['error']) for error in data['errors']] == [
+        (2, 'Missing required fields: full_name'),
+        (3, 'Duplicate email a@example.com in file'),
+        (4, 'User with email volunteer0@example.com already exists'),
+        (5, 'Volunteer with national_id 100000 already exists'),
+    ]
+    assert {v.national_id for v in Volunteer.query.filter(Volunteer.national_id.like('2%'))} == {'200001', '200005'}
+    assert db.session.query(User).filter_by(email='a@example.com').one().check_password('200001')
+
+
+def test_jsonl_import_reports_bad_lines(client, headers):
+    body = '\n'.join([json.dumps({'email': 'a@example.com', 'full_name': 'Alice', 'national_id': 200001}),
+                      '{not json', '[1, 2]', ''])
+    response = client.post('/api/hr/volunteers/bulk?format=jsonl', data=body, headers=headers)
+
+    assert response.status_code == 201
+    errors = response.get_json()['errors']
+    assert [error['row'] for error in errors] == [2, 3]
+    assert errors[0]['error'].startswith('Invalid JSON')
+    assert errors[1]['error'] == 'Each line must be a JSON object'
+
+
+def test_import_with_no_valid_rows_is_a_bad_request(client, headers):
+    response = client.post('/api/hr/volunteers/bulk', data='email,full_name,national_id\n,,\n',
+                           content_type='text/csv', headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['created'] == 0
+
+
+def test_unsupported_format_is_rejected(client, headers):
+    response = client.post('/api/hr/volunteers/bulk?format=xml', data='<volunteers/>', headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unsupported import format: xml'
+
+
+def test_passwords_are_hashed_in_spawned_workers(app, client, headers, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_IMPORT_HASH_WORKERS', 1)
+    body = 'email,full_name,national_id\na@example.com,Alice,200001\nb@example.com,Bob,200002\n'
+    response = client.post('/api/hr/volunteers/bulk', data=body, content_type='text/csv', headers=headers)
+
+    assert response.get_json()['created'] == 2
+    assert volunteer_import_service._hash_pool._mp_context.get_start_method() == 'spawn'
+    assert db.session.query(User).filter_by(email='b@example.com').one().check_password('200002')
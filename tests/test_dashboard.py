@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from db import db
+from models import Interview
+from models.application import ApplicationStatus
+from tests.factories import auth_headers, create_application, create_commander, create_job, create_volunteer
+
+
+def add_interview(application, start, status='scheduled'):
+    db.session.add(Interview(application_id=application.id, commander_id=application.job.commander_id,
+                             scheduled_date=start, scheduled_end=start + timedelta(hours=1), status=status))
+
+
+@pytest.fixture
+def headers(app, client):
+    commander = create_commander()
+    other = create_commander('other@example.com', 'Other')
+    driver = create_job(commander, title='Driver', vacant_positions=1)
+    create_job(commander, title='Cook', vacant_positions=0)
+    create_job(other, title='Medic')
+
+    soon = datetime.utcnow() + timedelta(days=1)
+    volunteers = [create_volunteer(index) for index in range(4)]
+    hired = create_application(volunteers[0], driver, ApplicationStatus.HIRED)
+    pending = create_application(volunteers[1], driver)
+    preferred = create_application(volunteers[2], driver, ApplicationStatus.PREFERRED)
+    create_application(volunteers[3], driver, ApplicationStatus.REJECTED)
+    add_interview(preferred, soon + timedelta(hours=2))
+    add_interview(pending, soon)
+    add_interview(pending, soon + timedelta(days=1), status='cancelled')
+    add_interview(hired, soon - timedelta(days=3))
+    db.session.commit()
+    return auth_headers(client, 'commander@example.com')
+
+
+def test_dashboard_summarizes_the_commanders_jobs(client, headers):
+    response = client.get('/api/commander/dashboard', headers=headers)
+    assert response.status_code == 200
+    data = response.get_json()
+
+    assert data['totals'] == {'jobs': 2, 'applications': 4, 'hired': 1, 'vacantPositions': 1,
+                              'upcomingInterviews': 2, 'fillRate': 0.5}
+    driver, cook = data['jobs']
+    assert (driver['jobName'], driver['hired'], driver['fillRate'], driver['candidateCount']) == ('Driver', 1, 0.5, 4)
+    assert driver['applicationCounts'] == {'pending': 1, 'preferred': 1, 'rejected': 1, 'hired': 1,
+                                           'preferred_final': 0}
+    assert driver['upcomingInterviews'] == 2
+    assert (cook['jobName'], cook['fillRate'], cook['candidateCount']) == ('Cook', None, 0)
+    assert [(interview['candidateName'], interview['jobName']) for interview in data['upcomingInterviews']] \
+        == [('Volunteer 1', 'Driver'), ('Volunteer 2', 'Driver')]
+
+
+def test_upcoming_interviews_are_limited(client, headers):
+    response = client.get('/api/commander/dashboard?limit=1', headers=headers)
+    assert [interview['candidateName'] for interview in response.get_json()['upcomingInterviews']] \
+        == ['Volunteer 1']
+    assert client.get('/api/commander/dashboard?limit=0', headers=headers).status_code == 400
@@ -0,0 +1,30 @@
+from sqlalchemy import text
+
+from db import db
+from db_engine import database_url, engine_options, sqlite_pragmas
+
+
+def test_database_url_prefers_the_environment(monkeypatch):
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    assert database_url('sqlite:///local.db') == 'sqlite:///local.db'
+    monkeypatch.setenv('DATABASE_URL', 'postgres://user@db/volunteers')
+    assert database_url('sqlite:///local.db') == 'postgresql://user@db/volunteers'
+
+
+def test_pool_options_per_backend(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '3')
+    sqlite = engine_options('sqlite:////tmp/app.db')
+    assert sqlite['pool_size'] == 3
+    assert sqlite['connect_args']['check_same_thread'] is False
+    assert engine_options('sqlite://') == {}
+    postgres = engine_options('postgresql://db/volunteers')
+    assert postgres['pool_pre_ping'] is True and postgres['pool_size'] == 3
+
+
+def test_app_connections_get_the_sqlite_pragmas(app):
+    expected = sqlite_pragmas()
+    with db.engine.connect() as connection:
+        assert connection.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert connection.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+        assert connection.execute(text('PRAGMA busy_timeout')).scalar() == expected['busy_timeout']
+        assert connection.execute(text('PRAGMA cache_size')).scalar() == expected['cache_size']
@@ -0,0 +1,55 @@
+import csv
+import io
+
+import pytest
+from openpyxl import load_workbook
+
+from db import db
+from models.application import ApplicationStatus
+from services.commander_service import CommanderService
+from tests.factories import auth_headers, create_application, create_commander, create_job, create_volunteer
+
+STATUSES = [ApplicationStatus.PENDING, ApplicationStatus.PREFERRED, ApplicationStatus.REJECTED]
+
+
+@pytest.fixture
+def job_id(app):
+    job = create_job(create_commander())
+    for index, status in enumerate(STATUSES):
+        create_application(create_volunteer(index), job, status)
+    db.session.commit()
+    return job.id
+
+
+def test_csv_export_streams_header_and_statuses(client, job_id, monkeypatch):
+    # Two rows per chunk, so the three applications arrive in more than one chunk
+    monkeypatch.setattr(CommanderService, 'EXPORT_BATCH_SIZE', 2)
+    response = client.get(f'/api/commander/jobs/{job_id}/applications/export',
+                          headers=auth_headers(client, 'commander@example.com'))
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == f'attachment; filename=applications_job_{job_id}.csv'
+    assert response.is_streamed
+
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0] == CommanderService.EXPORT_HEADER
+    assert [(row[1], row[2], row[7]) for row in rows[1:]] == [
+        (f'Volunteer {index}', status.value, 'No interview') for index, status in enumerate(STATUSES)]
+
+
+def test_xlsx_export_holds_the_same_rows(client, job_id):
+    response = client.get(f'/api/commander/jobs/{job_id}/applications/export?format=xlsx',
+                          headers=auth_headers(client, 'commander@example.com'))
+    assert response.status_code == 200
+
+    rows = list(load_workbook(io.BytesIO(response.get_data())).active.iter_rows(values_only=True))
+    assert list(rows[0]) == CommanderService.EXPORT_HEADER
+    assert [row[2] for row in rows[1:]] == [status.value for status in STATUSES]
+
+
+def test_export_of_another_commanders_job_is_not_found(client, job_id):
+    create_commander('other@example.com')
+    db.session.commit()
+    response = client.get(f'/api/commander/jobs/{job_id}/applications/export',
+                          headers=auth_headers(client, 'other@example.com'))
+    assert response.status_code == 404
@@ -0,0 +1,67 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from db import db
+from models import Commander, HR, Job, JobApplication, User, Volunteer
+
+PASSWORD = 'password'
+
+
+def seed(volunteers, jobs=4):
+    """An HR user, one commander with ``jobs`` jobs and ``volunteers`` volunteers applying to some of them."""
+    hr_user = User(email='hr@example.com', role='hr', full_name='HR')
+    hr_user.set_password(PASSWORD)
+    commander_user = User(email='commander@example.com', role='commander', full_name='Commander')
+    commander_user.set_password(PASSWORD)
+    db.session.add_all([hr_user, commander_user])
+    db.session.flush()
+    db.session.add(HR(user_id=hr_user.id, department='HR'))
+    commander = Commander(user_id=commander_user.id, name='Commander', department='Logistics')
+    db.session.add(commander)
+    db.session.flush()
+    job_rows = [Job(commander_id=commander.id, title=f'Job {index}') for index in range(jobs)]
+    db.session.add_all(job_rows)
+    db.session.flush()
+    for index in range(volunteers):
+        user = User(email=f'volunteer{index}@example.com', role='volunteer', full_name=f'Volunteer {index}')
+        user.password_hash = 'unused'
+        db.session.add(user)
+        db.session.flush()
+        volunteer = Volunteer(user_id=user.id, full_name=f'Volunteer {index}', national_id=str(100000 + index),
+                              date_of_birth=date(1990, 1, 1))
+        db.session.add(volunteer)
+        db.session.flush()
+        for job in job_rows[:index % jobs + 1]:
+            db.session.add(JobApplication(job_id=job.id, volunteer_id=volunteer.id))
+    db.session.commit()
+
+
+def listing_statements(client, volunteers):
+    """Seed ``volunteers`` volunteers and count the SQL statements GET /api/hr/volunteers issues."""
+    db.drop_all()
+    db.create_all()
+    seed(volunteers)
+    login = client.post('/api/auth/login', json={'email': 'hr@example.com', 'password': PASSWORD})
+    headers = {'Authorization': f"Bearer {login.get_json()['access_token']}"}
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        response = client.get('/api/hr/volunteers', headers=headers)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert len(payload) == volunteers
+    assert all(volunteer['jobStatuses'] for volunteer in payload)
+    return len(statements)
+
+
+def test_volunteer_listing_query_count_does_not_grow_with_volunteers(client):
+    assert listing_statements(client, 10) == listing_statements(client, 60)
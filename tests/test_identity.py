@@ -0,0 +1,31 @@
+from db import db
+from tests.factories import (auth_headers, create_application, create_commander, create_hr, create_job,
+                             create_volunteer)
+
+
+def test_commander_sees_only_volunteers_who_applied_to_their_jobs(app, client):
+    # The HR account takes user id 1, so commander and user ids differ from here on
+    create_hr()
+    own = create_commander('own@example.com')
+    create_commander('other@example.com')
+    applicant = create_volunteer(0)
+    create_application(applicant, create_job(own))
+    db.session.commit()
+    assert own.user_id != own.id
+
+    response = client.get(f'/api/commander/volunteers/{applicant.id}', headers=auth_headers(client, 'own@example.com'))
+    assert response.status_code == 200
+    assert response.get_json()['fullName'] == 'Volunteer 0'
+
+    response = client.get(f'/api/commander/volunteers/{applicant.id}',
+                          headers=auth_headers(client, 'other@example.com'))
+    assert response.status_code == 404
+
+
+def test_identity_comes_from_the_token_role(app, client):
+    create_hr()
+    create_commander()
+    db.session.commit()
+
+    response = client.get('/api/hr/volunteers', headers=auth_headers(client, 'commander@example.com'))
+    assert response.status_code == 403
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from db import db
+from tests.factories import auth_headers, create_application, create_commander, create_job, create_volunteer
+
+TOMORROW = (datetime.utcnow() + timedelta(days=1)).strftime('%Y-%m-%dT09:00:00Z')
+
+
+@pytest.fixture
+def job_id(app):
+    commander = create_commander()
+    job = create_job(commander, title='Driver')
+    create_application(create_volunteer(1), job)
+    db.session.commit()
+    return job.id
+
+
+@pytest.fixture
+def headers(client, job_id):
+    return auth_headers(client, 'commander@example.com')
+
+
+@pytest.fixture
+def feed_path(client, headers):
+    url = client.get('/api/commander/interviews/feed', headers=headers).get_json()['url']
+    return url[url.index('/api/'):]
+
+
+def interviews_path(job_id):
+    return f'/api/commander/jobs/{job_id}/volunteers/1/interviews'
+
+
+def revalidate(client, feed_path, etag):
+    return client.get(feed_path, headers={'If-None-Match': f'"{etag}"'})
+
+
+def test_feed_revalidates_with_304_until_an_interview_changes(client, headers, job_id, feed_path):
+    empty = client.get(feed_path)
+    assert empty.status_code == 200
+    assert empty.mimetype == 'text/calendar'
+    assert b'BEGIN:VEVENT' not in empty.data
+    etag, _ = empty.get_etag()
+    assert revalidate(client, feed_path, etag).status_code == 304
+
+    assert client.post(interviews_path(job_id), json={'interviewDate': TOMORROW},
+                       headers=headers).status_code == 201
+    booked = revalidate(client, feed_path, etag)
+    assert booked.status_code == 200
+    assert b'SUMMARY:Interview: Volunteer 1 (Driver)' in booked.data
+    etag, _ = booked.get_etag()
+
+    assert client.patch(interviews_path(job_id), json={'status': 'cancelled'}, headers=headers).status_code == 200
+    cancelled = revalidate(client, feed_path, etag)
+    assert cancelled.status_code == 200
+    assert b'STATUS:CANCELLED' in cancelled.data
+    etag, _ = cancelled.get_etag()
+
+    assert client.delete(interviews_path(job_id), headers=headers).status_code == 200
+    deleted = revalidate(client, feed_path, etag)
+    assert deleted.status_code == 200
+    assert b'BEGIN:VEVENT' not in deleted.data
+
+
+def test_renaming_the_job_refreshes_the_feed(client, headers, job_id, feed_path):
+    client.post(interviews_path(job_id), json={'interviewDate': TOMORROW}, headers=headers)
+    etag, _ = client.get(feed_path).get_etag()
+
+    assert client.patch(f'/api/commander/jobs/{job_id}', json={'name': 'Medic'}, headers=headers).status_code == 200
+    response = revalidate(client, feed_path, etag)
+    assert response.status_code == 200
+    assert b'(Medic)' in response.data
+
+
+def test_invalid_token_is_not_found(client, feed_path):
+    assert client.get(feed_path.replace('.ics', 'x.ics')).status_code == 404
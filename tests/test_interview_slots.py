@@ -0,0 +1,83 @@
+import pytest
+
+from db import db
+from models import Interview
+from tests.factories import auth_headers, create_application, create_commander, create_job, create_volunteer
+
+# A Monday; working hours 08:00-17:00 Asia/Jerusalem are 06:00-15:00 UTC in January
+DAY = '2030-01-07'
+
+
+@pytest.fixture
+def job_id(app):
+    commander = create_commander()
+    job = create_job(commander)
+    for index in range(1, 4):
+        create_application(create_volunteer(index), job)
+    db.session.commit()
+    return job.id
+
+
+@pytest.fixture
+def headers(client, job_id):
+    return auth_headers(client, 'commander@example.com')
+
+
+def book(client, headers, job_id, volunteer_id, start, minutes=60, method='post'):
+    return getattr(client, method)(f'/api/commander/jobs/{job_id}/volunteers/{volunteer_id}/interviews',
+                                   json={'interviewDate': f'{DAY}T{start}:00Z', 'durationMinutes': minutes},
+                                   headers=headers)
+
+
+def test_overlapping_interview_is_a_conflict(client, headers, job_id):
+    assert book(client, headers, job_id, 1, '09:00').status_code == 201
+    booked = Interview.query.one()
+
+    response = book(client, headers, job_id, 2, '09:30')
+    assert response.status_code == 409
+    assert response.get_json()['message'] == \
+        f'Overlaps interview {booked.id} scheduled {DAY}T09:00:00 - {DAY}T10:00:00'
+    assert book(client, headers, job_id, 2, '08:30', minutes=31).status_code == 409
+    assert Interview.query.count() == 1
+
+    # Back to back is fine
+    assert book(client, headers, job_id, 2, '10:00').status_code == 201
+    assert book(client, headers, job_id, 3, '08:00').status_code == 201
+
+
+def test_moving_an_interview_onto_another_is_a_conflict(client, headers, job_id):
+    book(client, headers, job_id, 1, '09:00')
+    book(client, headers, job_id, 2, '11:00')
+
+    assert book(client, headers, job_id, 2, '09:15', method='patch').status_code == 409
+    # Moving within its own slot never conflicts with itself
+    assert book(client, headers, job_id, 1, '09:15', method='patch').status_code == 200
+
+
+def test_cancelled_interviews_free_their_slot(client, headers, job_id):
+    book(client, headers, job_id, 1, '09:00')
+    assert client.patch(f'/api/commander/jobs/{job_id}/volunteers/1/interviews', json={'status': 'cancelled'},
+                        headers=headers).status_code == 200
+    assert book(client, headers, job_id, 2, '09:00').status_code == 201
+
+
+def test_free_slots_skip_busy_time(client, headers, job_id):
+    book(client, headers, job_id, 1, '09:00')
+    book(client, headers, job_id, 2, '10:00', minutes=30)
+
+    response = client.get(f'/api/commander/interviews/free-slots?from={DAY}T00:00:00Z&to={DAY}T23:59:00Z'
+                          f'&duration=60', headers=headers)
+    assert response.status_code == 200
+    assert [slot['start'][11:16] for slot in response.get_json()['slots']] \
+        == ['06:00', '07:00', '08:00', '10:30', '11:30', '12:30', '13:30']
+
+
+def test_other_commanders_interviews_do_not_conflict(client, headers, job_id):
+    other_job = create_job(create_commander('other@example.com', 'Other'))
+    volunteer = create_volunteer(9)
+    create_application(volunteer, other_job)
+    db.session.commit()
+    book(client, headers, job_id, 1, '09:00')
+
+    response = book(client, auth_headers(client, 'other@example.com'), other_job.id, volunteer.id, '09:00')
+    assert response.status_code == 201
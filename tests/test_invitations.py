@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from db import db
+from models import CalendarInvitation, Commander, User
+from services import invitation_service
+from services.invitation_service import InvitationService
+from utils.calendar_client import FakeCalendarService
+
+
+def http_error(status):
+    return HttpError(httplib2.Response({'status': status}), b'')
+
+
+@pytest.fixture
+def calendar():
+    return FakeCalendarService()
+
+
+@pytest.fixture
+def invitation(app, monkeypatch):
+    # Take the longest backoff the jitter allows, so retry times are predictable
+    monkeypatch.setattr(invitation_service.random, 'uniform', lambda low, high: high)
+    user = User(email='commander@example.com', role='commander', full_name='Commander')
+    user.set_password('password')
+    db.session.add(user)
+    db.session.flush()
+    commander = Commander(user_id=user.id, name='Commander', department='Logistics')
+    db.session.add(commander)
+    db.session.commit()
+    return InvitationService.enqueue_invitation(commander.id, {
+        'candidate_email': 'candidate@example.com',
+        'commander_email': 'commander@example.com',
+        'job_title': 'Driver',
+        'interview_time': '2030-01-01T09:00:00Z',
+    })
+
+
+def reload(invitation):
+    db.session.expire_all()
+    return db.session.get(CalendarInvitation, invitation.id)
+
+
+def make_due(invitation):
+    CalendarInvitation.query.filter_by(id=invitation.id).update({'next_attempt_at': datetime.utcnow()})
+    db.session.commit()
+
+
+def test_due_invitation_is_sent_once(invitation, calendar):
+    assert InvitationService.dispatch_pending(calendar) == 1
+
+    sent = reload(invitation)
+    assert sent.status == 'sent'
+    assert sent.attempts == 1
+    assert sent.last_error is None
+    assert sent.event_link == f'https://calendar.example.com/event?eid={sent.event_id}'
+    assert sent.meeting_link == f'https://meet.example.com/{sent.event_id}'
+    assert list(calendar.events_by_id) == [sent.event_id]
+    assert InvitationService.dispatch_pending(calendar) == 0
+    assert calendar.batches == 1
+
+
+def test_retryable_error_backs_off_and_counts_attempts(app, invitation, calendar):
+    base = app.config['INVITATION_RETRY_BASE_SECONDS']
+    calendar.fail_with[invitation.event_id] = http_error(503)
+
+    started = datetime.utcnow()
+    assert InvitationService.dispatch_pending(calendar) == 1
+    retrying = reload(invitation)
+    assert retrying.status == 'pending'
+    assert retrying.attempts == 1
+    assert retrying.last_error
+    assert retrying.next_attempt_at >= started + timedelta(seconds=base)
+    assert InvitationService.dispatch_pending(calendar) == 0  # Not due before the backoff ends
+
+    make_due(invitation)
+    started = datetime.utcnow()
+    assert InvitationService.dispatch_pending(calendar) == 1
+    retrying = reload(invitation)
+    assert retrying.status == 'pending'
+    assert retrying.attempts == 2
+    assert retrying.next_attempt_at >= started + timedelta(seconds=2 * base)
+
+    del calendar.fail_with[invitation.event_id]
+    make_due(invitation)
+    assert InvitationService.dispatch_pending(calendar) == 1
+    sent = reload(invitation)
+    assert sent.status == 'sent'
+    assert sent.attempts == 3
+    assert sent.last_error is None
+
+
+def test_retryable_error_fails_after_max_attempts(app, invitation, calendar, monkeypatch):
+    monkeypatch.setitem(app.config, 'INVITATION_MAX_ATTEMPTS', 2)
+    calendar.fail_with[invitation.event_id] = http_error(503)
+
+    InvitationService.dispatch_pending(calendar)
+    make_due(invitation)
+    InvitationService.dispatch_pending(calendar)
+
+    failed = reload(invitation)
+    assert failed.status == 'failed'
+    assert failed.attempts == 2
+
+
+def test_permanent_error_fails_without_retry(invitation, calendar):
+    calendar.fail_with[invitation.event_id] = http_error(400)
+
+    assert InvitationService.dispatch_pending(calendar) == 1
+    failed = reload(invitation)
+    assert failed.status == 'failed'
+    assert failed.attempts == 1
+    assert failed.last_error
+    make_due(invitation)
+    assert InvitationService.dispatch_pending(calendar) == 0
+
+
+def test_conflict_means_an_earlier_attempt_created_the_event(invitation, calendar):
+    calendar.fail_with[invitation.event_id] = http_error(409)
+
+    assert InvitationService.dispatch_pending(calendar) == 1
+    sent = reload(invitation)
+    assert sent.status == 'sent'
+    assert sent.last_error is None
+
+
+def test_stale_sending_invitation_is_claimed_again(app, invitation, calendar):
+    # A worker claims the row and dies before recording the outcome
+    assert [claimed.id for claimed in InvitationService.claim_batch(10)] == [invitation.id]
+    assert reload(invitation).status == 'sending'
+    assert InvitationService.dispatch_pending(calendar) == 0
+
+    timeout = app.config['INVITATION_SENDING_TIMEOUT']
+    CalendarInvitation.query.filter_by(id=invitation.id).update(
+        {'updated_at': datetime.utcnow() - timedelta(seconds=timeout + 1)})
+    db.session.commit()
+
+    assert InvitationService.dispatch_pending(calendar) == 1
+    sent = reload(invitation)
+    assert sent.status == 'sent'
+    assert sent.attempts == 2
@@ -0,0 +1,46 @@
+import pytest
+
+from db import db
+from tests.factories import PASSWORD, auth_headers, create_commander, create_job, create_volunteer
+
+
+@pytest.fixture
+def headers(app, client):
+    create_job(create_commander(), title='Driver')
+    create_volunteer(0, password=PASSWORD)
+    db.session.commit()
+    return auth_headers(client, 'volunteer0@example.com')
+
+
+def revalidate(client, headers, etag):
+    return client.get('/api/volunteer/jobs', headers=dict(headers, **{'If-None-Match': f'"{etag}"'}))
+
+
+def test_unchanged_board_revalidates_with_304(client, headers):
+    first = client.get('/api/volunteer/jobs', headers=headers)
+    etag, _ = first.get_etag()
+    assert first.status_code == 200 and etag
+    assert 'no-cache' in first.headers['Cache-Control']
+    assert [job['title'] for job in first.get_json()] == ['Driver']
+
+    again = revalidate(client, headers, etag)
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_job_change_invalidates_the_board(client, headers):
+    first = client.get('/api/volunteer/jobs', headers=headers)
+    etag, _ = first.get_etag()
+    job_id = first.get_json()[0]['id']
+    assert client.patch(f'/api/commander/jobs/{job_id}', json={'name': 'Medic'},
+                        headers=auth_headers(client, 'commander@example.com')).status_code == 200
+
+    response = revalidate(client, headers, etag)
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+    assert [job['title'] for job in response.get_json()] == ['Medic']
+
+
+def test_query_arguments_are_cached_separately(client, headers):
+    assert client.get('/api/volunteer/jobs?unit=none', headers=headers).get_json() == []
+    assert len(client.get('/api/volunteer/jobs', headers=headers).get_json()) == 1
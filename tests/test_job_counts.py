@@ -0,0 +1,80 @@
+import pytest
+
+from db import db
+from services.job_stats_service import JobStatsService
+from tests.factories import PASSWORD, auth_headers, create_commander, create_hr, create_job, create_volunteer
+
+
+@pytest.fixture
+def materialized(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'MATERIALIZED_JOB_COUNTS', True)
+
+
+def counts(app, job_id, materialized):
+    app.config['MATERIALIZED_JOB_COUNTS'] = materialized
+    try:
+        return JobStatsService.application_counts([job_id])[job_id]
+    finally:
+        app.config['MATERIALIZED_JOB_COUNTS'] = True
+
+
+def assert_counters_match(app, job_id, **expected):
+    """The materialized counters equal a fresh GROUP BY and the ``expected`` non-zero statuses."""
+    materialized = counts(app, job_id, True)
+    assert materialized == counts(app, job_id, False)
+    assert {status: total for status, total in materialized.items() if total and status != 'total'} == expected
+    assert materialized['total'] == sum(expected.values())
+
+
+def test_counters_follow_apply_status_change_assignment_and_withdrawal(app, client, materialized):
+    create_hr()
+    commander = create_commander()
+    job_id = create_job(commander, vacant_positions=2).id
+    for index in range(3):
+        create_volunteer(index, password=PASSWORD)
+    db.session.commit()
+    commander_headers = auth_headers(client, 'commander@example.com')
+    volunteers = [auth_headers(client, f'volunteer{index}@example.com') for index in range(3)]
+
+    for headers in volunteers:
+        response = client.post(f'/api/volunteer/jobs/{job_id}/apply', json={}, headers=headers)
+        assert response.status_code == 201, response.get_json()
+    assert_counters_match(app, job_id, pending=3)
+
+    response = client.patch(f'/api/commander/jobs/{job_id}/volunteers/1', json={'status': 'preferred'},
+                            headers=commander_headers)
+    assert response.status_code == 200
+    assert_counters_match(app, job_id, pending=2, preferred=1)
+
+    response = client.patch(f'/api/commander/jobs/{job_id}/applications', headers=commander_headers, json={
+        'changes': [{'volunteer_id': 1, 'status': 'preferred_final'},
+                    {'volunteer_id': 2, 'status': 'preferred_final'},
+                    {'volunteer_id': 3, 'status': 'rejected'}]})
+    assert response.get_json()['updated'] == 3
+    assert_counters_match(app, job_id, preferred_final=2, rejected=1)
+
+    response = client.post('/api/hr/assignments', json={'volunteer_id': 1, 'job_id': job_id},
+                           headers=auth_headers(client, 'hr@example.com'))
+    assert response.status_code == 200
+    assert_counters_match(app, job_id, preferred_final=1, rejected=1, hired=1)
+
+    assert client.delete(f'/api/volunteer/jobs/{job_id}/apply', headers=volunteers[1]).status_code == 200
+    assert client.delete(f'/api/volunteer/jobs/{job_id}/apply', headers=volunteers[2]).status_code == 200
+    assert_counters_match(app, job_id, hired=1)
+
+
+def test_rebuild_recomputes_counters_from_applications(app, client, materialized):
+    commander = create_commander()
+    job_id = create_job(commander).id
+    create_volunteer(0, password=PASSWORD)
+    db.session.commit()
+    client.post(f'/api/volunteer/jobs/{job_id}/apply', json={},
+                headers=auth_headers(client, 'volunteer0@example.com'))
+
+    # Counters drifted, e.g. rows written before MATERIALIZED_JOB_COUNTS was turned on
+    JobStatsService._adjust(job_id, 'pending', 5)
+    db.session.commit()
+    assert counts(app, job_id, True)['pending'] == 6
+
+    JobStatsService.rebuild_counts()
+    assert_counters_match(app, job_id, pending=1)
@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+
+from db import db
+from tests.factories import auth_headers, create_hr, create_volunteer
+
+
+def years_before_today(years):
+    today = date.today()
+    return today.replace(year=today.year - years, day=min(today.day, 28))
+
+
+@pytest.fixture
+def hr_headers(app, client):
+    create_hr()
+    for index, age in enumerate((20, 30, 40, 50)):
+        create_volunteer(index, date_of_birth=years_before_today(age))
+    db.session.commit()
+    return auth_headers(client, 'hr@example.com')
+
+
+def test_age_filters_select_volunteers(client, hr_headers):
+    response = client.get('/api/hr/volunteers?min_age=25&max_age=40', headers=hr_headers)
+    assert response.status_code == 200
+    assert sorted(volunteer['age'] for volunteer in response.get_json()) == [30, 40]
+
+
+@pytest.mark.parametrize('query', ['min_age=-1', 'max_age=-1', 'min_age=151', 'max_age=150000',
+                                   'min_age=5000', 'min_age=old'])
+def test_out_of_range_age_is_a_bad_request(client, hr_headers, query):
+    response = client.get(f'/api/hr/volunteers?{query}', headers=hr_headers)
+    assert response.status_code == 400
+    assert 'age' in response.get_json()['message']
+
+
+def test_keyset_pages_cover_every_volunteer_once(client, hr_headers):
+    seen, cursor = [], None
+    while True:
+        url = '/api/hr/volunteers?limit=3&fields=id,fullName' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url, headers=hr_headers).get_json()
+        assert all(set(item) == {'id', 'fullName'} for item in page['items'])
+        seen += [item['id'] for item in page['items']]
+        cursor = page['nextCursor']
+        if not cursor:
+            break
+    assert sorted(seen) == seen and len(seen) == 4
@@ -0,0 +1,55 @@
+import pytest
+
+import services.matching_service as matching
+from db import db
+from services.matching_service import MatchingService
+from tests.factories import create_application, create_commander, create_job, create_volunteer
+
+
+@pytest.fixture
+def commander(app, monkeypatch):
+    # The index is process-wide: build a fresh one from this test's rows
+    monkeypatch.setattr(matching, '_index', None)
+    commander = create_commander()
+    db.session.commit()
+    return commander
+
+
+def test_recommended_jobs_rank_by_profile_fit(commander):
+    volunteer = create_volunteer(1, primary_profession='Paramedic', languages='Arabic')
+    medic = create_job(commander, title='Paramedic', required_languages='Arabic')
+    create_job(commander, title='Paramedic')
+    create_job(commander, title='Cook')
+    db.session.commit()
+
+    jobs = MatchingService.recommended_jobs(volunteer.id)
+    assert [job.id for job, score, terms in jobs][0] == medic.id
+    assert set(jobs[0][2]) == {'paramedic', 'arabic'}
+    assert len(jobs) == 2
+    assert jobs[0][1] > jobs[1][1]
+
+
+def test_applied_and_closed_jobs_are_not_recommended(commander):
+    volunteer = create_volunteer(1, primary_profession='Driver')
+    applied = create_job(commander, title='Driver')
+    other = create_job(commander, title='Truck driver')
+    create_application(volunteer, applied)
+    db.session.commit()
+    assert {job.id for job, _, _ in MatchingService.recommended_jobs(volunteer.id)} == {other.id}
+
+    other.is_active = False
+    db.session.commit()
+    MatchingService.job_changed(other)
+    assert MatchingService.recommended_jobs(volunteer.id) == []
+
+
+def test_rows_created_after_the_build_are_picked_up(commander):
+    job = create_job(commander, title='Electrician')
+    db.session.commit()
+    assert MatchingService.recommended_volunteers(job.id) == []
+
+    create_volunteer(1, primary_profession='Electrician')
+    create_volunteer(2, primary_profession='Cook')
+    db.session.commit()
+    assert [volunteer.full_name for volunteer, _, _ in MatchingService.recommended_volunteers(job.id)] \
+        == ['Volunteer 1']
@@ -0,0 +1,50 @@
+from werkzeug.security import generate_password_hash
+
+from db import db
+from models import User
+from tests.factories import PASSWORD, create_hr
+from utils.passwords import needs_rehash
+
+
+def login(client, password=PASSWORD):
+    return client.post('/api/auth/login', json={'email': 'hr@example.com', 'password': password})
+
+
+def test_login_rehashes_a_hash_made_with_an_older_method(client):
+    user = db.session.get(User, create_hr().user_id)
+    user.password_hash = generate_password_hash(PASSWORD, 'pbkdf2:sha256:1000')
+    db.session.commit()
+    assert needs_rehash(user.password_hash)
+
+    assert login(client).status_code == 200
+    db.session.refresh(user)
+    assert user.password_hash.startswith('scrypt:32768:8:1$')
+    assert not needs_rehash(user.password_hash)
+    assert login(client).status_code == 200
+
+
+def test_login_keeps_a_current_hash(client):
+    user = db.session.get(User, create_hr().user_id)
+    db.session.commit()
+    current = user.password_hash
+
+    assert login(client).status_code == 200
+    db.session.refresh(user)
+    assert user.password_hash == current
+
+
+def test_wrong_password_neither_logs_in_nor_rehashes(client):
+    user = db.session.get(User, create_hr().user_id)
+    user.password_hash = old = generate_password_hash(PASSWORD, 'pbkdf2:sha256:1000')
+    db.session.commit()
+
+    assert login(client, 'wrong').status_code == 401
+    db.session.refresh(user)
+    assert user.password_hash == old
+
+
+def test_configured_method_applies_to_new_hashes(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+    user = db.session.get(User, create_hr().user_id)
+    assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+    assert user.check_password(PASSWORD)
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+from db import db
+from models import Resume
+from services.resume_service import ResumeService
+from tests.factories import auth_headers, create_application, create_commander, create_job, create_volunteer
+
+CONTENT = b'0123456789' * 10
+
+
+@pytest.fixture
+def resume_url(app, client, uploads):
+    commander = create_commander()
+    create_commander('other@example.com', 'Other')
+    job = create_job(commander)
+    volunteer = create_volunteer(1)
+    application = create_application(volunteer, job)
+    file_path, content_hash = ResumeService.store_upload(FileStorage(io.BytesIO(CONTENT)), 'pdf')
+    db.session.add(Resume(application_id=application.id, file_path=file_path, content_hash=content_hash,
+                          original_filename='קורות חיים.pdf'))
+    db.session.commit()
+    return f'/api/commander/jobs/{job.id}/volunteers/{volunteer.id}/resume'
+
+
+@pytest.fixture
+def headers(client, resume_url):
+    return auth_headers(client, 'commander@example.com')
+
+
+def test_full_download_is_private_and_revalidated(client, resume_url, headers):
+    response = client.get(resume_url, headers=headers)
+    assert response.status_code == 200
+    assert response.data == CONTENT
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.cache_control.private and response.cache_control.no_cache
+    assert not response.cache_control.public
+    assert "filename*=UTF-8''%D7%A7" in response.headers['Content-Disposition']
+
+
+def test_range_request_returns_partial_content(client, resume_url, headers):
+    response = client.get(resume_url, headers=dict(headers, Range='bytes=10-19'))
+    assert response.status_code == 206
+    assert response.data == CONTENT[10:20]
+    assert response.headers['Content-Range'] == f'bytes 10-19/{len(CONTENT)}'
+
+
+def test_matching_etag_returns_304(client, resume_url, headers):
+    etag, _ = client.get(resume_url, headers=headers).get_etag()
+    response = client.get(resume_url, headers=dict(headers, **{'If-None-Match': f'"{etag}"'}))
+    assert response.status_code == 304
+    assert response.data == b''
+
+
+def test_x_accel_redirect_leaves_the_bytes_to_nginx(app, client, resume_url, headers, monkeypatch):
+    monkeypatch.setitem(app.config, 'RESUME_X_ACCEL_PREFIX', '/protected/resumes/')
+    response = client.get(resume_url, headers=headers)
+    assert response.status_code == 200
+    assert response.data == b''
+    assert response.headers['X-Accel-Redirect'].startswith('/protected/resumes/')
+    assert response.headers['X-Accel-Redirect'].endswith('.pdf')
+    assert response.headers['Content-Disposition'].startswith('inline;')
+
+    etag, _ = response.get_etag()
+    assert client.get(resume_url, headers=dict(headers, **{'If-None-Match': f'"{etag}"'})).status_code == 304
+
+
+def test_other_commanders_cannot_download(client, resume_url):
+    response = client.get(resume_url, headers=auth_headers(client, 'other@example.com'))
+    assert response.status_code == 404
@@ -0,0 +1,53 @@
+import io
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import services.resume_service as resume_service
+from db import db
+from models import Resume
+from services.resume_service import ResumeService
+from tests.factories import create_application, create_commander, create_job, create_volunteer
+
+
+@pytest.fixture
+def application(app, uploads, monkeypatch):
+    monkeypatch.setitem(app.config, 'RESUME_EXTRACTION_WORKERS', 1)
+    application = create_application(create_volunteer(1), create_job(create_commander()))
+    db.session.commit()
+    return application
+
+
+def add_resume(application, data, extension):
+    file_path, _ = ResumeService.store_upload(FileStorage(io.BytesIO(data)), extension)
+    resume = Resume(application_id=application.id, file_path=file_path, original_filename=f'cv.{extension}')
+    db.session.add(resume)
+    db.session.commit()
+    return resume
+
+
+def test_pending_resumes_are_extracted_in_spawned_workers(application):
+    text = add_resume(application, 'Forklift   operator\r\n\r\n\r\nשלום'.encode('utf-8'), 'txt')
+    empty = add_resume(application, b'   ', 'txt')
+    broken = add_resume(application, b'not a zip', 'docx')
+
+    assert ResumeService.extract_pending() == 3
+    assert resume_service._extraction_pool._mp_context.get_start_method() == 'spawn'
+
+    db.session.expire_all()
+    assert (text.extraction_status, text.extracted_text) == ('done', 'Forklift operator\n\nשלום')
+    assert len(text.content_hash) == 64 and text.extracted_at is not None
+    assert (empty.extraction_status, empty.extracted_text) == ('empty', None)
+    assert broken.extraction_status == 'failed' and broken.extraction_error
+    assert ResumeService.extract_pending() == 0
+
+
+def test_failed_resumes_are_retried_on_request(application):
+    resume = add_resume(application, b'Welder', 'txt')
+    Resume.query.filter_by(id=resume.id).update({'extraction_status': 'failed'})
+    db.session.commit()
+
+    assert ResumeService.extract_pending() == 0
+    assert ResumeService.extract_pending(statuses=('failed',)) == 1
+    db.session.refresh(resume)
+    assert (resume.extraction_status, resume.extracted_text) == ('done', 'Welder')
@@ -0,0 +1,63 @@
+import pytest
+
+from db import db
+from services.volunteer_service import VolunteerService
+from tests.factories import PASSWORD, auth_headers, create_commander, create_job, create_volunteer
+
+
+@pytest.fixture
+def commander(app, fts):
+    commander = create_commander()
+    db.session.commit()
+    return commander
+
+
+def titles(results):
+    return [job.title for job, rank, highlight, snippet in results]
+
+
+def test_title_matches_rank_above_description_matches(commander):
+    create_job(commander, title='Cook', description='Drives the supply truck to the kitchen now and then')
+    create_job(commander, title='Truck driver', description='Drives the supply truck')
+    create_job(commander, title='Clerk', description='Paperwork')
+    db.session.commit()
+
+    assert titles(VolunteerService.search_jobs('truck')) == ['Truck driver', 'Cook']
+    # Every word is a prefix: 'drive' finds 'driver' and 'Drives'
+    assert titles(VolunteerService.search_jobs('drive')) == ['Truck driver', 'Cook']
+
+
+def test_index_follows_updates_and_inactive_jobs_are_hidden(commander):
+    job = create_job(commander, title='Medic')
+    create_job(commander, title='Medic trainer', is_active=False)
+    db.session.commit()
+    assert titles(VolunteerService.search_jobs('medic')) == ['Medic']
+
+    job.title = 'Paramedic'
+    db.session.commit()
+    assert titles(VolunteerService.search_jobs('medic')) == []
+    assert titles(VolunteerService.search_jobs('paramedic')) == ['Paramedic']
+
+
+def test_window_falls_back_when_filters_leave_it_short(app, commander, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEARCH_RANK_WINDOW', 2)
+    create_job(commander, title='Driver', unit='North')
+    for number in range(3):
+        create_job(commander, title=f'Driver {number}', unit='South')
+    db.session.commit()
+
+    # The two newest matches are both in the South unit; the North one is older than the window
+    assert titles(VolunteerService.search_jobs('driver', filters={'unit': 'North'})) == ['Driver']
+    assert len(VolunteerService.search_jobs('driver', limit=10)) == 4
+
+
+def test_search_route_highlights_the_title(client, commander):
+    create_job(commander, title='Truck driver')
+    create_volunteer(0, password=PASSWORD)
+    db.session.commit()
+    headers = auth_headers(client, 'volunteer0@example.com')
+
+    response = client.get('/api/volunteer/jobs/search?q=truck', headers=headers)
+    assert response.status_code == 200
+    assert [job['titleHighlight'] for job in response.get_json()] == ['<mark>Truck</mark> driver']
+    assert client.get('/api/volunteer/jobs/search?q=%22%22', headers=headers).status_code == 400
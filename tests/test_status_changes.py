@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import update
+from werkzeug.exceptions import Conflict
+
+from db import db
+from models import JobApplication
+from models.application import ApplicationStatus
+from services.commander_service import CommanderService
+from tests.factories import auth_headers, create_application, create_commander, create_job, create_volunteer
+
+
+@pytest.fixture
+def application(app):
+    application = create_application(create_volunteer(1), create_job(create_commander()))
+    db.session.commit()
+    return application
+
+
+@pytest.fixture
+def headers(client, application):
+    return auth_headers(client, 'commander@example.com')
+
+
+def set_status_behind_the_session(application_id, status):
+    with db.engine.begin() as connection:
+        connection.execute(update(JobApplication).where(JobApplication.id == application_id).values(status=status))
+
+
+def put_status(client, headers, application, status):
+    return client.put(f'/api/commander/applications/{application.id}/status', json={'status': status},
+                      headers=headers)
+
+
+def test_allowed_transition_updates_the_status(client, headers, application):
+    response = put_status(client, headers, application, 'preferred')
+    assert response.status_code == 200
+    db.session.refresh(application)
+    assert application.status == ApplicationStatus.PREFERRED
+
+
+def test_commanders_cannot_hire_directly(client, headers, application):
+    response = put_status(client, headers, application, 'hired')
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Cannot change status from pending to hired'
+    db.session.refresh(application)
+    assert application.status == ApplicationStatus.PENDING
+
+
+def test_application_without_a_status_moves_like_a_pending_one(client, headers, application):
+    set_status_behind_the_session(application.id, None)
+    db.session.expire_all()  # Requests share the test's session; a real one would read the row afresh
+    assert put_status(client, headers, application, 'hired').get_json()['message'] \
+        == 'Cannot change status from none to hired'
+
+    assert put_status(client, headers, application, 'rejected').status_code == 200
+    db.session.refresh(application)
+    assert application.status == ApplicationStatus.REJECTED
+
+
+def test_concurrent_change_is_a_conflict(application):
+    # Another request rejects the application after this one read it as pending
+    assert application.status == ApplicationStatus.PENDING
+    set_status_behind_the_session(application.id, ApplicationStatus.REJECTED)
+
+    with pytest.raises(Conflict):
+        CommanderService._change_status(application, ApplicationStatus.PREFERRED)
+    db.session.refresh(application)
+    assert application.status == ApplicationStatus.REJECTED
+
+
+def test_batch_reports_each_change(client, headers, application):
+    job = application.job
+    other = create_application(create_volunteer(2), job)
+    db.session.commit()
+    set_status_behind_the_session(application.id, None)
+
+    response = client.patch(f'/api/commander/jobs/{job.id}/applications', headers=headers, json={'changes': [
+        {'volunteer_id': application.volunteer_id, 'status': 'preferred'},
+        {'volunteer_id': other.volunteer_id, 'status': 'hired'},
+        {'volunteer_id': 999, 'status': 'rejected'},
+    ]})
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [(result['updated'], result.get('previous_status'), result.get('error')) for result in results] == [
+        (True, None, None),
+        (False, 'pending', 'Cannot change status from pending to hired'),
+        (False, None, 'Job application not found'),
+    ]
+    db.session.expire_all()
+    assert (application.status, other.status) == (ApplicationStatus.PREFERRED, ApplicationStatus.PENDING)
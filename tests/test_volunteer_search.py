@@ -0,0 +1,45 @@
+from datetime import date
+
+import pytest
+
+from db import db
+from services.hr_service import HRService
+from tests.factories import auth_headers, create_hr, create_volunteer
+
+
+@pytest.fixture
+def headers(app, client, fts):
+    create_hr()
+    db.session.commit()
+    return auth_headers(client, 'hr@example.com')
+
+
+def names(results):
+    return [volunteer.full_name for volunteer, rank, snippet in results]
+
+
+@pytest.mark.parametrize('args', ['min_age=-1', 'max_age=151', 'max_age=99999', 'min_age=abc'])
+def test_out_of_range_age_is_a_bad_request(client, headers, args):
+    response = client.get(f'/api/hr/volunteers/search?q=driver&{args}', headers=headers)
+    assert response.status_code == 400
+    assert 'Invalid' in response.get_json()['message']
+
+
+def test_profession_ranks_above_summary(client, headers):
+    create_volunteer(1, personal_summary='Once rode along with a driver')
+    create_volunteer(2, primary_profession='Driver')
+    db.session.commit()
+
+    response = client.get('/api/hr/volunteers/search?q=driver&max_age=150', headers=headers)
+    assert response.status_code == 200
+    assert [volunteer['fullName'] for volunteer in response.get_json()] == ['Volunteer 2', 'Volunteer 1']
+
+
+def test_window_falls_back_when_the_age_filter_leaves_it_short(app, headers, monkeypatch):
+    monkeypatch.setitem(app.config, 'SEARCH_RANK_WINDOW', 2)
+    create_volunteer(1, primary_profession='Driver', date_of_birth=date(1950, 1, 1))
+    for index in range(2, 5):
+        create_volunteer(index, primary_profession='Driver', date_of_birth=date(2000, 1, 1))
+    db.session.commit()
+
+    assert names(HRService.search_volunteers('driver', filters={'min_age': '60'})) == ['Volunteer 1']
@@ -0,0 +1,100 @@
+"""Content-addressed file storage for uploads.
+
+A blob is stored once, at ``<root>/<h[0:2]>/<h[2:4]>/<h>.<ext>`` where ``h`` is
+the SHA-256 of its bytes: two uploads with the same content share one file,
+uploads with the same name never collide, and no directory grows past a few
+thousand entries. Uploads are hashed while they are streamed to a temporary
+file in the same filesystem, then renamed into place, so a reader never sees
+a partial blob and the upload is never held in memory.
+
+Blobs are not deleted when a row stops referencing them: ``prune`` removes
+the unreferenced ones once they are older than a grace period, which keeps a
+concurrent upload of the same content from losing its file.
+"""
+import hashlib
+import os
+import tempfile
+import time
+
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobStore:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    @staticmethod
+    def relative_path(digest, extension):
+        return os.path.join(digest[:2], digest[2:4], f'{digest}.{extension}')
+
+    def path(self, relative_path):
+        """Absolute path of a stored blob; rejects paths that would leave the store."""
+        full_path = os.path.abspath(os.path.join(self.root, relative_path))
+        if os.path.commonpath([self.root, full_path]) != self.root:
+            raise ValueError(f'Invalid blob path: {relative_path}')
+        return full_path
+
+    def save(self, stream, extension):
+        """Store the contents of a binary ``stream``; returns (relative path, sha256 hex digest, size)."""
+        temp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(temp_dir, exist_ok=True)
+        digest, size = hashlib.sha256(), 0
+        fd, temp_path = tempfile.mkstemp(dir=temp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+                    size += len(chunk)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+
+            relative_path = self.relative_path(digest.hexdigest(), extension.lower())
+            full_path = self.path(relative_path)
+            if os.path.exists(full_path):
+                # Already stored: refresh its mtime so prune's grace period covers this new reference
+                os.utime(full_path)
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.replace(temp_path, full_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return relative_path, digest.hexdigest(), size
+
+    def stored(self):
+        """Relative paths of every stored blob."""
+        for directory, _, filenames in os.walk(self.root):
+            relative_dir = os.path.relpath(directory, self.root)
+            if relative_dir.split(os.sep)[0] == 'tmp':
+                continue
+            for filename in filenames:
+                if relative_dir.count(os.sep) == 1:  # Only the <h[0:2]>/<h[2:4]> shard level holds blobs
+                    yield os.path.join(relative_dir, filename)
+
+    def prune(self, referenced, grace_seconds):
+        """Delete blobs not in ``referenced`` and untouched for ``grace_seconds``; returns their paths."""
+        cutoff = time.time() - grace_seconds
+        removed = []
+        temp_dir = os.path.join(self.root, 'tmp')
+        if os.path.isdir(temp_dir):
+            for filename in os.listdir(temp_dir):  # Left behind by uploads that died mid-stream
+                temp_path = os.path.join(temp_dir, filename)
+                try:
+                    if os.path.getmtime(temp_path) < cutoff:
+                        os.remove(temp_path)
+                except FileNotFoundError:
+                    continue
+        for relative_path in self.stored():
+            if relative_path in referenced:
+                continue
+            full_path = self.path(relative_path)
+            try:
+                if os.path.getmtime(full_path) < cutoff:
+                    os.remove(full_path)
+                    removed.append(relative_path)
+            except FileNotFoundError:
+                continue
+        return removed
@@ -0,0 +1,213 @@
+"""Process-wide Google Calendar credentials and API client.
+
+Credentials are loaded from the token pickle once per process and refreshed
+shortly before they expire, under a lock (and an flock on the token file where
+available, so concurrent Gunicorn or worker processes do not refresh the same
+token at once). Refreshed tokens are written to a temporary file and renamed
+over the old one, so a crash never leaves a truncated pickle. The ``Resource``
+is built from the discovery document bundled with google-api-python-client
+(``static_discovery=True``), so ``build()`` makes no network call. httplib2
+connections are not thread-safe, so each thread gets its own ``Resource`` over
+the shared credentials.
+"""
+import itertools
+import os
+import pickle
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from google.auth.transport.requests import Request
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKEN_FILE = os.path.join(BASE_DIR, 'utils', 'token1.pickle')
+REDIRECT_URI = 'http://localhost:8080/'
+
+# Refresh this long before the access token expires rather than on a 401
+REFRESH_MARGIN = timedelta(minutes=5)
+
+
+def client_secret_file():
+    secret = os.getenv("GOOGLE_CLIENT_SECRET")
+    if not secret:
+        raise RuntimeError("GOOGLE_CLIENT_SECRET environment variable is not set!")
+    return os.path.join(BASE_DIR, 'utils', secret)
+
+
+class CalendarClientProvider:
+    def __init__(self, token_file, secret_file=None, api_name='calendar', api_version='v3'):
+        self.token_file = token_file
+        self.secret_file = secret_file
+        self.api_name = api_name
+        self.api_version = api_version
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self._credentials = None
+
+    def _needs_refresh(self, creds):
+        if not creds.valid:
+            return True
+        return creds.expiry is not None and creds.expiry - REFRESH_MARGIN <= datetime.utcnow()
+
+    def _load(self):
+        if not os.path.exists(self.token_file):
+            return None
+        with open(self.token_file, 'rb') as token:
+            return pickle.load(token)
+
+    def _save(self, creds):
+        directory = os.path.dirname(self.token_file) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.token-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as token:
+                pickle.dump(creds, token)
+                token.flush()
+                os.fsync(token.fileno())
+            os.replace(temp_path, self.token_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(os.path.dirname(self.token_file) or '.', exist_ok=True)
+        with open(self.token_file + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _authorize(self):
+        secret_file = self.secret_file or client_secret_file()
+        if not os.path.exists(secret_file):
+            raise FileNotFoundError(
+                f"Client secret file not found at {secret_file}. "
+                "Please download it from Google Cloud Console and place it in the config directory."
+            )
+        flow = InstalledAppFlow.from_client_secrets_file(secret_file, SCOPES, redirect_uri=REDIRECT_URI)
+        return flow.run_local_server(port=8080)
+
+    def credentials(self):
+        """Valid credentials, refreshed (or authorized interactively) when needed."""
+        creds = self._credentials
+        if creds is not None and not self._needs_refresh(creds):
+            return creds
+
+        with self._lock:
+            creds = self._credentials
+            if creds is not None and not self._needs_refresh(creds):
+                return creds
+            with self._file_lock():
+                # Another process may have refreshed the token since we loaded it
+                on_disk = self._load()
+                if on_disk is not None and (creds is None or not self._needs_refresh(on_disk)):
+                    creds = on_disk
+                if creds is not None and self._needs_refresh(creds) and creds.refresh_token:
+                    creds.refresh(Request())
+                    self._save(creds)
+                elif creds is None or not creds.valid:
+                    creds = self._authorize()
+                    self._save(creds)
+            self._credentials = creds
+            return creds
+
+    def service(self):
+        """This thread's API ``Resource``, built once over the shared credentials."""
+        creds = self.credentials()
+        resource = getattr(self._local, 'resource', None)
+        if resource is None or getattr(self._local, 'credentials', None) is not creds:
+            resource = build(self.api_name, self.api_version, credentials=creds,
+                             static_discovery=True, cache_discovery=False)
+            self._local.resource = resource
+            self._local.credentials = creds
+        return resource
+
+
+_default_provider = CalendarClientProvider(TOKEN_FILE)
+
+
+def get_calendar_service():
+    """Get the process-wide Calendar API service"""
+    return _default_provider.service()
+
+
+class FakeCalendarService:
+    """In-memory stand-in for the Calendar ``Resource`` (CALENDAR_BACKEND=fake).
+
+    Supports what InvitationService uses: ``events().insert(...)`` and
+    ``new_batch_http_request``. Inserted events are kept in ``events_by_id``;
+    ``fail_with`` maps an event id to an exception to raise for it instead.
+    """
+
+    def __init__(self):
+        self.events_by_id = {}
+        self.fail_with = {}
+        self.batches = 0
+        self._ids = itertools.count(1)
+
+    def events(self):
+        return _FakeEvents(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _FakeBatch(self, callback)
+
+    def _insert(self, calendarId, body, **kwargs):
+        event_id = body.get('id') or f'fake{next(self._ids)}'
+        error = self.fail_with.get(event_id)
+        if error:
+            raise error
+        event = dict(body, id=event_id, htmlLink=f'https://calendar.example.com/event?eid={event_id}')
+        if 'conferenceData' in body:
+            event['conferenceData'] = {'entryPoints': [{'uri': f'https://meet.example.com/{event_id}'}]}
+        self.events_by_id[event_id] = event
+        return event
+
+
+class _FakeEvents:
+    def __init__(self, service):
+        self._service = service
+
+    def insert(self, **kwargs):
+        return _FakeRequest(lambda: self._service._insert(**kwargs))
+
+
+class _FakeRequest:
+    def __init__(self, call):
+        self._call = call
+
+    def execute(self):
+        return self._call()
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        self._requests.append((request, callback or self._callback, request_id or str(len(self._requests))))
+
+    def execute(self):
+        self._service.batches += 1
+        for request, callback, request_id in self._requests:
+            try:
+                response, error = request.execute(), None
+            except Exception as e:
+                response, error = None, e
+            callback(request_id, response, error)
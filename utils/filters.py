@@ -0,0 +1,79 @@
+from datetime import date
+
+from werkzeug.exceptions import BadRequest
+
+from models.job import Job, JobStatus
+from models.volunteer import Volunteer, Gender
+
+JOB_FILTERS = ('status', 'category', 'unit')
+VOLUNTEER_FILTERS = ('gender', 'min_age', 'max_age', 'min_profile', 'max_profile')
+# Keeps the birth-date bound inside date's year range (max_age filters on max_age + 1)
+MAX_AGE = 150
+
+
+def parse_filters(args, allowed):
+    """Pick the supported, non-empty filter arguments out of a query string."""
+    return {key: args[key] for key in allowed if args.get(key)}
+
+
+def _years_ago(years):
+    today = date.today()
+    try:
+        return today.replace(year=today.year - years)
+    except ValueError:  # February 29 in a non-leap target year
+        return today.replace(year=today.year - years, day=today.day - 1)
+
+
+def _parse_age(filters, key):
+    age = _parse_int(filters, key)
+    if not 0 <= age <= MAX_AGE:
+        raise BadRequest(f"Invalid {key} value: must be between 0 and {MAX_AGE}")
+    return age
+
+
+def _parse_int(filters, key):
+    try:
+        return int(filters[key])
+    except ValueError:
+        raise BadRequest(f"Invalid {key} value: must be an integer")
+
+
+def apply_job_filters(query, filters):
+    if not filters:
+        return query
+
+    if 'status' in filters:
+        value = filters['status']
+        try:
+            status = JobStatus[value.upper()]
+        except KeyError:
+            raise BadRequest(f"Invalid status value: {value}")
+        query = query.filter(Job.status == status)
+    if 'category' in filters:
+        query = query.filter(Job.category == filters['category'])
+    if 'unit' in filters:
+        query = query.filter(Job.unit == filters['unit'])
+    return query
+
+
+def apply_volunteer_filters(query, filters):
+    if not filters:
+        return query
+
+    if 'gender' in filters:
+        value = filters['gender']
+        try:
+            gender = Gender(value.title())
+        except ValueError:
+            raise BadRequest(f"Invalid gender: {value}")
+        query = query.filter(Volunteer.gender == gender)
+    if 'min_age' in filters:
+        # At least N years old means born on or before today N years ago
+        query = query.filter(Volunteer.date_of_birth <= _years_ago(_parse_age(filters, 'min_age')))
+    if 'max_age' in filters:
+        query = query.filter(Volunteer.date_of_birth > _years_ago(_parse_age(filters, 'max_age') + 1))
+    if 'min_profile' in filters:
+        query = query.filter(Volunteer.profile >= _parse_int(filters, 'min_profile'))
+    if 'max_profile' in filters:
+        query = query.filter(Volunteer.profile <= _parse_int(filters, 'max_profile'))
+    return query
@@ -0,0 +1,211 @@
+"""SQLite FTS5 search indexes.
+
+Each index is an external-content FTS5 table over some text columns of a
+regular table: the FTS table stores only the inverted index, rows are read
+back from the source table by rowid. Triggers on the source table keep the
+index in step with every INSERT, DELETE and UPDATE of an indexed column, so
+services never have to remember to reindex.
+
+The tables and triggers are created by a migration (and by ``ensure_fts`` for
+databases built with ``db.create_all()``); ``flask rebuild-search-index``
+rebuilds them from the source tables. On other databases ``fts_supported``
+is False and callers fall back to plain LIKE filtering.
+"""
+import re
+
+from sqlalchemy import and_, column, literal_column, or_, table, text
+from werkzeug.exceptions import BadRequest
+
+# Words of the user's query; everything else (quotes, operators, parentheses) is dropped
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+class FtsIndex:
+    def __init__(self, name, table, columns, weights=None):
+        self.name = name
+        self.table = table
+        self.columns = tuple(columns)
+        self.weights = tuple(weights or (1.0,) * len(self.columns))
+
+    @property
+    def bm25(self):
+        """``bm25(...)`` expression with the per-column weights; lower is better."""
+        return f"bm25({self.name}, {', '.join(str(weight) for weight in self.weights)})"
+
+    def create_statements(self):
+        columns = ', '.join(self.columns)
+        new_values = ', '.join(f'new.{column}' for column in self.columns)
+        old_values = ', '.join(f'old.{column}' for column in self.columns)
+        delete_old = (f"INSERT INTO {self.name}({self.name}, rowid, {columns}) "
+                      f"VALUES ('delete', old.id, {old_values});")
+        insert_new = f"INSERT INTO {self.name}(rowid, {columns}) VALUES (new.id, {new_values});"
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.name} USING fts5("
+            f"{columns}, content='{self.table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ai AFTER INSERT ON {self.table} BEGIN {insert_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_ad AFTER DELETE ON {self.table} BEGIN {delete_old} END",
+            f"CREATE TRIGGER IF NOT EXISTS {self.name}_au AFTER UPDATE OF {columns} ON {self.table} "
+            f"BEGIN {delete_old} {insert_new} END",
+        ]
+
+    def drop_statements(self):
+        return [
+            f"DROP TRIGGER IF EXISTS {self.name}_au",
+            f"DROP TRIGGER IF EXISTS {self.name}_ad",
+            f"DROP TRIGGER IF EXISTS {self.name}_ai",
+            f"DROP TABLE IF EXISTS {self.name}",
+        ]
+
+    def rebuild_statement(self):
+        return f"INSERT INTO {self.name}({self.name}) VALUES ('rebuild')"
+
+
+JOBS_FTS = FtsIndex(
+    'jobs_fts', 'jobs',
+    ('title', 'description', 'tech_skills', 'experience', 'education', 'passed_courses', 'category', 'unit'),
+    weights=(10.0, 1.0, 5.0, 2.0, 2.0, 2.0, 3.0, 3.0),
+)
+
+VOLUNTEERS_FTS = FtsIndex(
+    'volunteers_fts', 'volunteers',
+    ('primary_profession', 'experience', 'courses', 'languages', 'education', 'interests', 'personal_summary'),
+    weights=(4.0, 3.0, 3.0, 4.0, 2.0, 1.0, 1.0),
+)
+
+# Text extracted from uploaded resumes by ResumeService
+RESUMES_FTS = FtsIndex('resumes_fts', 'resumes', ('extracted_text',))
+
+FTS_INDEXES = (JOBS_FTS, VOLUNTEERS_FTS, RESUMES_FTS)
+
+
+def fts_supported(connection):
+    return connection.dialect.name == 'sqlite'
+
+
+def ensure_fts(connection, indexes=FTS_INDEXES):
+    """Create missing FTS tables/triggers and index rows that predate them."""
+    if not fts_supported(connection):
+        return
+    for index in indexes:
+        existed = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': index.name}
+        ).first() is not None
+        for statement in index.create_statements():
+            connection.exec_driver_sql(statement)
+        if not existed:
+            connection.exec_driver_sql(index.rebuild_statement())
+
+
+def rebuild_fts(connection, indexes=FTS_INDEXES):
+    if not fts_supported(connection):
+        return
+    for index in indexes:
+        for statement in index.create_statements():
+            connection.exec_driver_sql(statement)
+        connection.exec_driver_sql(index.rebuild_statement())
+
+
+def search_terms(query):
+    return _TOKEN.findall(query or '')
+
+
+def match_expression(query):
+    """FTS5 MATCH expression for free text: every word must match, each as a prefix.
+
+    Returns None when the query has no words.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def parse_search_args(args, default_limit=20, max_limit=100):
+    """(query, limit, offset) from ?q=&limit=&offset=."""
+    query = (args.get('q') or '').strip()
+    if not search_terms(query):
+        raise BadRequest('Missing search query: q')
+    try:
+        limit = int(args.get('limit', default_limit))
+        offset = int(args.get('offset', 0))
+    except ValueError:
+        raise BadRequest('Invalid limit or offset: must be integers')
+    if not 1 <= limit <= max_limit or offset < 0:
+        raise BadRequest(f'Invalid limit or offset: limit must be 1-{max_limit} and offset non-negative')
+    return query, limit, offset
+
+
+def search_columns(index, open_mark='<mark>', close_mark='</mark>', highlight=True):
+    """(rank, highlighted first column, snippet) result columns for a MATCH against ``index``.
+
+    With ``highlight=False`` the second column is NULL.
+    """
+    first = f"highlight({index.name}, 0, '{open_mark}', '{close_mark}')" if highlight else 'NULL'
+    snippet = f"snippet({index.name}, -1, '{open_mark}', '{close_mark}', '…', 16)"
+    return (literal_column(index.bm25).label('rank'),
+            literal_column(first).label('highlight'),
+            literal_column(snippet).label('snippet'))
+
+
+def rank_window_floor(connection, index, expression, window):
+    """Smallest rowid among the ``window`` newest matches, or None when there are fewer.
+
+    BM25 has to score every match before it can sort, which is what makes a
+    very common word slow. FTS5 walks a doclist by rowid cheaply, so ranking
+    only the rows at or above this floor bounds the cost of broad queries.
+    """
+    row = connection.execute(
+        text(f'SELECT rowid FROM {index.name} WHERE {index.name} MATCH :fts_match '
+             f'ORDER BY rowid DESC LIMIT 1 OFFSET :offset'),
+        {'fts_match': expression, 'offset': window - 1}
+    ).first()
+    return row[0] if row else None
+
+
+def match_join(query, index, id_column, expression, min_rowid=None):
+    """Restrict ``query`` to rows of ``id_column``'s table whose index entry matches ``expression``."""
+    fts_table = table(index.name, column('rowid'))
+    query = query.join(fts_table, fts_table.c.rowid == id_column) \
+        .filter(text(f'{index.name} MATCH :fts_match').bindparams(fts_match=expression))
+    if min_rowid is not None:
+        # Constrain the FTS table itself so FTS5 skips the older part of each doclist
+        query = query.filter(fts_table.c.rowid >= min_rowid)
+    return query
+
+
+def ranked_match(query, index, id_column, text_query, connection, window):
+    """``match_join`` for free text, best first, ranking at most ``window`` newest matches (0: all)."""
+    expression = match_expression(text_query)
+    floor = rank_window_floor(connection, index, expression, window) if window else None
+    return match_join(query, index, id_column, expression, floor).order_by(text('rank'))
+
+
+def ranked_page(query, index, id_column, text_query, connection, window, limit, offset):
+    """Rows ``offset`` to ``offset + limit`` of ``ranked_match``, ranking every match when the window runs short.
+
+    The window floor is taken over all matches in the index, not just those
+    passing the filters already on ``query``, so a filtered window can hold
+    fewer rows than the page needs while older matches would still qualify.
+    Only then is the page read again with the window lifted.
+    """
+    expression = match_expression(text_query)
+    floor = rank_window_floor(connection, index, expression, window) if window else None
+    rows = match_join(query, index, id_column, expression, floor).order_by(text('rank')) \
+        .limit(limit).offset(offset).all()
+    if floor is not None and len(rows) < limit:
+        rows = match_join(query, index, id_column, expression).order_by(text('rank')) \
+            .limit(limit).offset(offset).all()
+    return rows
+
+
+def like_filter(columns, query):
+    """Portable fallback: every word appears in at least one of ``columns``."""
+    return and_(*(or_(*(source.ilike(f'%{term}%') for source in columns)) for term in search_terms(query)))
+
+
+def include_in_migrations(name, type_, parent_names):
+    """Alembic ``include_name`` hook: keep FTS tables and their shadow tables out of autogenerate."""
+    if type_ == 'table':
+        return not any(name == index.name or name.startswith(f'{index.name}_') for index in FTS_INDEXES)
+    return True
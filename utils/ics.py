@@ -0,0 +1,58 @@
+"""Minimal iCalendar (RFC 5545) writer for read-only subscription feeds.
+
+Only what a feed of timed events needs: UTC times, escaped and folded text,
+CRLF line endings. Events are dicts with ``uid``, ``start``, ``end`` (naive
+UTC datetimes), ``summary`` and optionally ``description``, ``status``
+(CONFIRMED or CANCELLED) and ``updated``.
+"""
+from datetime import datetime
+
+MAX_LINE_OCTETS = 75
+
+
+def format_utc(value):
+    return value.strftime('%Y%m%dT%H%M%SZ')
+
+
+def escape_text(value):
+    return (value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold(line):
+    """Split ``line`` into 75-octet lines continued with a leading space, never inside a UTF-8 character."""
+    data = line.encode('utf-8')
+    if len(data) <= MAX_LINE_OCTETS:
+        return line
+    parts, start, limit = [], 0, MAX_LINE_OCTETS
+    while start < len(data):
+        end = min(start + limit, len(data))
+        while end < len(data) and data[end] & 0xC0 == 0x80:  # Back off to a character boundary
+            end -= 1
+        parts.append(data[start:end].decode('utf-8'))
+        start, limit = end, MAX_LINE_OCTETS - 1  # Continuation lines lose one octet to the space
+    return '\r\n '.join(parts)
+
+
+def calendar(events, name, product_id='-//Volunteer System//Interviews//EN'):
+    """The VCALENDAR text of ``events``.
+
+    DTSTAMP is each event's ``updated`` time rather than the build time, so
+    unchanged events give byte-identical feeds (and the same ETag).
+    """
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{product_id}', 'CALSCALE:GREGORIAN', 'METHOD:PUBLISH',
+             f'X-WR-CALNAME:{escape_text(name)}']
+    for event in events:
+        lines += ['BEGIN:VEVENT',
+                  f'UID:{event["uid"]}',
+                  f'DTSTAMP:{format_utc(event.get("updated") or datetime.utcnow())}',
+                  f'DTSTART:{format_utc(event["start"])}',
+                  f'DTEND:{format_utc(event["end"])}',
+                  f'SUMMARY:{escape_text(event["summary"])}']
+        if event.get('description'):
+            lines.append(f'DESCRIPTION:{escape_text(event["description"])}')
+        if event.get('updated'):
+            lines.append(f'LAST-MODIFIED:{format_utc(event["updated"])}')
+        lines += [f'STATUS:{event.get("status", "CONFIRMED")}', 'END:VEVENT']
+    lines.append('END:VCALENDAR')
+    return ''.join(fold(line) + '\r\n' for line in lines)
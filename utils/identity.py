@@ -0,0 +1,101 @@
+from functools import wraps
+
+from flask import g, jsonify, current_app
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+
+from db import db
+from models import User, Commander, HR, Volunteer
+from utils.cache import TTLCache
+
+PROFILE_MODELS = {
+    'commander': Commander,
+    'hr': HR,
+    'volunteer': Volunteer
+}
+
+_profile_ids = None
+
+
+def _profile_id_cache():
+    """Cross-request user_id -> profile id cache, or None when IDENTITY_CACHE_TTL is 0."""
+    global _profile_ids
+    ttl = current_app.config.get('IDENTITY_CACHE_TTL', 0)
+    if not ttl:
+        return None
+    if _profile_ids is None:
+        _profile_ids = TTLCache(maxsize=current_app.config.get('IDENTITY_CACHE_SIZE', 4096), ttl=ttl)
+    return _profile_ids
+
+
+def current_role():
+    """Role of the caller, read from the JWT claims set by AuthService.generate_token."""
+    return get_jwt().get('role')
+
+
+def current_user_id():
+    return int(get_jwt_identity())
+
+
+def current_user():
+    """The caller's User row, loaded at most once per request."""
+    if 'identity_user' not in g:
+        g.identity_user = db.session.get(User, current_user_id())
+    return g.identity_user
+
+
+def current_profile_id():
+    """Id of the caller's Commander/HR/Volunteer row, without loading the row itself."""
+    if 'identity_profile_id' in g:
+        return g.identity_profile_id
+
+    role = current_role()
+    model = PROFILE_MODELS.get(role)
+    profile_id = None
+    if model is not None:
+        user_id = current_user_id()
+        cache = _profile_id_cache()
+        cache_key = (role, user_id)
+        profile_id = cache.get(cache_key) if cache is not None else None
+        if profile_id is None:
+            profile_id = db.session.query(model.id).filter_by(user_id=user_id).scalar()
+            if cache is not None and profile_id is not None:
+                cache.set(cache_key, profile_id)
+
+    g.identity_profile_id = profile_id
+    return profile_id
+
+
+def current_profile():
+    """The caller's Commander/HR/Volunteer row, loaded at most once per request."""
+    if 'identity_profile' not in g:
+        model = PROFILE_MODELS.get(current_role())
+        profile = None
+        if model is not None:
+            if 'identity_profile_id' in g:
+                profile_id = g.identity_profile_id
+                profile = db.session.get(model, profile_id) if profile_id is not None else None
+            else:
+                profile = model.query.filter_by(user_id=current_user_id()).first()
+                g.identity_profile_id = profile.id if profile else None
+        g.identity_profile = profile
+    return g.identity_profile
+
+
+def invalidate_identity(user_id):
+    """Drop cached identity data of a user; call after their profile changes."""
+    if _profile_ids is not None:
+        for role in PROFILE_MODELS:
+            _profile_ids.pop((role, user_id))
+
+
+def role_required(*roles):
+    """Require a valid JWT whose role claim is one of ``roles``; no database access."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            verify_jwt_in_request()
+            if current_role() not in roles:
+                return jsonify({'message': 'Unauthorized'}), 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,10 +1,7 @@
-import os
-import pickle
 import datetime
-import google_auth_oauthlib.flow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from google.auth.transport.requests import Request
+
+from utils.calendar_client import CalendarClientProvider
 
 # Define the API scope for Google Calendar
 SCOPES = ['https://www.googleapis.com/auth/calendar']
@@ -14,31 +11,14 @@ CLIENT_SECRET_FILE = 'client_secret_575701819091-bu3aitbj73b3c7df63440tga3v8itdn
 # CLIENT_SECRET_FILE = '/Users/anz-davar/Downloads/client_secret_575701819091-bu3aitbj73b3c7df63440tga3v8itdn5.apps.googleusercontent.com.json'
 API_NAME = 'calendar'
 API_VERSION = 'v3'
-REDIRECT_URI = 'http://localhost:8080/'
+
+# Token file stores the user's access and refresh tokens
+provider = CalendarClientProvider('token.pickle', CLIENT_SECRET_FILE, API_NAME, API_VERSION)
 
 
 # Authenticate the user and get the credentials
 def get_credentials():
-    creds = None
-    # Token file stores the user's access and refresh tokens
-    if os.path.exists('token.pickle'):
-        with open('token.pickle', 'rb') as token:
-            creds = pickle.load(token)
-
-    # If there's no valid credentials available, let the user log in
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = google_auth_oauthlib.flow.InstalledAppFlow.from_client_secrets_file(
-                CLIENT_SECRET_FILE, SCOPES, redirect_uri=REDIRECT_URI)
-            creds = flow.run_local_server(port=8080)
-
-        # Save the credentials for the next run
-        with open('token.pickle', 'wb') as token:
-            pickle.dump(creds, token)
-
-    return creds
+    return provider.credentials()
 
 
 # Create and send a Google Calendar event invitation
@@ -76,8 +56,7 @@ def create_event(service):
 # Main function to run the script
 def main():
     # Get the credentials and create a service object
-    creds = get_credentials()
-    service = build(API_NAME, API_VERSION, credentials=creds)
+    service = provider.service()
 
     # Create the event and send invitations
     create_event(service)
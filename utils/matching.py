@@ -0,0 +1,218 @@
+"""Hashed TF-IDF vectors for matching volunteer profiles against job requirements.
+
+Both sides are tokenized into normalized terms, each prefixed with the facet it
+belongs to (``lang``, ``skill``, ``edu``) so that, say, "english" in a job's
+required languages only matches "english" in a volunteer's languages. Terms are
+hashed into a fixed ``N_FEATURES`` space (no vocabulary to keep in step with
+the data), weighted by sublinear term frequency, field weight and IDF, and
+L2-normalized: the dot product of a job row and a volunteer row is their cosine
+similarity.
+
+``RowIndex`` holds one side as a sparse matrix and scores a query row against
+all of it with a single sparse product. Changed rows go to a small overlay
+instead of rebuilding the matrix; the overlay is folded back in once it grows.
+"""
+import math
+import re
+import threading
+import unicodedata
+import zlib
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+N_FEATURES = 1 << 18
+
+# Rows changed since the last compaction before they are folded into the base matrix
+COMPACT_THRESHOLD = 1024
+
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+# Spellings that \w+ would split or drop, rewritten before tokenizing
+_SYMBOLS = [
+    (re.compile(r'c\+\+'), ' cpp '),
+    (re.compile(r'c#'), ' csharp '),
+    (re.compile(r'f#'), ' fsharp '),
+    (re.compile(r'\.net\b'), ' dotnet '),
+    (re.compile(r'node\.js\b'), ' nodejs '),
+]
+
+# Different spellings of the same skill or language
+SYNONYMS = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'golang': 'go',
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'mssql': 'sql',
+    'ml': 'machine',
+    'ai': 'artificial',
+    'eng': 'english',
+    'heb': 'hebrew',
+    'rus': 'russian',
+    'arab': 'arabic',
+    'bsc': 'bachelor',
+    'ba': 'bachelor',
+    'msc': 'master',
+    'ma': 'master',
+    'phd': 'doctorate',
+}
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or the to with without
+years year experience knowledge good basic high level required preferred ability skills
+""".split())
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKC', text).casefold()
+    for pattern, replacement in _SYMBOLS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def terms(text):
+    """Normalized unigrams and adjacent-word bigrams of ``text``."""
+    if not text:
+        return []
+    words = [SYNONYMS.get(word, word) for word in _TOKEN.findall(normalize(text))
+             if word not in STOPWORDS and not word.isdigit()]
+    return words + [f'{first}_{second}' for first, second in zip(words, words[1:])]
+
+
+@lru_cache(maxsize=1 << 17)
+def feature(facet, term):
+    """Stable feature index of ``term`` in ``facet`` (crc32, so every process agrees)."""
+    return zlib.crc32(f'{facet}:{term}'.encode('utf-8')) & (N_FEATURES - 1)
+
+
+class Vectorizer:
+    """Turns records into weighted term counts.
+
+    ``fields`` is a sequence of (facet, position, weight) where position
+    indexes the record tuple the caller passes in.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+
+    def counts(self, record):
+        """{feature: weighted sublinear tf} of one record."""
+        counts = {}
+        for facet, position, weight in self.fields:
+            field_counts = {}
+            for term in terms(record[position]):
+                field_counts[term] = field_counts.get(term, 0) + 1
+            for term, count in field_counts.items():
+                index = feature(facet, term)
+                counts[index] = counts.get(index, 0.0) + weight * (1.0 + math.log(count))
+        return counts
+
+    def facet_terms(self, record):
+        """{(facet, term)} of one record, for explaining a match."""
+        return {(facet, term) for facet, position, _ in self.fields for term in terms(record[position])}
+
+
+def inverse_document_frequency(documents):
+    """Smoothed IDF over the features of ``documents`` (an iterable of counts dicts)."""
+    df = np.zeros(N_FEATURES, dtype=np.float32)
+    total = 0
+    for counts in documents:
+        total += 1
+        if counts:
+            df[np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))] += 1
+    return (np.log((1.0 + total) / (1.0 + df)) + 1.0).astype(np.float32)
+
+
+def weigh(counts, idf):
+    """(indices, values) of the L2-normalized TF-IDF row for ``counts``."""
+    if not counts:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    values = np.fromiter(counts.values(), dtype=np.float32, count=len(counts)) * idf[indices]
+    norm = float(np.sqrt(np.dot(values, values)))
+    return indices, values / norm if norm else values
+
+
+def rows_matrix(rows):
+    """CSR matrix with one row per (indices, values)."""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    if rows:
+        np.cumsum([len(indices) for indices, _ in rows], out=indptr[1:])
+    indices = np.concatenate([indices for indices, _ in rows]) if rows else np.empty(0, dtype=np.int32)
+    values = np.concatenate([values for _, values in rows]) if rows else np.empty(0, dtype=np.float32)
+    return sparse.csr_matrix((values, indices, indptr), shape=(len(rows), N_FEATURES))
+
+
+class RowIndex:
+    """Rows of one side, keyed by id, scored against a query row in one sparse product."""
+
+    def __init__(self, ids, rows):
+        self._lock = threading.Lock()
+        self._ids = np.asarray(ids, dtype=np.int64)
+        # CSC: a query with a few dozen features only reads those columns
+        self._base = rows_matrix(rows).tocsc()
+        self._positions = {int(row_id): position for position, row_id in enumerate(self._ids)}
+        self._live = np.ones(len(self._ids), dtype=bool)
+        self._overlay = {}
+        self._overlay_matrix = None
+        self._overlay_ids = None
+
+    def __len__(self):
+        return int(self._live.sum()) + len(self._overlay)
+
+    def upsert(self, row_id, row):
+        with self._lock:
+            self._drop_base(row_id)
+            self._overlay[row_id] = row
+            self._overlay_matrix = None
+            if len(self._overlay) > COMPACT_THRESHOLD:
+                self._compact()
+
+    def remove(self, row_id):
+        with self._lock:
+            self._drop_base(row_id)
+            if self._overlay.pop(row_id, None) is not None:
+                self._overlay_matrix = None
+
+    def _drop_base(self, row_id):
+        position = self._positions.pop(row_id, None)
+        if position is not None:
+            self._live[position] = False
+
+    def _compact(self):
+        live = np.flatnonzero(self._live)
+        overlay_ids = list(self._overlay)
+        self._base = sparse.vstack([self._base.tocsr()[live], rows_matrix(list(self._overlay.values()))]).tocsc()
+        self._ids = np.concatenate([self._ids[live], np.asarray(overlay_ids, dtype=np.int64)])
+        self._positions = {int(row_id): position for position, row_id in enumerate(self._ids)}
+        self._live = np.ones(len(self._ids), dtype=bool)
+        self._overlay = {}
+        self._overlay_matrix = None
+
+    def top(self, row, k, exclude=()):
+        """Up to ``k`` (id, score) with a positive score, best first, skipping ids in ``exclude``."""
+        indices, values = row
+        if not len(indices):
+            return []
+        with self._lock:
+            columns = self._base[:, indices]
+            scores = columns @ values if columns.nnz else np.zeros(len(self._ids), dtype=np.float32)
+            scores = np.where(self._live, scores, 0.0)
+            ids = self._ids
+            if self._overlay:
+                if self._overlay_matrix is None:
+                    self._overlay_ids = np.asarray(list(self._overlay), dtype=np.int64)
+                    self._overlay_matrix = rows_matrix(list(self._overlay.values())).tocsc()
+                scores = np.concatenate([scores, self._overlay_matrix[:, indices] @ values])
+                ids = np.concatenate([ids, self._overlay_ids])
+
+        if exclude:
+            scores = np.where(np.isin(ids, np.fromiter(exclude, dtype=np.int64)), 0.0, scores)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(ids[position]), float(scores[position])) for position in candidates]
@@ -0,0 +1,134 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, Row, tuple_
+from werkzeug.exceptions import BadRequest
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class PageRequest:
+    """Pagination and projection arguments of a list request.
+
+    Pagination is opt-in: when neither ``limit`` nor ``cursor`` is given the
+    endpoint keeps returning the full array so existing clients are unaffected.
+    """
+
+    def __init__(self, limit=None, cursor=None, fields=None):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+    @property
+    def paginated(self):
+        return self.limit is not None or self.cursor is not None
+
+    @classmethod
+    def from_args(cls, args):
+        limit = args.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise BadRequest("Invalid limit value: must be an integer")
+            if limit < 1 or limit > MAX_PAGE_SIZE:
+                raise BadRequest(f"Invalid limit value: must be between 1 and {MAX_PAGE_SIZE}")
+
+        cursor = args.get('cursor') or None
+
+        fields = args.get('fields')
+        if fields:
+            fields = {field.strip() for field in fields.split(',') if field.strip()}
+        else:
+            fields = None
+
+        return cls(limit=limit, cursor=cursor, fields=fields)
+
+
+def parse_limit(args, default=20, maximum=100):
+    """``?limit=`` of an endpoint returning a top-N list."""
+    try:
+        limit = int(args.get('limit', default))
+    except ValueError:
+        raise BadRequest("Invalid limit value: must be an integer")
+    if limit < 1 or limit > maximum:
+        raise BadRequest(f"Invalid limit value: must be between 1 and {maximum}")
+    return limit
+
+
+def encode_cursor(values):
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(values).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (binascii.Error, UnicodeError, ValueError):
+        raise BadRequest("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise BadRequest("Invalid cursor")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and isinstance(column.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise BadRequest("Invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def keyset_paginate(query, page, columns):
+    """Apply keyset pagination to ``query`` ordered by ``columns``.
+
+    ``columns`` must form a unique, ascending sort key (the primary key, or a
+    tuple ending with it). Returns the rows of the page and the cursor of the
+    next page, or ``None`` when there is none. Unpaginated requests get every
+    row in the same order and a ``None`` cursor. When the query returns
+    tuples (an entity plus extra columns) the key is read from the entity in
+    the first position.
+    """
+    query = query.order_by(*columns)
+    if not page.paginated:
+        return query.all(), None
+
+    if page.cursor:
+        values = decode_cursor(page.cursor, columns)
+        if len(columns) == 1:
+            query = query.filter(columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*columns) > tuple_(*values))
+
+    limit = page.limit or DEFAULT_PAGE_SIZE
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    if isinstance(last, Row):
+        last = last[0]
+    return rows, encode_cursor(getattr(last, column.key) for column in columns)
+
+
+def project(item, fields):
+    if not fields:
+        return item
+    return {key: value for key, value in item.items() if key in fields}
+
+
+def page_response(items, page, next_cursor):
+    """Build the JSON body of a list endpoint from serialized ``items``."""
+    items = [project(item, page.fields) for item in items]
+    if not page.paginated:
+        return items
+    return {
+        'items': items,
+        'nextCursor': next_cursor
+    }
@@ -0,0 +1,100 @@
+"""Password hashing policy.
+
+PASSWORD_HASH_METHOD selects the algorithm and cost for new hashes:
+
+- any Werkzeug method, e.g. ``scrypt:32768:8:1`` (n, r, p) or
+  ``pbkdf2:sha256:600000``;
+- ``argon2`` or ``argon2:<time_cost>:<memory_cost KiB>:<parallelism>``, which
+  needs the optional argon2-cffi package.
+
+Hashes made with any other method still verify; ``needs_rehash`` tells the
+caller when a hash should be replaced after a successful login.
+
+When PASSWORD_VERIFY_WORKERS > 0, verification runs in a bounded thread pool
+of that size. hashlib's scrypt/PBKDF2 and argon2-cffi release the GIL, so with
+threaded Gunicorn workers the pool caps how many cores logins may occupy while
+the other request threads keep being served.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app, has_app_context
+from werkzeug.security import generate_password_hash, check_password_hash
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # argon2-cffi is optional
+    PasswordHasher = None
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+ARGON2_PREFIX = '$argon2'
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def configured_method():
+    if has_app_context():
+        return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+    return DEFAULT_METHOD
+
+
+@lru_cache(maxsize=16)
+def _argon2_hasher(method):
+    if PasswordHasher is None:
+        raise RuntimeError('PASSWORD_HASH_METHOD=argon2 requires the argon2-cffi package')
+    params = method.split(':')[1:]
+    if not params:
+        return PasswordHasher()
+    time_cost, memory_cost, parallelism = (int(value) for value in params)
+    return PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+
+
+@lru_cache(maxsize=16)
+def _werkzeug_prefix(method):
+    # Werkzeug fills in defaults ('scrypt' -> 'scrypt:32768:8:1'); ask it for the full method string
+    return generate_password_hash('', method).split('$', 1)[0]
+
+
+def hash_password(password, method=None):
+    method = method or configured_method()
+    if method.startswith('argon2'):
+        return _argon2_hasher(method).hash(password)
+    return generate_password_hash(password, method)
+
+
+def _verify(password_hash, password):
+    if password_hash.startswith(ARGON2_PREFIX):
+        try:
+            return _argon2_hasher('argon2').verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return check_password_hash(password_hash, password)
+
+
+def _verify_pool(workers):
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-verify')
+    return _pool
+
+
+def verify_password(password_hash, password):
+    workers = current_app.config.get('PASSWORD_VERIFY_WORKERS', 0) if has_app_context() else 0
+    if workers <= 0:
+        return _verify(password_hash, password)
+    return _verify_pool(workers).submit(_verify, password_hash, password).result()
+
+
+def needs_rehash(password_hash, method=None):
+    """True when ``password_hash`` was not made with the configured method and cost."""
+    method = method or configured_method()
+    if method.startswith('argon2'):
+        if not password_hash.startswith(ARGON2_PREFIX):
+            return True
+        return _argon2_hasher(method).check_needs_rehash(password_hash)
+    return password_hash.split('$', 1)[0] != _werkzeug_prefix(method)
@@ -0,0 +1,127 @@
+"""Cache of serialized JSON responses that are the same for every caller.
+
+Entries live in an in-process TTL/LRU cache and, when CACHE_REDIS_URL points
+at a Redis-compatible server (and the redis package is installed), also in
+Redis so every Gunicorn worker shares them. Invalidation bumps a generation
+number that is part of every key; with Redis the generation is shared, so an
+invalidation in one worker is seen by all of them, without Redis the other
+workers serve their copy until its TTL runs out.
+"""
+import hashlib
+import logging
+import threading
+
+from flask import current_app, request
+
+from utils.cache import TTLCache
+
+try:
+    import redis
+except ImportError:  # Redis is optional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_redis_clients = {}
+_redis_lock = threading.Lock()
+
+
+def _redis_client():
+    url = current_app.config.get('CACHE_REDIS_URL')
+    if not url or redis is None:
+        return None
+    client = _redis_clients.get(url)
+    if client is None:
+        with _redis_lock:
+            client = _redis_clients.setdefault(url, redis.Redis.from_url(url, socket_timeout=0.2))
+    return client
+
+
+class ResponseCache:
+    def __init__(self, namespace, config_prefix):
+        self.namespace = namespace
+        self.config_prefix = config_prefix
+        self._local = None
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _config(self, name):
+        return current_app.config[f'{self.config_prefix}_{name}']
+
+    @property
+    def enabled(self):
+        return self._config('TTL') > 0
+
+    def _local_cache(self):
+        if self._local is None:
+            with self._lock:
+                if self._local is None:
+                    self._local = TTLCache(maxsize=self._config('SIZE'), ttl=self._config('TTL'))
+        return self._local
+
+    def _current_generation(self, client):
+        if client is not None:
+            try:
+                return int(client.get(f'{self.namespace}:generation') or 0)
+            except redis.RedisError as e:
+                logger.warning('Response cache: Redis unavailable (%s)', e)
+        return self._generation
+
+    @staticmethod
+    def request_key():
+        """Key for the current request: its query arguments, order-insensitive."""
+        return '&'.join(f'{name}={value}' for name, value in sorted(request.args.items(multi=True)))
+
+    def lookup(self, key):
+        """Return (entry, slot): the cached (etag, body) or None, and the slot to store a fresh one in.
+
+        The slot pins the generation seen before the response is built, so a
+        body computed while an invalidation happens is never stored as current.
+        """
+        if not self.enabled:
+            return None, None
+        client = _redis_client()
+        slot = f'{self.namespace}:{self._current_generation(client)}:{key}'
+        entry = self._local_cache().get(slot)
+        if entry is None and client is not None:
+            try:
+                body = client.get(slot)
+            except redis.RedisError:
+                body = None
+            if body is not None:
+                entry = (hashlib.sha256(body).hexdigest(), body)
+                self._local_cache().set(slot, entry)
+        return entry, slot
+
+    def store(self, slot, body):
+        """Store ``body`` (bytes) in ``slot`` and return its (etag, body) entry."""
+        entry = (hashlib.sha256(body).hexdigest(), body)
+        if slot is None:
+            return entry
+        self._local_cache().set(slot, entry)
+        client = _redis_client()
+        if client is not None:
+            try:
+                client.setex(slot, self._config('TTL'), body)
+            except redis.RedisError as e:
+                logger.warning('Response cache: Redis unavailable (%s)', e)
+        return entry
+
+    def invalidate(self):
+        """Drop every entry, in this process and (with Redis) in all workers."""
+        with self._lock:
+            self._generation += 1
+            if self._local is not None:
+                self._local.clear()
+        client = _redis_client()
+        if client is not None:
+            try:
+                client.incr(f'{self.namespace}:generation')
+            except redis.RedisError as e:
+                logger.warning('Response cache: Redis unavailable (%s)', e)
+
+
+# GET /api/volunteer/jobs; invalidated whenever a job's listed fields change
+job_board_cache = ResponseCache('job-board', 'JOB_BOARD_CACHE')
+# GET /api/commander/interviews/feed/<token>.ics, keyed by commander; invalidated whenever an interview changes
+interview_feed_cache = ResponseCache('interview-feed', 'INTERVIEW_FEED_CACHE')
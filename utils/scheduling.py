@@ -0,0 +1,98 @@
+"""Interval arithmetic for interview slots.
+
+Times are naive UTC datetimes, as stored in interviews.scheduled_date and
+scheduled_end; intervals are half-open ``(start, end)`` pairs, so an interview
+ending at 10:00 does not overlap one starting at 10:00. Working hours are
+given in the commanders' local time zone and converted per day, which keeps
+slots right across daylight saving changes.
+"""
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+
+def parse_weekdays(value):
+    """{0..6} (Monday = 0) from a comma-separated list such as 'sun,mon,tue'."""
+    days = set()
+    for name in value.split(','):
+        name = name.strip().lower()[:3]
+        if name not in WEEKDAYS:
+            raise ValueError(f'Unknown weekday: {name!r}')
+        days.add(WEEKDAYS.index(name))
+    return days
+
+
+def to_utc(value):
+    """Naive UTC datetime for ``value``; naive input is taken to be UTC already."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def overlaps(a, b):
+    return a[0] < b[1] and b[0] < a[1]
+
+
+def merge(intervals):
+    """Sorted, non-overlapping union of ``intervals``; touching intervals are joined."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract(windows, busy):
+    """Parts of the sorted, disjoint ``windows`` not covered by any ``busy`` interval."""
+    busy = merge(busy)
+    free, index = [], 0
+    for start, end in windows:
+        while index < len(busy) and busy[index][1] <= start:
+            index += 1
+        cursor, scan = start, index
+        while scan < len(busy) and busy[scan][0] < end:
+            if busy[scan][0] > cursor:
+                free.append((cursor, busy[scan][0]))
+            cursor = max(cursor, busy[scan][1])
+            scan += 1
+        if cursor < end:
+            free.append((cursor, end))
+    return free
+
+
+def working_windows(start, end, zone, day_start, day_end, weekdays):
+    """Working hours between ``start`` and ``end`` (naive UTC) as UTC intervals.
+
+    ``day_start``/``day_end`` are local times of day in the ``zone`` time zone
+    name; ``weekdays`` is a set of Monday-based weekday numbers.
+    """
+    tz = ZoneInfo(zone)
+    local_day = start.replace(tzinfo=timezone.utc).astimezone(tz).date()
+    last_day = end.replace(tzinfo=timezone.utc).astimezone(tz).date()
+    windows = []
+    while local_day <= last_day:
+        if local_day.weekday() in weekdays:
+            window_start = to_utc(datetime.combine(local_day, day_start, tz))
+            window_end = to_utc(datetime.combine(local_day, day_end, tz))
+            window_start, window_end = max(window_start, start), min(window_end, end)
+            if window_start < window_end:
+                windows.append((window_start, window_end))
+        local_day += timedelta(days=1)
+    return windows
+
+
+def slots(free, duration, step):
+    """Back-to-back slots of ``duration`` inside the ``free`` intervals, starting on a ``step`` grid."""
+    step_seconds = int(step.total_seconds())
+    result = []
+    for start, end in free:
+        offset = -(start - datetime.min).total_seconds() % step_seconds
+        cursor = start + timedelta(seconds=offset)
+        while cursor + duration <= end:
+            result.append((cursor, cursor + duration))
+            cursor += duration
+    return result
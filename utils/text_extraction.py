@@ -0,0 +1,176 @@
+"""Plain-text extraction from uploaded resumes, with local parsers only.
+
+``extract`` runs in a worker process: it reads the file once, hashes it, and
+returns normalized text. Supported formats:
+
+* txt  - UTF-8, falling back to Windows-1255 (Hebrew) and Latin-1
+* docx - the paragraphs of word/document.xml, read with zipfile/ElementTree
+* pdf  - pypdf when it is installed; otherwise the literal strings shown by
+  the text operators of each (Flate-compressed or plain) content stream, which
+  covers most generated PDFs but not scanned ones or CID-keyed fonts
+* doc  - legacy Word binaries: the longest runs of readable UTF-16 or 8-bit text
+
+Files that yield no text are reported as such rather than as errors.
+"""
+import hashlib
+import re
+import unicodedata
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf is optional: fall back to the built-in content stream reader
+    PdfReader = None
+
+# Upper bound on stored text; a resume is a few pages, anything longer is noise
+MAX_TEXT_CHARS = 200_000
+# Upper bound on an uncompressed document.xml, against zip bombs
+MAX_DOCX_XML_BYTES = 50 * 1024 * 1024
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_CONTROL = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_SPACES = re.compile(r'[ \t ]+')
+_BLANK_LINES = re.compile(r'\n\s*\n+')
+
+_PDF_STREAM = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.S)
+_PDF_TEXT_BLOCK = re.compile(rb'BT(.*?)ET', re.S)
+_PDF_TOKEN = re.compile(rb'\((?:\\.|[^\\)])*\)|\[|\]|Tj|TJ|T\*|Td|TD|\'|"')
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+_UTF16_RUN = re.compile(rb'(?:[\x20-\x7e\r\n\t]\x00|[\xd0-\xea]\x05){4,}')
+_BYTE_RUN = re.compile(rb'[\x20-\x7e\r\n\t]{6,}')
+
+
+class ExtractionError(Exception):
+    pass
+
+
+def normalize_text(text):
+    """NFKC, no control characters, single spaces, at most one blank line in a row."""
+    text = unicodedata.normalize('NFKC', text)
+    text = _CONTROL.sub(' ', text.replace('\r\n', '\n').replace('\r', '\n'))
+    text = _SPACES.sub(' ', text)
+    text = _BLANK_LINES.sub('\n\n', '\n'.join(line.strip() for line in text.split('\n')))
+    return text.strip()[:MAX_TEXT_CHARS]
+
+
+def _txt_text(data):
+    for encoding in ('utf-8-sig', 'cp1255'):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode('latin-1')
+
+
+def _docx_text(path):
+    try:
+        with zipfile.ZipFile(path) as archive:
+            info = archive.getinfo('word/document.xml')
+            if info.file_size > MAX_DOCX_XML_BYTES:
+                raise ExtractionError('document.xml is too large')
+            paragraphs, current = [], []
+            with archive.open(info) as document:
+                for _, element in ElementTree.iterparse(document):
+                    if element.tag == f'{_WORD_NS}t':
+                        current.append(element.text or '')
+                    elif element.tag == f'{_WORD_NS}tab':
+                        current.append('\t')
+                    elif element.tag in (f'{_WORD_NS}br', f'{_WORD_NS}cr'):
+                        current.append('\n')
+                    elif element.tag == f'{_WORD_NS}p':
+                        paragraphs.append(''.join(current))
+                        current = []
+                        element.clear()
+            return '\n'.join(paragraphs)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ExtractionError(f'Not a readable docx file: {e}')
+
+
+def _pdf_literal(token):
+    """Bytes of a PDF literal string token ``(...)``."""
+    body, out, i = token[1:-1], bytearray(), 0
+    while i < len(body):
+        byte = body[i:i + 1]
+        if byte != b'\\':
+            out += byte
+            i += 1
+            continue
+        escaped = body[i + 1:i + 2]
+        octal = re.match(rb'[0-7]{1,3}', body[i + 1:i + 4])
+        if octal:
+            out.append(int(octal.group(), 8) & 0xff)
+            i += 1 + len(octal.group())
+        else:
+            out += _PDF_ESCAPES.get(escaped, escaped)
+            i += 2
+    return bytes(out)
+
+
+def _pdf_stream_text(content):
+    lines = []
+    for block in _PDF_TEXT_BLOCK.finditer(content):
+        line = []
+        for token in _PDF_TOKEN.finditer(block.group(1)):
+            value = token.group()
+            if value.startswith(b'('):
+                line.append(_pdf_literal(value).decode('latin-1'))
+            elif value in (b'T*', b'Td', b'TD', b"'", b'"'):
+                line.append('\n')
+            elif value == b'Tj':
+                line.append(' ')
+        lines.append(''.join(line))
+    return '\n'.join(lines)
+
+
+def _pdf_text(path, data):
+    if PdfReader is not None:
+        try:
+            return '\n'.join(page.extract_text() or '' for page in PdfReader(path).pages)
+        except Exception as e:  # pypdf raises a variety of errors on damaged files
+            raise ExtractionError(f'Not a readable pdf file: {e}')
+    if not data.startswith(b'%PDF'):
+        raise ExtractionError('Not a pdf file')
+    parts = []
+    for stream in _PDF_STREAM.finditer(data):
+        content = stream.group(1)
+        try:
+            content = zlib.decompress(content)
+        except zlib.error:
+            pass  # Uncompressed, or a filter other than Flate (images, fonts)
+        parts.append(_pdf_stream_text(content))
+    return '\n'.join(part for part in parts if part.strip())
+
+
+def _doc_text(data):
+    utf16 = '\n'.join(run.decode('utf-16-le', errors='ignore') for run in _UTF16_RUN.findall(data))
+    single_byte = '\n'.join(run.decode('cp1252', errors='ignore') for run in _BYTE_RUN.findall(data))
+    return utf16 if len(utf16) >= len(single_byte) else single_byte
+
+
+def extract(path):
+    """(normalized text, sha256 hex digest) of the file at ``path``.
+
+    Raises ExtractionError for unsupported or unreadable files.
+    """
+    extension = path.rsplit('.', 1)[-1].lower() if '.' in path else ''
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except OSError as e:
+        raise ExtractionError(f'Cannot read file: {e}')
+    digest = hashlib.sha256(data).hexdigest()
+
+    if extension == 'txt':
+        text = _txt_text(data)
+    elif extension == 'docx':
+        text = _docx_text(path)
+    elif extension == 'pdf':
+        text = _pdf_text(path, data)
+    elif extension == 'doc':
+        text = _doc_text(data)
+    else:
+        raise ExtractionError(f'Unsupported file type: {extension or "none"}')
+    return normalize_text(text), digest